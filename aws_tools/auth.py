@@ -3,16 +3,190 @@ Cross-account Authentication
 Reference 코드의 인증 로직 재사용
 자격증명 캐싱 추가 (WebSocket 환경에서 매번 새로운 자격증명 생성 문제 해결)
 """
+import os
 import re
-import boto3
-from utils.logging_config import log_debug, log_error
-from datetime import datetime, timedelta
+import time
+import asyncio
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from utils.logging_config import log_debug, log_error, log_info
+from utils.metrics import percentile
+from aws_tools.client_pool import get_client, evict_credentials
+from datetime import datetime, timedelta, timezone
 import threading
+from collections import deque
 
-# 자격증명 캐시 (계정별 저장)
+# 자격증명 캐시 (계정별 저장, STS가 반환한 실제 만료 시간 기준)
 _credentials_cache = {}
 _cache_lock = threading.Lock()
-_CACHE_EXPIRY_MINUTES = 50  # 임시 자격증명 유효 시간 (기본 1시간, 50분으로 설정)
+_CACHE_EXPIRY_MINUTES = 50  # STS 응답에 만료 시간이 없을 때 사용할 기본 유효 시간
+
+# 만료 임박 기준 (남은 시간이 이보다 짧으면 캐시를 쓰지 않고 새로 발급)
+_REFRESH_MARGIN_SECONDS = 5 * 60
+
+# 백그라운드 갱신: 최근 사용된 계정의 자격증명을 만료 전에 미리 갱신
+_PROACTIVE_REFRESH_SECONDS = 15 * 60   # 남은 시간이 15분 미만이면 갱신
+_RECENT_USE_SECONDS = 30 * 60          # 최근 30분 이내에 사용된 계정만 갱신
+_REFRESH_CHECK_INTERVAL_SECONDS = 60   # 갱신 대상 확인 주기
+
+# 장시간 작업(Service Screener, 보고서)이 시작 시점에 요구하는 최소 남은 유효 시간
+LONG_JOB_MIN_CREDENTIAL_SECONDS = 20 * 60
+
+_refresh_thread = None
+
+# 비동기 발급용 전용 스레드 풀 (SSM/STS 블로킹 호출이 이벤트 루프를 막지 않도록 분리, 동시 발급 수 제한)
+_CREDENTIAL_EXECUTOR_WORKERS = int(os.environ.get('CREDENTIAL_EXECUTOR_WORKERS', '8'))
+CREDENTIAL_TIMEOUT_SECONDS = float(os.environ.get('CREDENTIAL_TIMEOUT_SECONDS', '20'))
+_credential_executor = ThreadPoolExecutor(max_workers=_CREDENTIAL_EXECUTOR_WORKERS, thread_name_prefix='credential')
+
+# 계정별 진행 중인 자격증명 발급 (single-flight: 같은 계정의 동시 요청은 1회 발급 결과를 공유)
+_inflight_acquisitions = {}
+_INFLIGHT_WAIT_SECONDS = 30  # 다른 요청의 발급 완료를 기다리는 최대 시간
+
+# 인증 통계 카운터
+_auth_stats = {
+    "cache_hits": 0,
+    "cache_misses": 0,
+    "acquisitions": 0,             # 실제 발급 시도 (SSM + STS)
+    "sts_assume_role_calls": 0,    # assume_role 호출 수
+    "singleflight_waits": 0,       # 다른 요청의 발급 결과를 기다린 횟수
+    "sts_calls_saved": 0,          # single-flight로 생략된 assume_role 호출 수
+    "ssm_key_fetches": 0,          # Parameter Store 조회 수 (get_parameters 1회 = 1)
+    "ssm_key_cache_hits": 0,       # 캐시된 cross-account 키 사용 수
+    "ssm_key_invalidations": 0,    # STS 거부로 인한 키 캐시 무효화 수
+    "hop1_cache_hits": 0,          # 캐시된 hop-1 자격증명 재사용 수 (assume_role 1회 절약)
+    "hop1_assume_role_calls": 0,   # hop-1 crossaccount 역할 assume 수
+    "async_timeouts": 0,           # 비동기 발급 시간 초과 수
+    "broker_requests": 0,          # 자격증명 브로커 조회 수
+    "broker_fallbacks": 0,         # 브로커 연결 실패로 직접 발급한 수
+    "identity_checks": 0,          # get_caller_identity 호출 수
+    "identity_cache_hits": 0,      # 캐시된 계정 검증 결과 재사용 수
+    "cache_expired": 0,            # 만료되어 삭제된 캐시 항목 수
+    "cache_short_lifetime": 0,     # 유효하지만 요구 남은 시간이 부족해 재발급한 수 (장시간 작업)
+    "path_user": 0,                # User 방식(SSM 키)으로 발급 성공
+    "path_role_fallback": 0,       # Role 방식(2단계)으로 폴백한 수
+    "path_role": 0,                # Role 방식으로 발급 성공
+    "acquisition_failures": 0,     # 두 방식 모두 실패
+    "sts_errors": 0,               # STS 호출 오류 수
+    "sts_throttles": 0             # STS 스로틀링 오류 수 (사용자에게 보이는 실패 전 조기 경보)
+}
+_stats_lock = threading.Lock()
+
+# 지연 시간 히스토그램 (버킷 경계 ms, 마지막 버킷은 초과분) + 백분위수 계산용 최근 샘플
+_LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+_LATENCY_SAMPLE_SIZE = 200
+_LATENCY_METRICS = (
+    "ssm_get_parameters",      # Parameter Store 키 조회
+    "sts_user_assume_role",    # User 방식 assume_role
+    "sts_hop1_assume_role",    # Role 방식 1단계
+    "sts_hop2_assume_role",    # Role 방식 2단계
+    "sts_get_caller_identity", # 계정 검증
+    "acquisition"              # 캐시 미스 발급 전체 (SSM + STS)
+)
+_auth_latency = {
+    name: {
+        "count": 0,
+        "sum_ms": 0.0,
+        "max_ms": 0.0,
+        "buckets": [0] * (len(_LATENCY_BUCKETS_MS) + 1),
+        "samples": deque(maxlen=_LATENCY_SAMPLE_SIZE)
+    }
+    for name in _LATENCY_METRICS
+}
+
+# STS 스로틀링 오류 코드
+_STS_THROTTLING_ERRORS = ('Throttling', 'ThrottlingException', 'RequestLimitExceeded', 'TooManyRequestsException')
+
+# Parameter Store의 cross-account 키 캐시 (키는 거의 바뀌지 않으므로 긴 TTL, STS가 거부하면 즉시 무효화)
+_SSM_REGION = 'ap-northeast-2'
+_SSM_ACCESS_KEY_PARAMETER = '/access-key/crossaccount'
+_SSM_SECRET_KEY_PARAMETER = '/secret-key/crossaccount'
+_SSM_KEY_CACHE_SECONDS = 6 * 60 * 60
+_ssm_key_cache = {"keys": None, "fetched_at": 0.0}
+_ssm_key_lock = threading.Lock()
+
+# Role 방식 폴백의 1단계(hop-1) crossaccount 역할 자격증명 캐시 (모든 대상 계정이 공유)
+_HOP1_ROLE_ARN = "arn:aws:iam::370662402529:role/crossaccount"
+_CROSSACCOUNT_EXTERNAL_ID = "saltwarec0rp"
+_hop1_cache = {"credentials": None, "last_used": 0.0}
+_hop1_lock = threading.Lock()
+
+# 액세스 키별 get_caller_identity 결과 캐시 (키의 만료 시간까지 재사용, 만료 정보가 없으면 기본 TTL)
+_IDENTITY_CACHE_FALLBACK_SECONDS = 60 * 60
+_identity_cache = {}
+_identity_lock = threading.Lock()
+
+# 키 자체가 잘못되었음을 뜻하는 STS 오류 코드 (키 교체 후 캐시된 옛 키 사용 등)
+_STS_REJECTED_KEY_ERRORS = ('InvalidClientTokenId', 'SignatureDoesNotMatch', 'UnrecognizedClientException')
+
+
+class _InflightAcquisition:
+    """진행 중인 계정별 자격증명 발급 (완료 시 대기 중인 요청에 결과 전달)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.sts_calls = 0
+
+
+def _increment_stat(name: str, amount: int = 1):
+    """인증 통계 카운터 증가"""
+    with _stats_lock:
+        _auth_stats[name] += amount
+
+
+def _observe_latency(name: str, started: float):
+    """지연 시간 히스토그램에 기록 (started: time.perf_counter() 시작 값)"""
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    bucket = len(_LATENCY_BUCKETS_MS)
+    for index, bound in enumerate(_LATENCY_BUCKETS_MS):
+        if elapsed_ms <= bound:
+            bucket = index
+            break
+    with _stats_lock:
+        metric = _auth_latency[name]
+        metric["count"] += 1
+        metric["sum_ms"] += elapsed_ms
+        metric["max_ms"] = max(metric["max_ms"], elapsed_ms)
+        metric["buckets"][bucket] += 1
+        metric["samples"].append(elapsed_ms)
+
+
+def _record_sts_error(error: ClientError):
+    """STS 오류 기록 (스로틀링은 별도 집계)"""
+    _increment_stat("sts_errors")
+    if error.response.get('Error', {}).get('Code') in _STS_THROTTLING_ERRORS:
+        _increment_stat("sts_throttles")
+        log_error(f"STS 스로틀링 발생: {error}")
+
+
+def get_auth_stats() -> dict:
+    """
+    인증 통계 반환 (캐시 적중률, STS 호출 수, single-flight로 절약된 호출 수, 지연 시간 히스토그램)
+    
+    Returns:
+        dict: 인증 통계 카운터, 현재 캐시/발급 상태, 단계별 지연 시간(latency_ms)
+    """
+    with _stats_lock:
+        stats = dict(_auth_stats)
+        latency = {}
+        for name, metric in _auth_latency.items():
+            bounds = [f"le_{bound}" for bound in _LATENCY_BUCKETS_MS] + ["inf"]
+            latency[name] = {
+                "count": metric["count"],
+                "avg": round(metric["sum_ms"] / metric["count"], 1) if metric["count"] else 0.0,
+                "p50": percentile(metric["samples"], 50),
+                "p95": percentile(metric["samples"], 95),
+                "max": round(metric["max_ms"], 1),
+                "buckets": dict(zip(bounds, metric["buckets"]))
+            }
+    lookups = stats["cache_hits"] + stats["cache_misses"]
+    stats["cache_hit_rate"] = round(stats["cache_hits"] / lookups, 3) if lookups else 0.0
+    stats["latency_ms"] = latency
+    with _cache_lock:
+        stats["cached_accounts"] = len(_credentials_cache)
+        stats["inflight_acquisitions"] = len(_inflight_acquisitions)
+    return stats
 
 
 def extract_account_id(text: str) -> str:
@@ -33,56 +207,161 @@ def extract_account_id(text: str) -> str:
     return result
 
 
-def get_crossaccount_credentials():
-    """
-    Parameter Store에서 Cross-account 자격증명 가져오기
-    Reference 코드와 동일한 로직
-    
-    Returns:
-        tuple: (access_key, secret_key) 또는 (None, None)
-    """
+def _get_ssm_client():
+    """Parameter Store 조회용 SSM 클라이언트 (클라이언트 풀에서 재사용)"""
+    return get_client('ssm', _SSM_REGION)
+
+
+def _fetch_crossaccount_keys():
+    """Parameter Store에서 cross-account 키를 조회해 캐시에 저장 (_ssm_key_lock은 호출자가 보유)"""
     try:
         log_debug("Parameter Store에서 cross-account 자격증명 로드 시도")
-        ssm_client = boto3.client('ssm', region_name='ap-northeast-2')
-        access_key = ssm_client.get_parameter(Name='/access-key/crossaccount', WithDecryption=True)['Parameter']['Value']
-        secret_key = ssm_client.get_parameter(Name='/secret-key/crossaccount', WithDecryption=True)['Parameter']['Value']
+        _increment_stat("ssm_key_fetches")
+        started = time.perf_counter()
+        try:
+            response = _get_ssm_client().get_parameters(
+                Names=[_SSM_ACCESS_KEY_PARAMETER, _SSM_SECRET_KEY_PARAMETER],
+                WithDecryption=True
+            )
+        finally:
+            _observe_latency("ssm_get_parameters", started)
+        if response.get('InvalidParameters'):
+            raise ValueError(f"존재하지 않는 파라미터: {response['InvalidParameters']}")
+        
+        values = {parameter['Name']: parameter['Value'] for parameter in response['Parameters']}
+        keys = (values[_SSM_ACCESS_KEY_PARAMETER], values[_SSM_SECRET_KEY_PARAMETER])
+        _ssm_key_cache["keys"] = keys
+        _ssm_key_cache["fetched_at"] = time.monotonic()
         log_debug("Cross-account 자격증명 로드 성공")
-        return access_key, secret_key
+        return keys
     except Exception as e:
         log_error(f"Cross-account 자격증명 로드 실패: {e}")
         return None, None
 
 
-def is_credentials_valid(credentials: dict) -> bool:
+def get_crossaccount_credentials(force_refresh: bool = False, rejected_access_key: str = None):
+    """
+    Parameter Store에서 Cross-account 자격증명 가져오기 (프로세스 내 캐시)
+    두 파라미터를 get_parameters 1회로 조회하고 _SSM_KEY_CACHE_SECONDS 동안 재사용
+    STS가 키를 거부했으면 잠금 안에서 캐시된 키와 비교해 같은 키일 때만 무효화 후 재조회
+    (다른 요청이 이미 새 키로 교체했으면 그 키를 사용하므로 교체된 키가 다시 지워지지 않음)
+    
+    Args:
+        force_refresh: 캐시를 무시하고 다시 조회
+        rejected_access_key: STS가 거부한 액세스 키 (선택적)
+    
+    Returns:
+        tuple: (access_key, secret_key) 또는 (None, None)
+    """
+    with _ssm_key_lock:
+        cached_keys = _ssm_key_cache["keys"]
+        if rejected_access_key:
+            if cached_keys and cached_keys[0] != rejected_access_key:
+                _increment_stat("ssm_key_cache_hits")
+                log_debug("다른 요청이 이미 cross-account 키를 교체함, 새 키 사용")
+                return cached_keys
+            if cached_keys:
+                _ssm_key_cache["keys"] = None
+                _ssm_key_cache["fetched_at"] = 0.0
+                _increment_stat("ssm_key_invalidations")
+                log_info("Cross-account 키 캐시 무효화 (STS 인증 실패)")
+        elif cached_keys and not force_refresh and time.monotonic() - _ssm_key_cache["fetched_at"] < _SSM_KEY_CACHE_SECONDS:
+            _increment_stat("ssm_key_cache_hits")
+            return cached_keys
+        
+        keys = _fetch_crossaccount_keys()
+    
+    if rejected_access_key:
+        # 거부된 키로 만든 풀 클라이언트 제거
+        evict_credentials(rejected_access_key)
+    return keys
+
+
+def build_credentials_dict(sts_credentials: dict) -> dict:
+    """
+    STS 응답의 Credentials를 환경 변수 형식 자격증명으로 변환
+    만료 시간은 AWS_CREDENTIAL_EXPIRATION (ISO 8601, UTC)으로 함께 전달
+    
+    Args:
+        sts_credentials: assume_role 응답의 Credentials
+        
+    Returns:
+        dict: AWS 환경 변수 형식 자격증명
+    """
+    expiration = sts_credentials.get('Expiration')
+    if not isinstance(expiration, datetime):
+        expiration = datetime.now(timezone.utc) + timedelta(minutes=_CACHE_EXPIRY_MINUTES)
+    return {
+        'AWS_ACCESS_KEY_ID': sts_credentials['AccessKeyId'],
+        'AWS_SECRET_ACCESS_KEY': sts_credentials['SecretAccessKey'],
+        'AWS_SESSION_TOKEN': sts_credentials['SessionToken'],
+        'AWS_CREDENTIAL_EXPIRATION': expiration.astimezone(timezone.utc).isoformat()
+    }
+
+
+def get_credentials_expiration(credentials: dict):
+    """
+    자격증명의 만료 시간 반환
+    
+    Args:
+        credentials: AWS 환경 변수 형식 자격증명
+        
+    Returns:
+        datetime: 만료 시간 (UTC) 또는 None (만료 정보 없음)
+    """
+    if not credentials or not credentials.get('AWS_CREDENTIAL_EXPIRATION'):
+        return None
+    try:
+        return datetime.fromisoformat(credentials['AWS_CREDENTIAL_EXPIRATION'])
+    except (TypeError, ValueError):
+        return None
+
+
+def get_credentials_remaining_seconds(credentials: dict):
+    """
+    자격증명의 남은 유효 시간 (초)
+    
+    Args:
+        credentials: AWS 환경 변수 형식 자격증명
+        
+    Returns:
+        float: 남은 시간 (초) 또는 None (만료 정보 없음)
+    """
+    expiration = get_credentials_expiration(credentials)
+    if expiration is None:
+        return None
+    return (expiration - datetime.now(timezone.utc)).total_seconds()
+
+
+def is_credentials_valid(credentials: dict, min_remaining_seconds: float = 0) -> bool:
     """
-    캐시된 자격증명이 유효한지 확인
+    캐시된 자격증명이 유효한지 확인 (STS 만료 시간 기준)
     
     Args:
         credentials: 캐시된 자격증명 딕셔너리
+        min_remaining_seconds: 추가로 요구하는 최소 남은 유효 시간 (초)
         
     Returns:
         bool: 유효 여부
     """
-    if not credentials or 'timestamp' not in credentials:
+    remaining = get_credentials_remaining_seconds(credentials)
+    if remaining is None:
         return False
     
-    # 캐시 만료 시간 확인
-    cache_time = credentials['timestamp']
-    expiry_time = cache_time + timedelta(minutes=_CACHE_EXPIRY_MINUTES)
-    
-    if datetime.now() > expiry_time:
-        log_debug(f"자격증명 캐시 만료")
+    if remaining < max(_REFRESH_MARGIN_SECONDS, min_remaining_seconds):
+        log_debug(f"자격증명 만료 임박 (남은 시간: {int(remaining)}초)")
         return False
     
     return True
 
 
-def get_cached_credentials(account_id: str) -> dict:
+def get_cached_credentials(account_id: str, min_remaining_seconds: float = 0) -> dict:
     """
     캐시에서 자격증명 가져오기
     
     Args:
         account_id: AWS 계정 ID
+        min_remaining_seconds: 요구하는 최소 남은 유효 시간 (초)
         
     Returns:
         dict: 유효한 자격증명 또는 None
@@ -92,18 +371,23 @@ def get_cached_credentials(account_id: str) -> dict:
         
         if account_id in _credentials_cache:
             cached = _credentials_cache[account_id]
-            if is_credentials_valid(cached):
-                log_debug(f"✅ 캐시된 자격증명 사용: {account_id}")
-                # 타임스탐프 제외한 자격증명만 반환
+            cached['last_used'] = time.monotonic()
+            if is_credentials_valid(cached, min_remaining_seconds):
+                log_debug(f"✅ 캐시된 자격증명 사용: {account_id} (남은 시간: {int(get_credentials_remaining_seconds(cached))}초)")
+                # 내부 관리 필드 제외한 자격증명만 반환
                 return {
                     'AWS_ACCESS_KEY_ID': cached['AWS_ACCESS_KEY_ID'],
                     'AWS_SECRET_ACCESS_KEY': cached['AWS_SECRET_ACCESS_KEY'],
-                    'AWS_SESSION_TOKEN': cached['AWS_SESSION_TOKEN']
+                    'AWS_SESSION_TOKEN': cached['AWS_SESSION_TOKEN'],
+                    'AWS_CREDENTIAL_EXPIRATION': cached['AWS_CREDENTIAL_EXPIRATION']
                 }
-            else:
-                # 만료된 캐시 삭제
+            elif not is_credentials_valid(cached):
+                # 만료된 캐시 삭제 (최소 유효 시간만 부족한 경우는 갱신 후 교체)
                 del _credentials_cache[account_id]
+                _increment_stat("cache_expired")
                 log_debug(f"❌ 만료된 자격증명 캐시 삭제: {account_id}")
+            else:
+                _increment_stat("cache_short_lifetime")
         else:
             log_debug(f"❌ 캐시 미스: 계정 {account_id}에 대한 캐시 없음")
     
@@ -112,123 +396,462 @@ def get_cached_credentials(account_id: str) -> dict:
 
 def cache_credentials(account_id: str, credentials: dict):
     """
-    자격증명을 캐시에 저장
+    자격증명을 캐시에 저장하고 백그라운드 갱신 스레드 시작
     
     Args:
         account_id: AWS 계정 ID
-        credentials: 저장할 자격증명
+        credentials: 저장할 자격증명 (AWS_CREDENTIAL_EXPIRATION 포함)
     """
+    expiration = credentials.get('AWS_CREDENTIAL_EXPIRATION')
+    if not get_credentials_expiration(credentials):
+        expiration = (datetime.now(timezone.utc) + timedelta(minutes=_CACHE_EXPIRY_MINUTES)).isoformat()
+    
     with _cache_lock:
+        previous = _credentials_cache.get(account_id, {})
         _credentials_cache[account_id] = {
             'AWS_ACCESS_KEY_ID': credentials['AWS_ACCESS_KEY_ID'],
             'AWS_SECRET_ACCESS_KEY': credentials['AWS_SECRET_ACCESS_KEY'],
             'AWS_SESSION_TOKEN': credentials['AWS_SESSION_TOKEN'],
-            'timestamp': datetime.now()
+            'AWS_CREDENTIAL_EXPIRATION': expiration,
+            'last_used': previous.get('last_used', time.monotonic())
         }
-        log_debug(f"[캐싱 저장] 자격증명 캐시 저장: {account_id} (만료: {_CACHE_EXPIRY_MINUTES}분, 캐시 크기: {len(_credentials_cache)})")
+        log_debug(f"[캐싱 저장] 자격증명 캐시 저장: {account_id} (만료: {expiration}, 캐시 크기: {len(_credentials_cache)})")
+    
+    _start_background_refresh()
 
 
-def get_crossaccount_session(account_id: str) -> dict:
+def refresh_expiring_credentials() -> int:
+    """
+    최근 사용된 계정 중 만료가 가까운 자격증명을 미리 갱신
+    (만료 직후 첫 요청이 SSM + STS 지연을 그대로 겪지 않도록 함)
+    
+    Returns:
+        int: 갱신된 계정 수
+    """
+    now = time.monotonic()
+    with _cache_lock:
+        targets = [
+            account_id for account_id, cached in _credentials_cache.items()
+            if now - cached.get('last_used', 0) <= _RECENT_USE_SECONDS
+            and (get_credentials_remaining_seconds(cached) or 0) < _PROACTIVE_REFRESH_SECONDS
+        ]
+        # 오래 사용되지 않은 만료 자격증명 정리
+        for account_id in [a for a, c in _credentials_cache.items() if a not in targets and not is_credentials_valid(c)]:
+            del _credentials_cache[account_id]
+    
+    refreshed = 0
+    for account_id in targets:
+        log_debug(f"[백그라운드 갱신] 만료 임박 자격증명 갱신: {account_id}")
+        if _acquire_singleflight(account_id):
+            refreshed += 1
+    
+    # Role 방식 hop-1 자격증명도 최근 사용되었으면 미리 갱신
+    with _hop1_lock:
+        hop1 = _hop1_cache["credentials"]
+        hop1_due = (
+            hop1 is not None
+            and now - _hop1_cache["last_used"] <= _RECENT_USE_SECONDS
+            and (get_credentials_remaining_seconds(hop1) or 0) < _PROACTIVE_REFRESH_SECONDS
+        )
+    if hop1_due:
+        try:
+            get_hop1_credentials(force_refresh=True)
+            refreshed += 1
+        except Exception as e:
+            log_error(f"[백그라운드 갱신] hop-1 자격증명 갱신 실패: {e}")
+    
+    if refreshed:
+        log_info(f"[백그라운드 갱신] 자격증명 {refreshed}개 갱신 완료")
+    return refreshed
+
+
+def _background_refresh_loop():
+    """백그라운드 자격증명 갱신 루프 (데몬 스레드)"""
+    while True:
+        time.sleep(_REFRESH_CHECK_INTERVAL_SECONDS)
+        try:
+            refresh_expiring_credentials()
+        except Exception as e:
+            log_error(f"[백그라운드 갱신] 자격증명 갱신 중 오류: {e}")
+
+
+def _start_background_refresh():
+    """백그라운드 갱신 스레드 시작 (프로세스당 1개)"""
+    global _refresh_thread
+    with _cache_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return
+        _refresh_thread = threading.Thread(target=_background_refresh_loop, name="credential-refresh")
+        _refresh_thread.daemon = True
+        _refresh_thread.start()
+
+
+def get_crossaccount_session(account_id: str, min_remaining_seconds: float = 0, use_broker: bool = True) -> dict:
     """
     Cross-account 세션 생성 (캐싱 포함)
     Reference 코드와 동일한 로직 (User 방식 → Role 방식 폴백)
+    호스트에 자격증명 브로커가 실행 중이면 브로커에서 조회 (프로세스 간 캐시 공유)
     
     Args:
         account_id: AWS 계정 ID (12자리)
+        min_remaining_seconds: 요구하는 최소 남은 유효 시간 (초, 장시간 작업용)
+        use_broker: 자격증명 브로커 사용 여부 (브로커 프로세스 자신은 False)
         
     Returns:
-        dict: AWS 환경 변수 또는 None
+        dict: AWS 환경 변수 (AWS_CREDENTIAL_EXPIRATION 포함) 또는 None
     """
     log_debug(f"[캐싱 시작] 계정 {account_id}에 대한 자격증명 조회")
     
     # 1. 캐시 확인 (먼저 캐시된 자격증명 사용)
-    cached_creds = get_cached_credentials(account_id)
+    cached_creds = get_cached_credentials(account_id, min_remaining_seconds)
     if cached_creds:
+        _increment_stat("cache_hits")
         log_debug(f"[캐싱 성공] 캐시된 자격증명 반환: {account_id}")
         return cached_creds
     
+    # 2. 자격증명 브로커 조회 (연결할 수 없으면 직접 발급으로 폴백)
+    if use_broker:
+        from aws_tools.credential_broker import is_broker_available, get_credentials_from_broker, BrokerUnavailableError
+        if is_broker_available():
+            try:
+                _increment_stat("broker_requests")
+                return get_credentials_from_broker(account_id, min_remaining_seconds)
+            except BrokerUnavailableError as e:
+                _increment_stat("broker_fallbacks")
+                log_error(f"{e} - 직접 발급으로 폴백")
+    
+    _increment_stat("cache_misses")
     log_debug(f"[캐싱 미스] 새로운 자격증명 생성 필요: {account_id}")
     
+    # 3. 같은 계정의 발급이 진행 중이면 그 결과를 기다림 (single-flight)
+    return _acquire_singleflight(account_id)
+
+
+async def get_crossaccount_session_async(
+    account_id: str,
+    min_remaining_seconds: float = 0,
+    timeout: float = CREDENTIAL_TIMEOUT_SECONDS
+) -> dict:
+    """
+    Cross-account 세션 비동기 생성
+    캐시 적중 시 바로 반환하고, 미스 시 전용 스레드 풀에서 발급해 이벤트 루프를 막지 않음
+    시간 초과나 호출 취소 시에도 진행 중인 발급은 계속되어 결과가 캐시에 저장됨
+    
+    Args:
+        account_id: AWS 계정 ID (12자리)
+        min_remaining_seconds: 요구하는 최소 남은 유효 시간 (초, 장시간 작업용)
+        timeout: 최대 대기 시간 (초)
+        
+    Returns:
+        dict: AWS 환경 변수 (AWS_CREDENTIAL_EXPIRATION 포함) 또는 None (실패/시간 초과)
+    """
+    cached_creds = get_cached_credentials(account_id, min_remaining_seconds)
+    if cached_creds:
+        _increment_stat("cache_hits")
+        return cached_creds
+    
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_credential_executor, get_crossaccount_session, account_id, min_remaining_seconds)
+    try:
+        return await asyncio.wait_for(future, timeout=timeout)
+    except asyncio.TimeoutError:
+        _increment_stat("async_timeouts")
+        log_error(f"자격증명 발급 시간 초과: {account_id} ({timeout}초)")
+        return None
+
+
+def _acquire_singleflight(account_id: str) -> dict:
+    """
+    계정별 single-flight 자격증명 발급
+    첫 요청만 SSM + STS를 호출하고, 동시에 들어온 요청은 같은 결과를 받음
+    (asyncio 경로와 스레드 경로 모두 스레드 이벤트로 대기하므로 함께 동작)
+    
+    Args:
+        account_id: AWS 계정 ID (12자리)
+        
+    Returns:
+        dict: AWS 환경 변수 형식 자격증명 또는 None
+    """
+    with _cache_lock:
+        flight = _inflight_acquisitions.get(account_id)
+        is_leader = flight is None
+        if is_leader:
+            flight = _InflightAcquisition()
+            _inflight_acquisitions[account_id] = flight
+    
+    if not is_leader:
+        _increment_stat("singleflight_waits")
+        log_debug(f"[single-flight] 진행 중인 발급 대기: {account_id}")
+        if not flight.done.wait(timeout=_INFLIGHT_WAIT_SECONDS):
+            log_error(f"[single-flight] 발급 대기 시간 초과: {account_id}")
+            return None
+        if flight.result:
+            _increment_stat("sts_calls_saved", flight.sts_calls)
+        return flight.result
+    
+    creds_dict = None
+    started = time.perf_counter()
+    try:
+        _increment_stat("acquisitions")
+        creds_dict = _assume_crossaccount_role(account_id, flight)
+        _observe_latency("acquisition", started)
+        if creds_dict:
+            # 생성된 자격증명 캐시에 저장
+            cache_credentials(account_id, creds_dict)
+    finally:
+        flight.result = creds_dict
+        with _cache_lock:
+            _inflight_acquisitions.pop(account_id, None)
+        flight.done.set()
+    return creds_dict
+
+
+def _record_sts_call(flight: _InflightAcquisition = None):
+    """assume_role 호출 수 기록 (single-flight 대기자가 절약한 호출 수 계산용)"""
+    _increment_stat("sts_assume_role_calls")
+    if flight is not None:
+        flight.sts_calls += 1
+
+
+def _timed_assume_role(metric: str, sts_client, **kwargs) -> dict:
+    """assume_role 호출 (지연 시간과 오류/스로틀링 기록)"""
+    started = time.perf_counter()
+    try:
+        return sts_client.assume_role(**kwargs)
+    except ClientError as e:
+        _record_sts_error(e)
+        raise
+    finally:
+        _observe_latency(metric, started)
+
+
+def _assume_with_user_keys(account_id: str, access_key: str, secret_key: str, flight: _InflightAcquisition = None) -> dict:
+    """
+    User 방식: Parameter Store의 cross-account 키로 대상 계정 역할 assume
+    
+    Args:
+        account_id: AWS 계정 ID (12자리)
+        access_key: cross-account 액세스 키
+        secret_key: cross-account 시크릿 키
+        flight: 진행 중인 발급 (assume_role 호출 수 기록용, 선택적)
+    
+    Returns:
+        dict: AWS 환경 변수 형식 자격증명
+    """
+    log_debug("Cross-account 자격증명 확보, STS assume role 시도")
+    sts_client = get_client('sts', credentials={
+        'AWS_ACCESS_KEY_ID': access_key,
+        'AWS_SECRET_ACCESS_KEY': secret_key
+    })
+    role_arn = f"arn:aws:iam::{account_id}:role/SaltwareCrossAccount"
+    log_debug(f"Assume role: {role_arn}")
+    _record_sts_call(flight)
+    assumed_role = _timed_assume_role(
+        "sts_user_assume_role",
+        sts_client,
+        RoleArn=role_arn,
+        RoleSessionName=f"SlackBot-{account_id}"
+    )
+    log_debug("Cross-account 세션 생성 성공")
+    return build_credentials_dict(assumed_role['Credentials'])
+
+
+def get_hop1_credentials(flight: _InflightAcquisition = None, force_refresh: bool = False) -> dict:
+    """
+    Role 방식 1단계: crossaccount 역할 자격증명 (만료 임박 전까지 모든 대상 계정이 공유)
+    잠금 안에서 발급하므로 동시 요청도 assume_role 1회만 호출
+    
+    Args:
+        flight: 진행 중인 발급 (assume_role 호출 수 기록용, 선택적)
+        force_refresh: 캐시를 무시하고 다시 발급
+    
+    Returns:
+        dict: AWS 환경 변수 형식 hop-1 자격증명
+    """
+    with _hop1_lock:
+        _hop1_cache["last_used"] = time.monotonic()
+        cached = _hop1_cache["credentials"]
+        if cached and not force_refresh and is_credentials_valid(cached):
+            _increment_stat("hop1_cache_hits")
+            log_debug(f"1단계: 캐시된 crossaccount 역할 자격증명 사용 (남은 시간: {int(get_credentials_remaining_seconds(cached))}초)")
+            return cached
+        
+        # q-slack-role → crossaccount 역할 assume
+        log_debug("1단계: crossaccount 역할 assume")
+        sts_client = get_client('sts')
+        _record_sts_call(flight)
+        _increment_stat("hop1_assume_role_calls")
+        crossaccount_role = _timed_assume_role(
+            "sts_hop1_assume_role",
+            sts_client,
+            RoleArn=_HOP1_ROLE_ARN,
+            RoleSessionName="SlackBot-CrossAccount",
+            ExternalId=_CROSSACCOUNT_EXTERNAL_ID
+        )
+        credentials = build_credentials_dict(crossaccount_role['Credentials'])
+        _hop1_cache["credentials"] = credentials
+        return credentials
+
+
+def _assume_with_hop1_credentials(account_id: str, hop1: dict, flight: _InflightAcquisition = None) -> dict:
+    """
+    Role 방식 2단계: hop-1 자격증명으로 대상 계정 역할 assume
+    
+    Args:
+        account_id: AWS 계정 ID (12자리)
+        hop1: hop-1 crossaccount 역할 자격증명
+        flight: 진행 중인 발급 (assume_role 호출 수 기록용, 선택적)
+    
+    Returns:
+        dict: AWS 환경 변수 형식 자격증명
+    """
+    log_debug("2단계: crossaccount 자격증명으로 target account assume")
+    crossaccount_sts = get_client('sts', credentials=hop1)
+
+    role_arn = f"arn:aws:iam::{account_id}:role/SaltwareCrossAccount"
+    log_debug(f"Role 방식 Assume role: {role_arn} (with ExternalId)")
+    _record_sts_call(flight)
+    assumed_role = _timed_assume_role(
+        "sts_hop2_assume_role",
+        crossaccount_sts,
+        RoleArn=role_arn,
+        RoleSessionName=f"SlackBot-{account_id}",
+        ExternalId=_CROSSACCOUNT_EXTERNAL_ID
+    )
+    log_debug("Role 방식 Cross-account 세션 생성 성공")
+    return build_credentials_dict(assumed_role['Credentials'])
+
+
+def _assume_crossaccount_role(account_id: str, flight: _InflightAcquisition = None) -> dict:
+    """
+    대상 계정의 SaltwareCrossAccount 역할 assume (캐시 미사용)
+    User 방식 실패 시 Role 방식(2단계)으로 폴백
+    
+    Args:
+        account_id: AWS 계정 ID (12자리)
+        flight: 진행 중인 발급 (assume_role 호출 수 기록용, 선택적)
+        
+    Returns:
+        dict: AWS 환경 변수 형식 자격증명 또는 None
+    """
     try:
         log_debug(f"계정 {account_id}에 대한 cross-account 세션 생성 시도")
         access_key, secret_key = get_crossaccount_credentials()
         if access_key and secret_key:
-            log_debug("Cross-account 자격증명 확보, STS assume role 시도")
-            crossaccount_session = boto3.Session(
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key
-            )
-            sts_client = crossaccount_session.client('sts')
-            role_arn = f"arn:aws:iam::{account_id}:role/SaltwareCrossAccount"
-            log_debug(f"Assume role: {role_arn}")
-            assumed_role = sts_client.assume_role(
-                RoleArn=role_arn,
-                RoleSessionName=f"SlackBot-{account_id}"
-            )
-            credentials = assumed_role['Credentials']
-            log_debug("Cross-account 세션 생성 성공")
-            
-            # 생성된 자격증명 캐시에 저장
-            creds_dict = {
-                'AWS_ACCESS_KEY_ID': credentials['AccessKeyId'],
-                'AWS_SECRET_ACCESS_KEY': credentials['SecretAccessKey'],
-                'AWS_SESSION_TOKEN': credentials['SessionToken']
-            }
-            cache_credentials(account_id, creds_dict)
-            
-            return creds_dict
+            try:
+                credentials = _assume_with_user_keys(account_id, access_key, secret_key, flight)
+                _increment_stat("path_user")
+                return credentials
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') not in _STS_REJECTED_KEY_ERRORS:
+                    raise
+                # 캐시된 키가 교체되었을 수 있으므로 다시 조회 후 1회 재시도
+                log_debug(f"STS가 cross-account 키를 거부함, 키 재조회 후 재시도: {e}")
+                access_key, secret_key = get_crossaccount_credentials(rejected_access_key=access_key)
+                if not (access_key and secret_key):
+                    raise
+                credentials = _assume_with_user_keys(account_id, access_key, secret_key, flight)
+                _increment_stat("path_user")
+                return credentials
         else:
             log_error("Cross-account 자격증명을 가져올 수 없음")
     except Exception as user_error:
         log_debug(f"User 방식 실패: {user_error}")
 
         # Role 방식 폴백 시도 (2단계)
+        _increment_stat("path_role_fallback")
         try:
             log_debug("Role 방식으로 폴백 시도")
 
-            # 1단계: q-slack-role → crossaccount 역할 assume
-            log_debug("1단계: crossaccount 역할 assume")
-            sts_client = boto3.client('sts')
-            crossaccount_role = sts_client.assume_role(
-                RoleArn="arn:aws:iam::370662402529:role/crossaccount",
-                RoleSessionName="SlackBot-CrossAccount",
-                ExternalId="saltwarec0rp"
-            )
+            # 1단계: q-slack-role → crossaccount 역할 (캐시된 hop-1 자격증명 공유)
+            hop1 = get_hop1_credentials(flight)
 
             # 2단계: crossaccount 자격증명으로 target account assume
-            log_debug("2단계: crossaccount 자격증명으로 target account assume")
-            crossaccount_session = boto3.Session(
-                aws_access_key_id=crossaccount_role['Credentials']['AccessKeyId'],
-                aws_secret_access_key=crossaccount_role['Credentials']['SecretAccessKey'],
-                aws_session_token=crossaccount_role['Credentials']['SessionToken']
-            )
-            crossaccount_sts = crossaccount_session.client('sts')
-
-            role_arn = f"arn:aws:iam::{account_id}:role/SaltwareCrossAccount"
-            log_debug(f"Role 방식 Assume role: {role_arn} (with ExternalId)")
-            assumed_role = crossaccount_sts.assume_role(
-                RoleArn=role_arn,
-                RoleSessionName=f"SlackBot-{account_id}",
-                ExternalId="saltwarec0rp"
-            )
-            credentials = assumed_role['Credentials']
-            log_debug("Role 방식 Cross-account 세션 생성 성공")
-            
-            # 생성된 자격증명 캐시에 저장
-            creds_dict = {
-                'AWS_ACCESS_KEY_ID': credentials['AccessKeyId'],
-                'AWS_SECRET_ACCESS_KEY': credentials['SecretAccessKey'],
-                'AWS_SESSION_TOKEN': credentials['SessionToken']
-            }
-            cache_credentials(account_id, creds_dict)
-            
-            return creds_dict
+            try:
+                credentials = _assume_with_hop1_credentials(account_id, hop1, flight)
+                _increment_stat("path_role")
+                return credentials
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') not in _STS_REJECTED_KEY_ERRORS + ('ExpiredToken',):
+                    raise
+                # 캐시된 hop-1 자격증명이 무효화된 경우 새로 발급 후 1회 재시도
+                log_debug(f"hop-1 자격증명 거부됨, 재발급 후 재시도: {e}")
+                hop1 = get_hop1_credentials(flight, force_refresh=True)
+                credentials = _assume_with_hop1_credentials(account_id, hop1, flight)
+                _increment_stat("path_role")
+                return credentials
         except Exception as role_error:
             log_error(f"Role 방식도 실패: {role_error}")
 
+    _increment_stat("acquisition_failures")
     return None
 
 
+def get_caller_account(credentials: dict = None) -> str:
+    """
+    자격증명의 실제 계정 ID 조회 (AWS CLI 서브프로세스 대신 풀 STS 클라이언트 사용)
+    결과는 액세스 키별로 자격증명 만료 시까지 캐시
+    
+    Args:
+        credentials: AWS 환경 변수 형식 자격증명 (None이면 기본 자격증명 체인)
+    
+    Returns:
+        str: 실제 계정 ID
+    
+    Raises:
+        ClientError, BotoCoreError: STS 호출 실패 (만료/잘못된 자격증명, 네트워크 오류 등)
+    """
+    access_key = (credentials or {}).get('AWS_ACCESS_KEY_ID')
+    if access_key:
+        with _identity_lock:
+            cached = _identity_cache.get(access_key)
+            if cached and cached["expires_at"] > time.time():
+                _increment_stat("identity_cache_hits")
+                return cached["account"]
+    
+    _increment_stat("identity_checks")
+    started = time.perf_counter()
+    try:
+        account = get_client('sts', credentials=credentials).get_caller_identity()['Account']
+    except ClientError as e:
+        _record_sts_error(e)
+        raise
+    finally:
+        _observe_latency("sts_get_caller_identity", started)
+    
+    if access_key:
+        expiration = get_credentials_expiration(credentials)
+        if expiration is not None:
+            expires_at = expiration.timestamp()
+        else:
+            expires_at = time.time() + _IDENTITY_CACHE_FALLBACK_SECONDS
+        with _identity_lock:
+            now = time.time()
+            for key in [key for key, entry in _identity_cache.items() if entry["expires_at"] <= now]:
+                del _identity_cache[key]
+            _identity_cache[access_key] = {"account": account, "expires_at": expires_at}
+    return account
+
+
+def verify_account_identity(account_id: str, credentials: dict = None) -> tuple:
+    """
+    계정 검증용 실제 계정 ID 조회 (실패해도 예외 대신 오류 메시지 반환)
+    계정 불일치 판단은 호출자가 account_id와 비교해 처리
+    
+    Args:
+        account_id: 요청한 AWS 계정 ID (12자리, 로그용)
+        credentials: AWS 환경 변수 형식 자격증명 (None이면 기본 자격증명 체인)
+    
+    Returns:
+        tuple: (실제 계정 ID, None) 또는 조회 실패 시 (None, 오류 메시지)
+    """
+    try:
+        return get_caller_account(credentials), None
+    except Exception as e:
+        log_error(f"계정 검증 실패: {account_id} - {e}")
+        return None, str(e)
+
+
 def validate_account_id(account_id: str) -> bool:
     """
     AWS 계정 ID 유효성 검사
@@ -0,0 +1,180 @@
+"""
+boto3 Client Pool
+(자격증명 식별자, 리전, 서비스) 키로 boto3 클라이언트 재사용
+공유 botocore 세션으로 서비스 모델 로더 캐시를 공유하고, 자격증명이 만료되면 해당 클라이언트 제거
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+import botocore.session
+from botocore.config import Config
+from utils.logging_config import log_debug
+
+# 풀 클라이언트 공통 설정 (스레드 병렬 수집을 고려한 연결 풀 크기, 표준 재시도)
+CLIENT_CONFIG = Config(
+    max_pool_connections=int(os.environ.get('AWS_CLIENT_MAX_POOL_CONNECTIONS', '32')),
+    retries={'max_attempts': int(os.environ.get('AWS_CLIENT_MAX_ATTEMPTS', '5')), 'mode': 'standard'},
+    connect_timeout=5,
+    read_timeout=60
+)
+
+# 최대 보관 클라이언트 수 (초과 시 가장 오래 사용하지 않은 클라이언트 제거)
+MAX_POOLED_CLIENTS = int(os.environ.get('AWS_CLIENT_POOL_SIZE', '256'))
+
+# 만료 임박 기준 (남은 유효 시간이 이보다 짧은 자격증명의 클라이언트는 풀에서 제거)
+_EXPIRY_MARGIN_SECONDS = 60
+
+# 기본 자격증명 체인(인스턴스 역할 등)을 사용하는 클라이언트의 식별자
+_DEFAULT_IDENTITY = 'default'
+
+_pool = OrderedDict()
+_pool_lock = threading.Lock()
+_shared_session = None
+
+# 클라이언트 생성 직렬화 (botocore 세션은 스레드 안전하지 않음, 풀 조회는 생성 중에도 _pool_lock만 사용)
+_create_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "create_ms_total": 0.0}
+
+
+def _get_shared_session() -> botocore.session.Session:
+    """서비스 모델 로더 캐시를 공유하는 botocore 세션 (프로세스당 1개, _create_lock은 호출자가 보유)"""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = botocore.session.get_session()
+    return _shared_session
+
+
+def _parse_expiration(credentials: dict):
+    """자격증명의 AWS_CREDENTIAL_EXPIRATION을 epoch 초로 변환 (없으면 None)"""
+    value = (credentials or {}).get('AWS_CREDENTIAL_EXPIRATION')
+    if not value:
+        return None
+    try:
+        expiration = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if expiration.tzinfo is None:
+        expiration = expiration.replace(tzinfo=timezone.utc)
+    return expiration.timestamp()
+
+
+def _is_expired(entry: dict) -> bool:
+    """풀 항목의 자격증명이 만료(임박)되었는지 확인"""
+    expires_at = entry.get("expires_at")
+    return expires_at is not None and expires_at - time.time() < _EXPIRY_MARGIN_SECONDS
+
+
+def _get_pooled_client(key):
+    """풀에 있는 유효한 클라이언트 반환 (만료된 항목은 제거, _pool_lock은 호출자가 보유)"""
+    entry = _pool.get(key)
+    if entry is not None and not _is_expired(entry):
+        _pool.move_to_end(key)
+        _stats["hits"] += 1
+        return entry["client"]
+
+    if entry is not None:
+        del _pool[key]
+        _stats["evictions"] += 1
+    return None
+
+
+def get_client(service: str, region: str = None, credentials: dict = None):
+    """
+    풀에서 boto3 클라이언트 가져오기 (없거나 자격증명이 만료되었으면 새로 생성)
+    생성은 풀 잠금 밖에서 하므로 다른 클라이언트 조회가 생성 시간 동안 막히지 않음
+    
+    Args:
+        service: AWS 서비스 이름 (ec2, s3, sts 등)
+        region: 리전 (None이면 기본 리전/글로벌 엔드포인트)
+        credentials: AWS 환경 변수 형식 자격증명 (None이면 기본 자격증명 체인)
+    
+    Returns:
+        botocore 클라이언트 (boto3.client와 동일한 인터페이스)
+    """
+    credentials = credentials or {}
+    access_key = credentials.get('AWS_ACCESS_KEY_ID')
+    identity = access_key or _DEFAULT_IDENTITY
+    key = (identity, region, service)
+
+    with _pool_lock:
+        client = _get_pooled_client(key)
+    if client is not None:
+        return client
+
+    with _create_lock:
+        # 생성 대기 중에 다른 스레드가 같은 키의 클라이언트를 만들었으면 재사용
+        with _pool_lock:
+            client = _get_pooled_client(key)
+        if client is not None:
+            return client
+
+        started = time.perf_counter()
+        client_kwargs = {"region_name": region, "config": CLIENT_CONFIG}
+        if access_key:
+            client_kwargs.update(
+                aws_access_key_id=access_key,
+                aws_secret_access_key=credentials.get('AWS_SECRET_ACCESS_KEY'),
+                aws_session_token=credentials.get('AWS_SESSION_TOKEN')
+            )
+        client = _get_shared_session().create_client(service, **client_kwargs)
+        create_ms = (time.perf_counter() - started) * 1000
+
+        with _pool_lock:
+            _stats["misses"] += 1
+            _stats["create_ms_total"] += create_ms
+            _pool[key] = {"client": client, "expires_at": _parse_expiration(credentials)}
+            while len(_pool) > MAX_POOLED_CLIENTS:
+                _pool.popitem(last=False)
+                _stats["evictions"] += 1
+
+    log_debug(f"boto3 클라이언트 생성: {service} ({region or 'default'}, {identity[:8]}...)")
+    return client
+
+
+def evict_expired_clients() -> int:
+    """
+    자격증명이 만료된 클라이언트 제거
+    
+    Returns:
+        int: 제거된 클라이언트 수
+    """
+    with _pool_lock:
+        expired = [key for key, entry in _pool.items() if _is_expired(entry)]
+        for key in expired:
+            del _pool[key]
+        _stats["evictions"] += len(expired)
+    return len(expired)
+
+
+def evict_credentials(access_key_id: str) -> int:
+    """
+    특정 자격증명으로 만든 클라이언트 모두 제거 (자격증명 폐기/교체 시)
+    
+    Args:
+        access_key_id: 액세스 키 ID
+    
+    Returns:
+        int: 제거된 클라이언트 수
+    """
+    with _pool_lock:
+        keys = [key for key in _pool if key[0] == access_key_id]
+        for key in keys:
+            del _pool[key]
+        _stats["evictions"] += len(keys)
+    return len(keys)
+
+
+def get_pool_stats() -> dict:
+    """
+    클라이언트 풀 통계
+    
+    Returns:
+        dict: 적중/미스/제거 수, 현재 크기, 누적 생성 시간(ms)
+    """
+    with _pool_lock:
+        stats = dict(_stats)
+        stats["size"] = len(_pool)
+    stats["create_ms_total"] = round(stats["create_ms_total"], 1)
+    return stats
@@ -0,0 +1,214 @@
+"""
+Credential Broker
+호스트의 모든 프로세스(WebSocket 백엔드, FastAPI, Slack 봇)가 Unix 도메인 소켓으로 계정별 자격증명을 요청
+캐시, single-flight 발급, 만료 전 갱신은 브로커 프로세스 한 곳에서만 수행 (aws_tools.auth 로직 재사용)
+
+실행: python3 -m aws_tools.credential_broker
+프로토콜: 요청 1줄(JSON) → 응답 1줄(JSON)
+    {"op": "get_credentials", "account_id": "123456789012", "min_remaining_seconds": 0}
+    {"op": "stats"}
+"""
+import os
+import json
+import socket
+import socketserver
+from utils.logging_config import log_debug, log_error, log_info
+
+# 브로커 소켓 경로 (환경 변수로 변경 가능, systemd RuntimeDirectory 사용)
+BROKER_SOCKET_PATH = os.environ.get('CREDENTIAL_BROKER_SOCKET', '/run/zendesk-assistant/credential-broker.sock')
+
+# 클라이언트 요청 최대 대기 시간 (초, 브로커의 cold 발급 시간 포함)
+BROKER_REQUEST_TIMEOUT_SECONDS = float(os.environ.get('CREDENTIAL_BROKER_TIMEOUT', '25'))
+
+# 요청 1줄의 최대 크기
+_MAX_REQUEST_BYTES = 64 * 1024
+
+# 브로커 실행 여부 확인용 연결 최대 대기 시간 (초)
+_PROBE_TIMEOUT_SECONDS = 0.5
+
+
+class BrokerUnavailableError(Exception):
+    """브로커에 연결할 수 없거나 응답이 올바르지 않음 (호출자는 직접 발급으로 폴백)"""
+
+
+def is_broker_available(socket_path: str = None) -> bool:
+    """
+    브로커 실행 여부 확인 (소켓에 실제로 연결 시도)
+    비정상 종료로 남은 소켓 파일만 있고 브로커가 받지 않으면 False
+    
+    Args:
+        socket_path: 브로커 소켓 경로 (기본값: BROKER_SOCKET_PATH)
+    
+    Returns:
+        bool: 브로커가 연결을 받으면 True
+    """
+    path = socket_path or BROKER_SOCKET_PATH
+    if not os.path.exists(path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.settimeout(_PROBE_TIMEOUT_SECONDS)
+            probe.connect(path)
+        return True
+    except OSError:
+        return False
+
+
+def request_broker(request: dict, socket_path: str = None, timeout: float = BROKER_REQUEST_TIMEOUT_SECONDS) -> dict:
+    """
+    브로커에 요청 1건 전송 후 응답 반환
+    
+    Args:
+        request: 요청 딕셔너리 (op 필드 필수)
+        socket_path: 브로커 소켓 경로 (기본값: BROKER_SOCKET_PATH)
+        timeout: 최대 대기 시간 (초)
+    
+    Returns:
+        dict: 브로커 응답
+    
+    Raises:
+        BrokerUnavailableError: 연결 실패, 시간 초과, 잘못된 응답
+    """
+    path = socket_path or BROKER_SOCKET_PATH
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(path)
+            client.sendall((json.dumps(request) + "\n").encode('utf-8'))
+
+            chunks = []
+            while True:
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if chunk.endswith(b"\n"):
+                    break
+        return json.loads(b"".join(chunks).decode('utf-8'))
+    except (OSError, ValueError) as e:
+        raise BrokerUnavailableError(f"자격증명 브로커 요청 실패 ({path}): {e}") from e
+
+
+def get_credentials_from_broker(account_id: str, min_remaining_seconds: float = 0, socket_path: str = None) -> dict:
+    """
+    브로커에서 계정 자격증명 조회
+    
+    Args:
+        account_id: AWS 계정 ID (12자리)
+        min_remaining_seconds: 요구하는 최소 남은 유효 시간 (초)
+        socket_path: 브로커 소켓 경로 (기본값: BROKER_SOCKET_PATH)
+    
+    Returns:
+        dict: AWS 환경 변수 형식 자격증명 또는 None (브로커에서 발급 실패)
+    
+    Raises:
+        BrokerUnavailableError: 브로커에 연결할 수 없음
+    """
+    response = request_broker({
+        "op": "get_credentials",
+        "account_id": account_id,
+        "min_remaining_seconds": min_remaining_seconds
+    }, socket_path=socket_path)
+
+    if not response.get("ok"):
+        log_error(f"브로커 자격증명 발급 실패: {account_id} - {response.get('error')}")
+        return None
+    return response.get("credentials")
+
+
+def handle_broker_request(request: dict) -> dict:
+    """
+    브로커 요청 처리 (브로커 프로세스 내부, 로컬 캐시와 single-flight 발급 사용)
+    
+    Args:
+        request: 요청 딕셔너리
+    
+    Returns:
+        dict: 응답 딕셔너리 (ok, credentials/stats, error)
+    """
+    from aws_tools.auth import get_crossaccount_session, get_auth_stats, validate_account_id
+
+    op = request.get("op")
+    if op == "get_credentials":
+        account_id = str(request.get("account_id", ""))
+        if not validate_account_id(account_id):
+            return {"ok": False, "error": f"잘못된 계정 ID: {account_id}"}
+
+        try:
+            min_remaining_seconds = float(request.get("min_remaining_seconds") or 0)
+        except (TypeError, ValueError):
+            min_remaining_seconds = 0
+
+        credentials = get_crossaccount_session(account_id, min_remaining_seconds=min_remaining_seconds, use_broker=False)
+        if not credentials:
+            return {"ok": False, "error": f"계정 {account_id} 자격증명 발급 실패"}
+        return {"ok": True, "credentials": credentials}
+
+    if op == "stats":
+        return {"ok": True, "stats": get_auth_stats()}
+
+    return {"ok": False, "error": f"알 수 없는 요청: {op}"}
+
+
+class _BrokerRequestHandler(socketserver.StreamRequestHandler):
+    """연결당 요청 1줄 처리"""
+
+    def handle(self):
+        try:
+            line = self.rfile.readline(_MAX_REQUEST_BYTES)
+            if not line:
+                # is_broker_available의 연결 확인 (요청 없이 닫힌 연결)
+                return
+            response = handle_broker_request(json.loads(line.decode('utf-8')))
+        except Exception as e:
+            log_error(f"브로커 요청 처리 실패: {e}")
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+
+
+class CredentialBrokerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """요청마다 스레드로 처리하는 Unix 도메인 소켓 서버"""
+    daemon_threads = True
+
+
+def serve(socket_path: str = None):
+    """
+    브로커 서버 실행 (소켓은 소유자만 접근 가능하도록 0600 권한으로 생성)
+    소켓 파일이 이미 있으면 먼저 연결해 보고, 실행 중인 브로커가 응답하면 시작하지 않음
+    (응답이 없는 소켓 파일만 이전 브로커가 남긴 것으로 보고 제거)
+    
+    Args:
+        socket_path: 브로커 소켓 경로 (기본값: BROKER_SOCKET_PATH)
+    
+    Raises:
+        RuntimeError: 같은 소켓 경로에서 다른 브로커가 실행 중
+    """
+    path = socket_path or BROKER_SOCKET_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if is_broker_available(path):
+        log_error(f"자격증명 브로커가 이미 실행 중: {path}")
+        raise RuntimeError(f"자격증명 브로커가 이미 실행 중: {path}")
+    if os.path.exists(path):
+        log_info(f"이전 브로커가 남긴 소켓 파일 제거: {path}")
+        os.remove(path)
+
+    previous_umask = os.umask(0o177)
+    try:
+        server = CredentialBrokerServer(path, _BrokerRequestHandler)
+    finally:
+        os.umask(previous_umask)
+
+    log_info(f"자격증명 브로커 시작: {path}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+        log_debug("자격증명 브로커 종료")
+
+
+if __name__ == "__main__":
+    from utils.logging_config import setup_logging
+    setup_logging("INFO")
+    serve()
@@ -0,0 +1,113 @@
+"""
+Account Prewarm
+Zendesk 티켓에서 찾은 계정 ID로 질문 전에 미리 자격증명 발급, 계정 검증, boto3 클라이언트 생성
+첫 질문이 캐시된 자격증명과 풀 클라이언트로 바로 시작하도록 함
+"""
+import re
+import time
+import threading
+from aws_tools.auth import get_crossaccount_session, verify_account_identity, validate_account_id
+from aws_tools.client_pool import get_client
+from utils.logging_config import log_debug, log_error
+
+# 메시지 1건당 최대 예열 계정 수 (티켓 본문에 숫자가 많아도 STS 호출 폭주 방지)
+MAX_PREWARM_ACCOUNTS = 5
+
+# 같은 계정 재예열 최소 간격 (초, 실패한 계정 포함 - 잘못된 계정 ID로 STS를 반복 호출하지 않음)
+_PREWARM_INTERVAL_SECONDS = 300
+
+# 미리 만들어 둘 클라이언트 (보안 보고서 수집 기준)
+_PREWARM_REGION = 'ap-northeast-2'
+_PREWARM_CLIENTS = (
+    ('ec2', _PREWARM_REGION),
+    ('s3', _PREWARM_REGION),
+    ('iam', _PREWARM_REGION),
+    ('cloudtrail', _PREWARM_REGION),
+    ('cloudwatch', _PREWARM_REGION),
+    ('support', 'us-east-1'),
+)
+
+_recent_prewarms = {}
+_recent_lock = threading.Lock()
+
+
+def extract_account_ids(values) -> list:
+    """
+    텍스트 목록에서 12자리 계정 ID 추출 (중복 제거, 등장 순서 유지)
+    
+    Args:
+        values: 문자열 또는 문자열 목록 (티켓 제목, 본문, 사용자 정의 필드 값 등)
+    
+    Returns:
+        list: 계정 ID 목록
+    """
+    if isinstance(values, str):
+        values = [values]
+
+    account_ids = []
+    for value in values or []:
+        for account_id in re.findall(r'(?<!\d)\d{12}(?!\d)', str(value)):
+            if account_id not in account_ids:
+                account_ids.append(account_id)
+    return account_ids
+
+
+def select_prewarm_accounts(account_ids) -> list:
+    """
+    예열 대상 계정 선택 (형식 검증, 최근 예열한 계정 제외, 최대 MAX_PREWARM_ACCOUNTS개)
+    선택된 계정은 예열 시작으로 기록
+    
+    Args:
+        account_ids: 요청된 계정 ID 목록
+    
+    Returns:
+        list: 예열할 계정 ID 목록
+    """
+    now = time.monotonic()
+    selected = []
+    with _recent_lock:
+        for account_id in extract_account_ids([str(a) for a in account_ids or []]):
+            if len(selected) >= MAX_PREWARM_ACCOUNTS:
+                break
+            if not validate_account_id(account_id):
+                continue
+            if now - _recent_prewarms.get(account_id, -_PREWARM_INTERVAL_SECONDS) < _PREWARM_INTERVAL_SECONDS:
+                continue
+            _recent_prewarms[account_id] = now
+            selected.append(account_id)
+
+        for account_id in [a for a, at in _recent_prewarms.items() if now - at >= _PREWARM_INTERVAL_SECONDS]:
+            del _recent_prewarms[account_id]
+    return selected
+
+
+def prewarm_account(account_id: str) -> bool:
+    """
+    계정 예열: 자격증명 발급(캐시) → 계정 검증(캐시) → 풀 클라이언트 생성
+    
+    Args:
+        account_id: AWS 계정 ID (12자리)
+    
+    Returns:
+        bool: 예열 성공 여부
+    """
+    started = time.perf_counter()
+    try:
+        credentials = get_crossaccount_session(account_id)
+        if not credentials:
+            log_debug(f"예열 중단: 계정 {account_id} 자격증명 발급 실패")
+            return False
+
+        actual_account, error = verify_account_identity(account_id, credentials)
+        if error or actual_account != account_id:
+            log_debug(f"예열 중단: 계정 {account_id} 검증 실패 ({error or actual_account})")
+            return False
+
+        for service, region in _PREWARM_CLIENTS:
+            get_client(service, region, credentials)
+
+        log_debug(f"계정 예열 완료: {account_id} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        return True
+    except Exception as e:
+        log_error(f"계정 예열 실패: {account_id} - {e}")
+        return False
@@ -0,0 +1,1405 @@
+"""
+보안 보고서 섹션 수집기
+섹션별 수집 함수를 등록하고 제한된 스레드 풀에서 병렬 실행 (의존 섹션은 입력 섹션 완료 후 실행)
+collect_raw_security_data의 출력 JSON 구조는 그대로 유지
+"""
+import os
+import io
+import csv
+import copy
+import json
+import hashlib
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from aws_tools.client_pool import get_client
+
+# 섹션 수집 동시 실행 수 (계정 API 스로틀링 고려)
+COLLECTOR_MAX_WORKERS = int(os.environ.get('REPORT_COLLECTOR_WORKERS', '6'))
+
+# S3 버킷 상세 조회 동시 실행 수 (버킷당 4회 호출)
+S3_BUCKET_WORKERS = int(os.environ.get('REPORT_S3_BUCKET_WORKERS', '16'))
+
+# Trusted Advisor 요약 조회 배치 크기, 상세 결과 동시 조회 수, 체크 목록 캐시 유지 시간 (초, 모든 계정 공통)
+TA_SUMMARY_BATCH_SIZE = 50
+TA_RESULT_WORKERS = int(os.environ.get('REPORT_TA_RESULT_WORKERS', '8'))
+TA_CATALOGUE_TTL_SECONDS = int(os.environ.get('REPORT_TA_CATALOGUE_TTL', '86400'))
+
+# CloudTrail LookupEvents 제한 (계정/리전당 초당 2회), 이벤트 이름별 동시 조회 수, 이벤트별 보관 표본 수
+# 구간 분할 일수 (0 = 분할 없음, 예: 7이면 기간을 7일 구간으로 나눠 병렬 조회)
+CLOUDTRAIL_LOOKUP_TPS = float(os.environ.get('REPORT_CLOUDTRAIL_TPS', '2'))
+CLOUDTRAIL_LOOKUP_WORKERS = int(os.environ.get('REPORT_CLOUDTRAIL_WORKERS', '4'))
+CLOUDTRAIL_EVENT_SAMPLE_SIZE = int(os.environ.get('REPORT_CLOUDTRAIL_SAMPLE', '50'))
+CLOUDTRAIL_SLICE_DAYS = int(os.environ.get('REPORT_CLOUDTRAIL_SLICE_DAYS', '0'))
+
+# 증분 수집: 이전 스냅샷 사용 여부, 지문 일치 섹션 재사용 최대 경과 시간 (시간),
+# CloudTrail 확정 구간 기준 (현재 시각보다 이 시간(분) 이전까지만 확정, 이벤트 전달 지연 고려)
+# 지문은 저비용 호출 1회로 여러 호출을 대신하는 섹션(TA)만 사용, S3는 버킷 리전만 재사용
+# 목록 조회 1회로 끝나는 인벤토리 섹션(EC2, Lambda, RDS, IAM, 보안 그룹, CloudWatch)은 개수/최신 수정 시각 지문도
+# 같은 목록 조회가 필요해(describe/list API는 서버 측 필드 선택 없음) 재수집 시간이 줄지 않으므로 매번 수집
+INCREMENTAL_COLLECTION = os.environ.get('REPORT_INCREMENTAL', '1') == '1'
+SNAPSHOT_MAX_AGE_HOURS = int(os.environ.get('REPORT_SNAPSHOT_MAX_AGE_HOURS', '24'))
+CLOUDTRAIL_SETTLE_MINUTES = int(os.environ.get('REPORT_CLOUDTRAIL_SETTLE_MINUTES', '60'))
+
+# 멀티 리전 수집: 동시 수집 리전 수 × 리전당 동시 섹션 수 = 전체 동시 실행 상한
+# REPORT_REGIONS: 비어 있으면 단일 리전, 'all'이면 활성화된 전체 리전, 또는 쉼표로 구분한 리전 목록
+REGION_MAX_WORKERS = int(os.environ.get('REPORT_REGION_WORKERS', '4'))
+REGION_SECTION_WORKERS = int(os.environ.get('REPORT_REGION_SECTION_WORKERS', '3'))
+REPORT_REGIONS = os.environ.get('REPORT_REGIONS', '')
+
+# 자격 증명 보고서 생성 대기 최대 시간 (초, 초과 시 사용자별 조회로 대체)
+CREDENTIAL_REPORT_WAIT_SECONDS = int(os.environ.get('REPORT_CREDENTIAL_REPORT_WAIT', '20'))
+
+# 리소스별 보관 필드 (보고서 HTML, 권장사항, Q CLI 분석에 쓰는 필드만 페이지 단위로 남김)
+# Lambda Environment 등 대용량/민감 필드는 보관하지 않음
+EC2_INSTANCE_FIELDS = (
+    'InstanceId', 'InstanceType', 'State', 'Tags', 'ImageId', 'LaunchTime', 'Placement', 'Platform',
+    'PlatformDetails', 'VpcId', 'SubnetId', 'PrivateIpAddress', 'PublicIpAddress', 'SecurityGroups',
+    'IamInstanceProfile', 'KeyName', 'Monitoring', 'MetadataOptions', 'BlockDeviceMappings',
+)
+LAMBDA_FUNCTION_FIELDS = (
+    'FunctionName', 'FunctionArn', 'Runtime', 'Handler', 'Role', 'MemorySize', 'Timeout', 'CodeSize',
+    'LastModified', 'PackageType', 'Architectures', 'VpcConfig', 'KMSKeyArn', 'TracingConfig',
+)
+RDS_INSTANCE_FIELDS = (
+    'DBInstanceIdentifier', 'DBInstanceClass', 'Engine', 'EngineVersion', 'DBInstanceStatus',
+    'InstanceCreateTime', 'AvailabilityZone', 'MultiAZ', 'AllocatedStorage', 'StorageType',
+    'StorageEncrypted', 'KmsKeyId', 'PubliclyAccessible', 'BackupRetentionPeriod', 'DeletionProtection',
+    'AutoMinorVersionUpgrade', 'IAMDatabaseAuthenticationEnabled', 'Endpoint',
+)
+CLOUDWATCH_ALARM_FIELDS = (
+    'AlarmName', 'AlarmDescription', 'StateValue', 'StateReason', 'StateUpdatedTimestamp', 'ActionsEnabled',
+    'AlarmActions', 'Namespace', 'MetricName', 'Dimensions', 'Statistic', 'Period', 'EvaluationPeriods',
+    'ComparisonOperator', 'Threshold',
+)
+
+
+class SectionCollector:
+    """등록된 섹션 수집기 (이름, 수집 함수, 결과 위치, 실패 시 기본값, 입력 섹션, 리전 병합 함수, 변경 감지 지문)"""
+
+    def __init__(self, name, func, target, default, depends_on=(), checkpoint=True, merge=None, fingerprint=None):
+        self.name = name
+        self.func = func
+        self.target = target
+        self.default = default
+        self.depends_on = tuple(depends_on)
+        self.checkpoint = checkpoint
+        self.merge = merge
+        self.fingerprint = fingerprint
+
+    @property
+    def regional(self):
+        """리전별로 수집하는 섹션 여부 (병합 함수가 있는 섹션)"""
+        return self.merge is not None
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (초당 rate개 보충, 최대 capacity개 누적)"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+class CollectorContext:
+    """섹션 수집 공통 정보 (계정, 기간, 리전, 풀 클라이언트용 자격증명)"""
+
+    def __init__(self, account_id, start_date_str, end_date_str, region, credentials):
+        self.account_id = account_id
+        self.start_date_str = start_date_str
+        self.end_date_str = end_date_str
+        self.region = region
+        self.credentials = credentials
+        self.previous = None  # 이전 스냅샷 섹션 (None이면 증분 수집 안 함)
+        self.snapshot_state = {}  # 다음 실행에 넘길 섹션별 증분 상태 (지문, CloudTrail 확정 구간)
+        self.reused = []  # 지문이 같아 스냅샷 값을 재사용한 섹션
+        self.ta_summaries = None  # 지문 계산에서 조회한 Trusted Advisor 체크 요약 (수집 시 재조회하지 않음)
+
+    def client(self, service, region=None):
+        """풀에서 boto3 클라이언트 가져오기 (region 생략 시 보고서 리전)"""
+        return get_client(service, region or self.region, self.credentials)
+
+
+# 등록 순서 = 출력 JSON의 키 순서
+SECTION_COLLECTORS = {}
+
+# (계정, 리전)별 LookupEvents 토큰 버킷 (할당량이 계정·리전 단위이므로 자격증명 갱신, 클라이언트 재생성, 기간별 동시 수집에서도 같은 버킷 공유)
+_lookup_limiters = {}
+_lookup_limiters_lock = threading.Lock()
+
+# Trusted Advisor 체크 목록 캐시 (계정과 무관하게 동일)
+_ta_catalogue = {'checks': None, 'loaded_at': 0.0}
+_ta_catalogue_lock = threading.Lock()
+
+
+def iter_paginated(client, operation_name, result_key, **kwargs):
+    """
+    describe/list 호출을 페이지네이터로 끝까지 순회하며 항목을 하나씩 반환 (한 번에 한 페이지만 메모리에 유지)
+    
+    Args:
+        client: boto3 클라이언트
+        operation_name (str): 작업 이름 (예: 'describe_instances')
+        result_key (str): 페이지 응답의 목록 키 (예: 'Reservations')
+        **kwargs: 작업 파라미터
+    
+    Yields:
+        dict: 목록 항목
+    """
+    if client.can_paginate(operation_name):
+        pages = client.get_paginator(operation_name).paginate(**kwargs)
+    else:
+        pages = [getattr(client, operation_name)(**kwargs)]
+
+    for page in pages:
+        for item in page.get(result_key, []):
+            yield item
+
+
+def _pick_fields(item, fields):
+    """항목에서 보관 필드만 복사 (없는 필드는 생략)"""
+    return {field: item[field] for field in fields if field in item}
+
+
+def register_section(name, target, default, depends_on=(), checkpoint=True, merge=None, fingerprint=None):
+    """
+    섹션 수집 함수 등록 데코레이터
+    
+    Args:
+        name (str): 섹션 이름 (체크포인트 키)
+        target (tuple): report_data 내 결과 위치 (예: ('resources', 'ec2'))
+        default (dict): 수집 실패 시 섹션 값
+        depends_on (tuple): 먼저 완료되어야 하는 섹션 이름
+        checkpoint (bool): 완료 시 체크포인트 콜백 호출 및 재개 시 복원 여부
+        merge (callable): 리전별 섹션 값 병합 함수 ({리전: 값} → 값), 있으면 멀티 리전 수집 시 리전마다 수집
+        fingerprint (callable): 변경 감지용 저비용 지문 함수 (ctx → 값), 이전 스냅샷과 같으면 수집 대신 재사용
+    """
+    def decorator(func):
+        SECTION_COLLECTORS[name] = SectionCollector(name, func, target, default, depends_on, checkpoint, merge, fingerprint)
+        return func
+    return decorator
+
+
+def run_section_collectors(ctx, resume_sections=None, on_section_complete=None, max_workers=COLLECTOR_MAX_WORKERS,
+                           sections=None):
+    """
+    등록된 섹션 수집기를 병렬 실행 (입력 섹션이 모두 끝난 섹션부터 시작)
+    
+    Args:
+        ctx (CollectorContext): 수집 컨텍스트
+        resume_sections (dict): 체크포인트에서 복원할 섹션 데이터 (해당 섹션은 재수집하지 않음)
+        on_section_complete (callable): 섹션 완료 콜백 (section, value), 호출은 한 번에 하나씩 직렬화
+            수집 실패로 기본값을 쓴 섹션과 그 값을 입력으로 쓴 섹션은 호출하지 않음 (재개 시 다시 수집)
+        max_workers (int): 동시 실행 수
+        sections (iterable): 실행할 섹션 이름 (None이면 전체), 그 외 섹션의 resume_sections 값은 입력으로만 사용
+    
+    Returns:
+        tuple: (섹션 이름 → 값, 섹션 이름 → 소요 시간(ms))
+    """
+    resume_sections = resume_sections or {}
+    selected = SECTION_COLLECTORS if sections is None else {
+        name: collector for name, collector in SECTION_COLLECTORS.items() if name in sections
+    }
+    results = {name: value for name, value in resume_sections.items() if name not in selected}
+    timings = {}
+    failed = set()
+    callback_lock = threading.Lock()
+    started_at = time.perf_counter()
+
+    def run(collector, inputs):
+        section_started = time.perf_counter()
+        try:
+            value = _collect_or_reuse(collector, ctx, inputs)
+        except Exception as e:
+            print(f"[ERROR] ❌ {collector.name} 수집 실패: {e}", flush=True)
+            value = copy.deepcopy(collector.default)
+            failed.add(collector.name)
+        timings[collector.name] = round((time.perf_counter() - section_started) * 1000, 1)
+        return value
+
+    def complete(collector, value):
+        results[collector.name] = value
+        if any(dependency in failed for dependency in collector.depends_on):
+            failed.add(collector.name)
+        if collector.name in failed:
+            # 실패 기본값(또는 그 값으로 계산한 섹션)은 체크포인트에 기록하지 않음 (재개 시 다시 수집)
+            print(f"[DEBUG] {collector.name} 수집 실패 영향, 체크포인트 기록 생략", flush=True)
+            return
+        if collector.checkpoint and on_section_complete:
+            with callback_lock:
+                try:
+                    on_section_complete(collector.name, value)
+                except Exception as e:
+                    print(f"[DEBUG] 섹션 완료 콜백 실패 (무시): {collector.name} - {e}", flush=True)
+
+    pending = dict(selected)
+    for name, collector in list(pending.items()):
+        if collector.checkpoint and name in resume_sections:
+            print(f"[DEBUG] ♻️ {name} 체크포인트 복원", flush=True)
+            timings[name] = 0.0
+            complete(collector, resume_sections[name])
+            del pending[name]
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report-section') as executor:
+        running = {}
+        while pending or running:
+            for name, collector in list(pending.items()):
+                if all(dependency in results for dependency in collector.depends_on):
+                    inputs = {dependency: results[dependency] for dependency in collector.depends_on}
+                    running[executor.submit(run, collector, inputs)] = collector
+                    del pending[name]
+
+            if not running:
+                raise RuntimeError(f"섹션 의존성을 만족할 수 없음: {list(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                complete(running.pop(future), future.result())
+
+    total_ms = round((time.perf_counter() - started_at) * 1000, 1)
+    timing_text = ", ".join(f"{name} {ms:.0f}ms" for name, ms in timings.items())
+    print(f"[DEBUG] ⏱️ 섹션 수집 시간: 전체 {total_ms:.0f}ms ({timing_text})", flush=True)
+    timings["total"] = total_ms
+    return {name: results[name] for name in selected}, timings
+
+
+def _fingerprint_digest(value):
+    """지문 값 → SHA-256 문자열 (스냅샷 JSON 왕복 후에도 비교 가능)"""
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _snapshot_age_hours(entry):
+    """스냅샷 항목의 수집 후 경과 시간 (시간, 알 수 없으면 무한대)"""
+    try:
+        return (datetime.now() - datetime.fromisoformat(entry['collected_at'])).total_seconds() / 3600
+    except Exception:
+        return float('inf')
+
+
+def _collect_or_reuse(collector, ctx, inputs):
+    """
+    섹션 수집 (지문 함수가 있고 이전 스냅샷의 지문과 같으면 스냅샷 값 재사용)
+    
+    Args:
+        collector (SectionCollector): 섹션 수집기
+        ctx (CollectorContext): 수집 컨텍스트 (previous가 None이면 항상 수집)
+        inputs (dict): 입력 섹션 값
+    
+    Returns:
+        섹션 값
+    """
+    if collector.fingerprint is None or ctx.previous is None:
+        return collector.func(ctx, inputs)
+
+    try:
+        fingerprint = _fingerprint_digest(collector.fingerprint(ctx))
+    except Exception as e:
+        print(f"[DEBUG] {collector.name} 지문 계산 실패 (전체 수집): {e}", flush=True)
+        return collector.func(ctx, inputs)
+
+    previous = ctx.previous.get(collector.name)
+    if (previous and 'value' in previous
+            and (previous.get('state') or {}).get('fingerprint') == fingerprint
+            and _snapshot_age_hours(previous) <= SNAPSHOT_MAX_AGE_HOURS):
+        print(f"[DEBUG] ♻️ {collector.name} 변경 없음, 스냅샷 재사용 ({previous['collected_at']} 수집)", flush=True)
+        ctx.reused.append(collector.name)
+        ctx.snapshot_state[collector.name] = {'fingerprint': fingerprint, 'collected_at': previous['collected_at']}
+        return copy.deepcopy(previous['value'])
+
+    value = collector.func(ctx, inputs)
+    ctx.snapshot_state[collector.name] = {'fingerprint': fingerprint}
+    return value
+
+
+def build_snapshot_entries(ctx, sections):
+    """
+    이번 수집의 스냅샷 항목 생성 (증분 상태가 있는 섹션만, 값은 지문 섹션만 저장)
+    
+    Args:
+        ctx (CollectorContext): 수집 컨텍스트
+        sections (dict): 섹션 결과 (보고서 리전, 병합 전)
+    
+    Returns:
+        dict: 섹션 이름 → 스냅샷 항목
+    """
+    now = datetime.now().isoformat()
+    entries = {}
+    for name, state in ctx.snapshot_state.items():
+        state = dict(state)
+        entry = {
+            "collected_at": state.pop('collected_at', now),  # 재사용한 값은 원래 수집 시각 유지
+            "period_start": ctx.start_date_str,
+            "period_end": ctx.end_date_str,
+            "state": state
+        }
+        if 'fingerprint' in state:
+            entry["value"] = sections[name]
+        entries[name] = entry
+    return entries
+
+
+def resolve_report_regions(ctx, regions=None):
+    """
+    멀티 리전 수집 대상 리전 결정
+    
+    Args:
+        ctx (CollectorContext): 수집 컨텍스트 (describe_regions 호출용)
+        regions: None이면 REPORT_REGIONS 환경 변수, 'all'이면 계정에 활성화된 전체 리전, 또는 리전 목록
+    
+    Returns:
+        list: 보고서 리전을 제외한 추가 수집 리전 목록 (단일 리전 수집이면 빈 목록)
+    """
+    if regions is None:
+        regions = REPORT_REGIONS
+    if isinstance(regions, str):
+        regions = regions.strip()
+        if regions.lower() == 'all':
+            # AllRegions=False → 옵트인되지 않은 리전 제외
+            response = ctx.client('ec2').describe_regions(AllRegions=False)
+            regions = sorted(r['RegionName'] for r in response.get('Regions', []))
+        else:
+            regions = [r.strip() for r in regions.split(',') if r.strip()]
+    return [region for region in dict.fromkeys(regions) if region != ctx.region]
+
+
+def collect_other_regions(ctx, home_sections, regions, max_workers=REGION_MAX_WORKERS):
+    """
+    보고서 리전 결과에 다른 리전의 리전별 섹션을 병합 (전역 섹션 IAM, S3, TA는 보고서 리전에서 1회만 수집)
+    리전별 섹션에 의존하는 전역 섹션(권장사항)은 병합 후 다시 계산
+    
+    Args:
+        ctx (CollectorContext): 보고서 리전 수집 컨텍스트
+        home_sections (dict): 보고서 리전 섹션 결과 (run_section_collectors 결과)
+        regions (list): 추가 수집 리전 목록
+        max_workers (int): 동시 수집 리전 수 (리전당 섹션 동시 실행 수는 REGION_SECTION_WORKERS)
+    
+    Returns:
+        dict: 병합된 섹션 결과
+    """
+    regional = [name for name, collector in SECTION_COLLECTORS.items() if collector.regional]
+    global_inputs = {name: value for name, value in home_sections.items() if name not in regional}
+    print(f"[DEBUG] 🌏 멀티 리전 수집 시작: {len(regions)}개 리전 추가 ({', '.join(regions)})", flush=True)
+
+    def collect_region(region):
+        region_ctx = CollectorContext(ctx.account_id, ctx.start_date_str, ctx.end_date_str, region, ctx.credentials)
+        region_sections, _ = run_section_collectors(
+            region_ctx, global_inputs, max_workers=REGION_SECTION_WORKERS, sections=regional
+        )
+        return region_sections
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report-region') as executor:
+        region_results = dict(zip(regions, executor.map(collect_region, regions)))
+
+    # 리전별 섹션 병합 (보고서 리전 먼저)
+    merged = dict(home_sections)
+    for name in regional:
+        values_by_region = {ctx.region: home_sections[name]}
+        values_by_region.update((region, sections[name]) for region, sections in region_results.items())
+        merged[name] = SECTION_COLLECTORS[name].merge(values_by_region)
+
+    # 병합된 리전별 섹션을 입력으로 쓰는 전역 섹션 다시 계산 (체크포인트 콜백 없음)
+    dependents = [
+        name for name, collector in SECTION_COLLECTORS.items()
+        if not collector.regional and any(dependency in regional for dependency in collector.depends_on)
+    ]
+    if dependents:
+        recomputed, _ = run_section_collectors(
+            ctx, {name: value for name, value in merged.items() if name not in dependents}, sections=dependents
+        )
+        merged.update(recomputed)
+
+    print(f"[DEBUG] 🌏 멀티 리전 수집 완료: {len(regions) + 1}개 리전 ({(time.perf_counter() - started_at):.1f}초)", flush=True)
+    return merged
+
+
+def _tag_region(items, region):
+    """Raw 항목 목록에 Region 필드 추가 (원본은 변경하지 않음)"""
+    return [dict(item, Region=region) for item in items]
+
+
+def _merge_summary_lists(values_by_region, list_key):
+    """{"summary": {개수...}, list_key: [...]} 형태 섹션 병합 (개수 합산, 목록은 Region 태그 후 연결)"""
+    merged = {"summary": {}, list_key: []}
+    for region, value in values_by_region.items():
+        for key, count in value.get('summary', {}).items():
+            merged['summary'][key] = merged['summary'].get(key, 0) + count
+        merged[list_key].extend(_tag_region(value.get(list_key, []), region))
+    return merged
+
+
+def _get_lookup_limiter(account_id, region):
+    """계정·리전의 LookupEvents 토큰 버킷 (계정을 모르는 호출은 리전별 공용 버킷 사용)"""
+    key = (account_id or 'unknown', region)
+    with _lookup_limiters_lock:
+        limiter = _lookup_limiters.get(key)
+        if limiter is None:
+            limiter = _lookup_limiters[key] = TokenBucket(CLOUDTRAIL_LOOKUP_TPS)
+        return limiter
+
+
+def _split_time_windows(start_time, end_time, slice_days):
+    """조회 기간을 slice_days일 구간으로 분할 (0 또는 None이면 전체 기간 1개)"""
+    if not slice_days:
+        return [(start_time, end_time)]
+
+    windows = []
+    window_start = start_time
+    while window_start < end_time:
+        window_end = min(window_start + timedelta(days=slice_days), end_time)
+        windows.append((window_start, window_end))
+        window_start = window_end
+    return windows
+
+
+def _lookup_event_counts(cloudtrail, limiter, event_name, start_time, end_time, sample_size):
+    """
+    이벤트 이름 1개의 LookupEvents를 끝까지 페이지 조회 (페이지마다 토큰 1개 사용)
+    
+    Args:
+        cloudtrail: CloudTrail 클라이언트
+        limiter (TokenBucket): 초당 호출 수 제한
+        event_name (str): 조회할 이벤트 이름
+        start_time (datetime): 시작 시각 (UTC)
+        end_time (datetime): 종료 시각 (UTC)
+        sample_size (int): 보관할 최신 이벤트 수
+    
+    Returns:
+        tuple: (전체 건수, 최신순 이벤트 표본, 오류 메시지 또는 None)
+    """
+    count = 0
+    sample = []
+    kwargs = {
+        'StartTime': start_time,
+        'EndTime': end_time,
+        'LookupAttributes': [{'AttributeKey': 'EventName', 'AttributeValue': event_name}],
+        'MaxResults': 50
+    }
+    try:
+        while True:
+            limiter.acquire()
+            events_response = cloudtrail.lookup_events(**kwargs)
+            events = events_response.get('Events', [])
+            count += len(events)
+            if len(sample) < sample_size:
+                sample.extend(events[:sample_size - len(sample)])
+
+            next_token = events_response.get('NextToken')
+            if not next_token:
+                return count, sample, None
+            kwargs['NextToken'] = next_token
+    except Exception as e:
+        print(f"[DEBUG] ⚠️ {event_name} 조회 실패 ({count}개 조회 후): {e}", flush=True)
+        return count, sample, str(e)
+
+
+# 보안 관점에서 중요한 CloudTrail 이벤트 목록 (우선순위 순)
+CLOUDTRAIL_CRITICAL_EVENTS = {
+    # 🔴 Critical - 데이터 손실 및 서비스 중단
+    'DeleteBucket': {'severity': 'critical', 'category': 'data_loss', 'description': 'S3 버킷 삭제'},
+    'DeleteDBInstance': {'severity': 'critical', 'category': 'data_loss', 'description': 'RDS 인스턴스 삭제'},
+    'TerminateInstances': {'severity': 'critical', 'category': 'service_disruption', 'description': 'EC2 인스턴스 종료'},
+    'DeleteUser': {'severity': 'critical', 'category': 'account_security', 'description': 'IAM 사용자 삭제'},
+    'DeleteAccessKey': {'severity': 'critical', 'category': 'account_security', 'description': 'IAM 액세스 키 삭제'},
+
+    # 🟡 High - 보안 설정 변경
+    'PutBucketPolicy': {'severity': 'high', 'category': 'permission_change', 'description': 'S3 버킷 정책 변경'},
+    'AuthorizeSecurityGroupIngress': {'severity': 'high', 'category': 'network_security', 'description': '보안 그룹 인바운드 규칙 추가'},
+    'CreateAccessKey': {'severity': 'high', 'category': 'account_security', 'description': '새 액세스 키 생성'},
+    'PutUserPolicy': {'severity': 'high', 'category': 'permission_change', 'description': 'IAM 사용자 정책 변경'},
+    'AttachUserPolicy': {'severity': 'high', 'category': 'permission_change', 'description': 'IAM 사용자 정책 연결'},
+}
+
+
+def _event_time_key(event):
+    """이벤트 정렬 키 (datetime과 스냅샷에서 읽은 ISO 문자열 모두 처리)"""
+    event_time = event.get('EventTime')
+    return event_time.isoformat() if hasattr(event_time, 'isoformat') else str(event_time or '')
+
+
+def _lookup_critical_events(cloudtrail, start_time_utc, end_time_utc, slice_days, account_id=None):
+    """
+    구간 내 중요 이벤트 조회 (이벤트 이름 × 시간 구간별 작업을 계정·리전 토큰 버킷 제한으로 병렬 실행)
+    
+    Returns:
+        dict: 이벤트 이름 → {severity, category, description, count, events(표본), error(실패 시)}
+    """
+    windows = _split_time_windows(start_time_utc, end_time_utc, slice_days)
+    limiter = _get_lookup_limiter(account_id, cloudtrail.meta.region_name)
+    tasks = [(event_name, window_start, window_end) for event_name in CLOUDTRAIL_CRITICAL_EVENTS for window_start, window_end in windows]
+    print(f"[DEBUG] CloudTrail 조회 작업: {len(tasks)}개 ({len(CLOUDTRAIL_CRITICAL_EVENTS)}개 이벤트 × {len(windows)}개 구간, {start_time_utc} ~ {end_time_utc})", flush=True)
+
+    with ThreadPoolExecutor(max_workers=CLOUDTRAIL_LOOKUP_WORKERS, thread_name_prefix='cloudtrail-lookup') as executor:
+        task_results = list(executor.map(
+            lambda task: _lookup_event_counts(cloudtrail, limiter, *task, sample_size=CLOUDTRAIL_EVENT_SAMPLE_SIZE),
+            tasks
+        ))
+
+    critical_events_data = {
+        event_name: dict(event_info, count=0, events=[])
+        for event_name, event_info in CLOUDTRAIL_CRITICAL_EVENTS.items()
+    }
+    for (event_name, _, _), (count, sample, error) in zip(tasks, task_results):
+        event_data = critical_events_data[event_name]
+        event_data['count'] += count
+        event_data['events'].extend(sample)
+        if error:
+            event_data['error'] = error
+    return critical_events_data
+
+
+def _combine_critical_events(parts):
+    """
+    구간별 이벤트 집계 합치기 (건수 합산, 표본은 최신순 CLOUDTRAIL_EVENT_SAMPLE_SIZE개)
+    
+    Args:
+        parts (list): _lookup_critical_events 결과 목록 (None은 건너뜀)
+    
+    Returns:
+        dict: 합쳐진 이벤트 집계 (sampled 포함)
+    """
+    combined = {
+        event_name: dict(event_info, count=0, events=[])
+        for event_name, event_info in CLOUDTRAIL_CRITICAL_EVENTS.items()
+    }
+    for part in parts:
+        for event_name, event_data in (part or {}).items():
+            if event_name not in combined:
+                continue
+            combined[event_name]['count'] += event_data.get('count', 0)
+            combined[event_name]['events'].extend(event_data.get('events', []))
+            if event_data.get('error'):
+                combined[event_name]['error'] = event_data['error']
+
+    for event_data in combined.values():
+        event_data['events'] = sorted(event_data['events'], key=_event_time_key, reverse=True)[:CLOUDTRAIL_EVENT_SAMPLE_SIZE]
+        event_data['sampled'] = event_data['count'] > len(event_data['events'])
+    return combined
+
+
+def collect_cloudtrail_events(cloudtrail, start_date_str, end_date_str, slice_days=CLOUDTRAIL_SLICE_DAYS, account_id=None):
+    """
+    CloudTrail 중요 이벤트 수집 (정확한 기간, UTC+9)
+    월별 일괄 보고서에서 월마다 개별 호출할 수 있도록 분리
+    이벤트별로 NextToken을 끝까지 따라가 전체 건수를 세고, Raw 이벤트는 최신 표본만 보관
+    
+    Args:
+        cloudtrail: CloudTrail boto3 클라이언트
+        start_date_str (str): 시작 날짜 (YYYY-MM-DD) - UTC+9 기준
+        end_date_str (str): 종료 날짜 (YYYY-MM-DD) - UTC+9 기준
+        slice_days (int): 구간 분할 일수 (0이면 분할 없음)
+        account_id (str): 대상 계정 ID (LookupEvents 토큰 버킷 키)
+    
+    Returns:
+        dict: cloudtrail_events 섹션 데이터
+    """
+    return collect_cloudtrail_events_incremental(
+        cloudtrail, start_date_str, end_date_str, None, slice_days, track_settled=False, account_id=account_id
+    )[0]
+
+
+def collect_cloudtrail_events_incremental(cloudtrail, start_date_str, end_date_str, previous_settled=None,
+                                          slice_days=CLOUDTRAIL_SLICE_DAYS, track_settled=True, account_id=None):
+    """
+    CloudTrail 중요 이벤트 수집 (이전 실행의 확정 구간 집계를 재사용하고 이후 구간만 조회)
+    현재 시각 - CLOUDTRAIL_SETTLE_MINUTES 이전 구간은 확정 구간으로 보고 다음 실행에 넘김
+    
+    Args:
+        cloudtrail: CloudTrail boto3 클라이언트
+        start_date_str (str): 시작 날짜 (YYYY-MM-DD) - UTC+9 기준
+        end_date_str (str): 종료 날짜 (YYYY-MM-DD) - UTC+9 기준
+        previous_settled (dict): 같은 기간 이전 실행의 확정 구간 ({'until': ISO 시각, 'critical_events': 집계})
+        slice_days (int): 구간 분할 일수 (0이면 분할 없음)
+        track_settled (bool): 확정 구간을 따로 조회해 반환할지 여부 (False면 기간 전체를 한 번에 조회)
+        account_id (str): 대상 계정 ID (LookupEvents 토큰 버킷 키)
+    
+    Returns:
+        tuple: (cloudtrail_events 섹션 데이터, 이번 실행의 확정 구간 또는 None)
+    """
+    print(f"[DEBUG] 📦 CloudTrail 이벤트 수집 중 ({start_date_str} ~ {end_date_str})...", flush=True)
+    try:
+        from datetime import datetime as dt, timezone
+    
+        # UTC+9 (한국 시간) 적용
+        kst = timezone(timedelta(hours=9))
+    
+        # 시작일 00:00:00 KST → UTC 변환
+        start_time_kst = dt.strptime(start_date_str, "%Y-%m-%d").replace(hour=0, minute=0, second=0, tzinfo=kst)
+        start_time_utc = start_time_kst.astimezone(timezone.utc)
+    
+        # 종료일 23:59:59 KST → UTC 변환
+        end_time_kst = dt.strptime(end_date_str, "%Y-%m-%d").replace(hour=23, minute=59, second=59, tzinfo=kst)
+        end_time_utc = end_time_kst.astimezone(timezone.utc)
+    
+        print(f"[DEBUG] CloudTrail 조회 기간 (UTC): {start_time_utc} ~ {end_time_utc}", flush=True)
+    
+        # 확정 시점 (이벤트 전달 지연을 고려해 현재 시각보다 앞선 시점까지만 확정)
+        settle_point = dt.now(timezone.utc) - timedelta(minutes=CLOUDTRAIL_SETTLE_MINUTES)
+        settle_point = max(start_time_utc, min(end_time_utc, settle_point)) if track_settled else end_time_utc
+    
+        # 이전 실행의 확정 구간 재사용 (같은 기간이고 확정 시점이 기간 안일 때만)
+        reused = None
+        settled_from = start_time_utc
+        if previous_settled:
+            try:
+                previous_until = dt.fromisoformat(previous_settled['until'])
+                if start_time_utc <= previous_until <= settle_point:
+                    reused = previous_settled['critical_events']
+                    settled_from = previous_until
+                    print(f"[DEBUG] ♻️ CloudTrail 확정 구간 재사용: ~ {previous_until} (이후 구간만 조회)", flush=True)
+            except Exception as e:
+                print(f"[DEBUG] CloudTrail 이전 확정 구간 무시: {e}", flush=True)
+    
+        settled_part = _lookup_critical_events(cloudtrail, settled_from, settle_point, slice_days, account_id) if settled_from < settle_point else None
+        settled_events = _combine_critical_events([reused, settled_part])
+        open_part = _lookup_critical_events(cloudtrail, settle_point, end_time_utc, slice_days, account_id) if settle_point < end_time_utc else None
+        critical_events_data = _combine_critical_events([settled_events, open_part]) if open_part else settled_events
+    
+        # 조회 실패가 있는 확정 구간은 다음 실행에 넘기지 않음
+        settled = None
+        if track_settled and not any(event_data.get('error') for event_data in settled_events.values()):
+            settled = {'until': settle_point.isoformat(), 'critical_events': settled_events}
+    
+        total_collected = 0
+        for event_name, event_data in critical_events_data.items():
+            total_collected += event_data['count']
+            if event_data['count']:
+                print(f"[DEBUG] ✅ {event_name}: {event_data['count']}개 발견", flush=True)
+    
+        period_days = (end_time_kst - start_time_kst).days + 1
+    
+        print(f"[DEBUG] ✅ CloudTrail 중요 이벤트 수집 완료: {total_collected}개 ({period_days}일간)", flush=True)
+        return {
+            "summary": {
+                "period_days": period_days,
+                "total_critical_events": total_collected,
+                "monitored_event_types": len(CLOUDTRAIL_CRITICAL_EVENTS),
+                "sample_size": CLOUDTRAIL_EVENT_SAMPLE_SIZE
+            },
+            "critical_events": critical_events_data  # 이벤트 타입별로 구조화된 데이터
+        }, settled
+    except Exception as e:
+        print(f"[ERROR] ❌ CloudTrail 수집 실패: {e}", flush=True)
+        import traceback
+        traceback.print_exc()
+        return {"summary": {"period_days": 30, "total_critical_events": 0, "monitored_event_types": 0}, "critical_events": {}}, None
+
+
+@register_section('ec2', ('resources', 'ec2'), {"summary": {"total": 0, "running": 0, "stopped": 0}, "instances": []},
+                  merge=lambda values: _merge_summary_lists(values, 'instances'))
+def collect_ec2(ctx, inputs):
+    """EC2 인스턴스 수집 (Raw 데이터 저장)"""
+    print(f"[DEBUG] 📦 EC2 인스턴스 수집 중...", flush=True)
+
+    # 페이지 단위로 인스턴스 추출 (보관 필드만) + 요약 정보 누적
+    instances_raw = []
+    running = stopped = 0
+    for reservation in iter_paginated(ctx.client('ec2'), 'describe_instances', 'Reservations'):
+        for instance in reservation['Instances']:
+            instances_raw.append(_pick_fields(instance, EC2_INSTANCE_FIELDS))
+            state = instance['State']['Name']
+            if state == 'running':
+                running += 1
+            elif state == 'stopped':
+                stopped += 1
+
+    total = len(instances_raw)
+
+    print(f"[DEBUG] ✅ EC2 수집 완료: {total}개 (running: {running}, stopped: {stopped})", flush=True)
+    return {
+        "summary": {
+            "total": total,
+            "running": running,
+            "stopped": stopped
+        },
+        "instances": instances_raw  # Raw 데이터 (datetime 변환은 나중에 일괄 처리)
+    }
+
+
+def _bucket_client_region(location):
+    """버킷 LocationConstraint 값 → 클라이언트 리전 (구형 'EU' 값 보정)"""
+    return 'eu-west-1' if location == 'EU' else location
+
+
+def inspect_bucket(ctx, s3, bucket, location=None):
+    """
+    버킷 1개 상세 정보 수집 (리전 확인 후 해당 리전 클라이언트로 암호화/버저닝/퍼블릭 액세스 블록 조회)
+    
+    Args:
+        ctx (CollectorContext): 수집 컨텍스트
+        s3: 리전 조회용 S3 클라이언트 (get_bucket_location은 어느 리전에서도 가능)
+        bucket (dict): list_buckets 응답의 버킷 항목
+        location (str): 이전 수집에서 확인한 버킷 리전 (있으면 get_bucket_location 생략)
+    
+    Returns:
+        dict: 버킷 Raw 데이터 (Location, Encryption, Versioning, PublicAccessBlock 추가)
+    """
+    bucket_name = bucket['Name']
+    bucket_data = bucket.copy()  # 기본 정보 복사
+
+    try:
+        # 버킷 리전 확인
+        if location is None:
+            location = s3.get_bucket_location(Bucket=bucket_name).get('LocationConstraint') or 'us-east-1'
+        bucket_data['Location'] = location
+
+        # 버킷 리전의 클라이언트 사용 (다른 리전 엔드포인트로의 리다이렉트 방지)
+        regional_s3 = ctx.client('s3', _bucket_client_region(bucket_data['Location']))
+
+        # 암호화 확인
+        try:
+            encryption_response = regional_s3.get_bucket_encryption(Bucket=bucket_name)
+            bucket_data['Encryption'] = encryption_response.get('ServerSideEncryptionConfiguration')
+        except:
+            bucket_data['Encryption'] = None
+
+        # 버저닝 확인
+        try:
+            versioning_response = regional_s3.get_bucket_versioning(Bucket=bucket_name)
+            bucket_data['Versioning'] = versioning_response
+        except:
+            bucket_data['Versioning'] = None
+
+        # 퍼블릭 액세스 블록 확인
+        try:
+            public_access_response = regional_s3.get_public_access_block(Bucket=bucket_name)
+            bucket_data['PublicAccessBlock'] = public_access_response.get('PublicAccessBlockConfiguration')
+        except:
+            bucket_data['PublicAccessBlock'] = None  # 블록 설정 없음 = 퍼블릭 가능
+    except Exception as e:
+        print(f"[DEBUG] 버킷 {bucket_name} 상세 정보 수집 실패: {e}", flush=True)
+
+    return bucket_data  # 상세 정보 실패 시 기본 정보라도 저장
+
+
+def _bucket_location_key(bucket):
+    """버킷 리전 재사용 키 (같은 이름으로 다시 만든 버킷은 생성 시각이 달라 재조회)"""
+    return f"{bucket['Name']}@{bucket.get('CreationDate')}"
+
+
+@register_section('s3', ('resources', 's3'), {"summary": {"total": 0, "encrypted": 0, "public": 0}, "buckets": []})
+def collect_s3(ctx, inputs):
+    """
+    S3 버킷 수집 (Raw 데이터 + 추가 정보, 버킷별 조회는 제한된 스레드 풀에서 병렬 실행)
+    보안 설정(암호화, 버저닝, 퍼블릭 액세스 블록)은 매번 조회하고, 바뀌지 않는 버킷 리전만 이전 스냅샷에서 재사용
+    """
+    print(f"[DEBUG] 📦 S3 버킷 수집 중...", flush=True)
+    s3 = ctx.client('s3')
+    buckets = iter_paginated(s3, 'list_buckets', 'Buckets')
+    previous = ((ctx.previous or {}).get('s3') or {}).get('state') or {}
+    known_locations = previous.get('locations') or {}
+
+    # 버킷 순서 유지 (map), 스로틀링(SlowDown 등)은 풀 클라이언트의 표준 재시도가 백오프 처리
+    buckets_raw = []
+    encrypted_count = public_count = 0
+    with ThreadPoolExecutor(max_workers=S3_BUCKET_WORKERS, thread_name_prefix='s3-bucket') as executor:
+        inspect = lambda bucket: inspect_bucket(ctx, s3, bucket, known_locations.get(_bucket_location_key(bucket)))
+        for bucket_data in executor.map(inspect, buckets):
+            buckets_raw.append(bucket_data)
+            if bucket_data.get('Encryption') is not None:
+                encrypted_count += 1
+            if bucket_data.get('PublicAccessBlock') is None:
+                public_count += 1
+
+    if ctx.previous is not None:
+        ctx.snapshot_state['s3'] = {'locations': {
+            _bucket_location_key(bucket): bucket['Location'] for bucket in buckets_raw if 'Location' in bucket
+        }}
+
+    print(f"[DEBUG] ✅ S3 수집 완료: {len(buckets_raw)}개 (암호화: {encrypted_count}, 퍼블릭: {public_count})", flush=True)
+    return {
+        "summary": {
+            "total": len(buckets_raw),
+            "encrypted": encrypted_count,
+            "public": public_count
+        },
+        "buckets": buckets_raw  # Raw 데이터 (모든 버킷, 모든 필드)
+    }
+
+
+@register_section('lambda', ('resources', 'lambda'), {"summary": {"total": 0}, "functions": []},
+                  merge=lambda values: _merge_summary_lists(values, 'functions'))
+def collect_lambda(ctx, inputs):
+    """Lambda 함수 수집 (Raw 데이터 저장)"""
+    print(f"[DEBUG] 📦 Lambda 함수 수집 중...", flush=True)
+    functions_raw = [
+        _pick_fields(function, LAMBDA_FUNCTION_FIELDS)
+        for function in iter_paginated(ctx.client('lambda'), 'list_functions', 'Functions')
+    ]
+
+    print(f"[DEBUG] ✅ Lambda 수집 완료: {len(functions_raw)}개", flush=True)
+    return {
+        "summary": {
+            "total": len(functions_raw)
+        },
+        "functions": functions_raw  # Raw 데이터 (LAMBDA_FUNCTION_FIELDS)
+    }
+
+
+@register_section('rds', ('resources', 'rds'), {"summary": {"total": 0}, "instances": []},
+                  merge=lambda values: _merge_summary_lists(values, 'instances'))
+def collect_rds(ctx, inputs):
+    """RDS 인스턴스 수집 (Raw 데이터 저장 - Multi-AZ, 엔진, 백업 등 모든 정보 포함)"""
+    print(f"[DEBUG] 📦 RDS 인스턴스 수집 중...", flush=True)
+    db_instances_raw = [
+        _pick_fields(db_instance, RDS_INSTANCE_FIELDS)
+        for db_instance in iter_paginated(ctx.client('rds'), 'describe_db_instances', 'DBInstances')
+    ]
+
+    print(f"[DEBUG] ✅ RDS 수집 완료: {len(db_instances_raw)}개", flush=True)
+    return {
+        "summary": {
+            "total": len(db_instances_raw)
+        },
+        "instances": db_instances_raw  # Raw 데이터 (Multi-AZ, Engine, BackupRetentionPeriod 등 RDS_INSTANCE_FIELDS)
+    }
+
+
+def fetch_credential_report(iam, max_wait_seconds=CREDENTIAL_REPORT_WAIT_SECONDS):
+    """
+    IAM 자격 증명 보고서(CSV) 가져오기 (최근 4시간 내 보고서가 없으면 생성 후 완료까지 대기)
+    
+    Args:
+        iam: IAM 클라이언트
+        max_wait_seconds (int): 생성 완료 대기 최대 시간
+    
+    Returns:
+        tuple: (CSV 바이트, 생성 시각) 또는 사용할 수 없으면 (None, None)
+    """
+    try:
+        deadline = time.monotonic() + max_wait_seconds
+        while iam.generate_credential_report()['State'] != 'COMPLETE':
+            if time.monotonic() >= deadline:
+                print(f"[DEBUG] ⚠️ 자격 증명 보고서 생성 대기 시간 초과 ({max_wait_seconds}초)", flush=True)
+                return None, None
+            time.sleep(1)
+
+        report = iam.get_credential_report()
+        if report.get('ReportFormat', 'text/csv') != 'text/csv':
+            return None, None
+        return report['Content'], report.get('GeneratedTime')
+    except Exception as e:
+        print(f"[DEBUG] ⚠️ 자격 증명 보고서 사용 불가: {e}", flush=True)
+        return None, None
+
+
+def _report_value(value):
+    """자격 증명 보고서 값 정리 ('N/A', 'no_information', 'not_supported' → None)"""
+    return None if value in ('N/A', 'no_information', 'not_supported', '') else value
+
+
+def iter_credential_report_users(content):
+    """
+    자격 증명 보고서 CSV를 한 줄씩 읽어 사용자 항목으로 변환 (루트 계정 행 포함)
+    
+    Args:
+        content (bytes): get_credential_report의 Content
+    
+    Yields:
+        dict: username, mfa, access_keys(상태/생성일/마지막 사용 정보), 비밀번호 상태 등
+    """
+    for row in csv.DictReader(io.TextIOWrapper(io.BytesIO(content), encoding='utf-8', newline='')):
+        access_keys = []
+        for index in (1, 2):
+            create_date = _report_value(row.get(f'access_key_{index}_last_rotated'))
+            if create_date is None:
+                continue  # 키 없음
+            access_keys.append({
+                "Status": 'Active' if row.get(f'access_key_{index}_active') == 'true' else 'Inactive',
+                "CreateDate": create_date,
+                "LastUsedDate": _report_value(row.get(f'access_key_{index}_last_used_date')),
+                "LastUsedRegion": _report_value(row.get(f'access_key_{index}_last_used_region')),
+                "LastUsedService": _report_value(row.get(f'access_key_{index}_last_used_service'))
+            })
+
+        yield {
+            "username": row['user'],
+            "arn": row.get('arn'),
+            "created": _report_value(row.get('user_creation_time')),
+            "mfa": row.get('mfa_active') == 'true',
+            "password_enabled": row.get('password_enabled') == 'true',
+            "password_last_used": _report_value(row.get('password_last_used')),
+            "password_last_changed": _report_value(row.get('password_last_changed')),
+            "access_keys": access_keys,
+            "policies": [],
+            "groups": []
+        }
+
+
+def _collect_iam_users_per_user(iam):
+    """사용자별 MFA/액세스 키 조회 (자격 증명 보고서를 사용할 수 없을 때의 대체 경로, 사용자당 2회 호출)"""
+    users = []
+    for user in iter_paginated(iam, 'list_users', 'Users'):
+        username = user['UserName']
+
+        # MFA 확인
+        has_mfa = next(iter_paginated(iam, 'list_mfa_devices', 'MFADevices', UserName=username), None) is not None
+
+        # 액세스 키 확인
+        access_keys = list(iter_paginated(iam, 'list_access_keys', 'AccessKeyMetadata', UserName=username))
+
+        users.append({
+            "username": username,
+            "mfa": has_mfa,
+            "access_keys": access_keys,
+            "policies": [],
+            "groups": []
+        })
+    return users
+
+
+@register_section('iam', ('iam_security',), {"users": {"total": 0, "mfa_enabled": 0, "details": []}, "issues": []})
+def collect_iam(ctx, inputs):
+    """IAM 사용자 수집 (자격 증명 보고서 1회 조회, 사용할 수 없으면 사용자별 MFA/액세스 키 조회)"""
+    print(f"[DEBUG] 📦 IAM 사용자 수집 중...", flush=True)
+    iam = ctx.client('iam')
+    users = []
+    root_account = None
+
+    content, generated_time = fetch_credential_report(iam)
+    if content is not None:
+        source = 'credential_report'
+        for user in iter_credential_report_users(content):
+            if user['username'] == '<root_account>':
+                root_account = {
+                    "mfa": user['mfa'],
+                    "password_last_used": user['password_last_used'],
+                    "access_keys": user['access_keys']
+                }
+            else:
+                users.append(user)
+    else:
+        source = 'per_user'
+        users = _collect_iam_users_per_user(iam)
+
+    # MFA 미설정 이슈
+    issues = [
+        {
+            "severity": "critical",
+            "type": "no_mfa",
+            "user": user['username'],
+            "description": "MFA 미설정"
+        }
+        for user in users if not user['mfa']
+    ]
+    mfa_enabled = len(users) - len(issues)
+
+    print(f"[DEBUG] ✅ IAM 수집 완료: {len(users)}명 (MFA 활성화: {mfa_enabled}명, 출처: {source})", flush=True)
+    iam_security = {
+        "users": {
+            "total": len(users),
+            "mfa_enabled": mfa_enabled,
+            "details": users
+        },
+        "issues": issues,
+        "source": source
+    }
+    if content is not None:
+        iam_security["credential_report_generated"] = generated_time
+        iam_security["root_account"] = root_account
+    return iam_security
+
+
+def _merge_security_groups(values_by_region):
+    """보안 그룹 섹션 병합 (개수 합산, 위험 그룹 상세는 리전 표시 후 처음 5개)"""
+    details = [
+        dict(sg, region=region)
+        for region, value in values_by_region.items() for sg in value.get('details', [])
+    ]
+    return {
+        "total": sum(value.get('total', 0) for value in values_by_region.values()),
+        "risky": sum(value.get('risky', 0) for value in values_by_region.values()),
+        "details": details[:5]
+    }
+
+
+@register_section('security_groups', ('security_groups',), {"total": 0, "risky": 0, "details": []},
+                  merge=_merge_security_groups)
+def collect_security_groups(ctx, inputs):
+    """보안 그룹 수집 (0.0.0.0/0 인바운드 규칙)"""
+    print(f"[DEBUG] 📦 보안 그룹 수집 중...", flush=True)
+    risky_sgs = []
+    total_sgs = 0
+    total_risky_rules = 0
+
+    for sg in iter_paginated(ctx.client('ec2'), 'describe_security_groups', 'SecurityGroups'):
+        total_sgs += 1
+        risky_rules = []
+        for rule in sg.get('IpPermissions', []):
+            for ip_range in rule.get('IpRanges', []):
+                if ip_range.get('CidrIp') == '0.0.0.0/0':
+                    port = rule.get('FromPort', 'all')
+                    risky_rules.append({
+                        "port": port,
+                        "protocol": rule.get('IpProtocol', 'all'),
+                        "source": "0.0.0.0/0",
+                        "risk_level": "high" if port in [22, 3389, 3306, 5432] else "medium",
+                        "description": f"포트 {port} 전체 오픈"
+                    })
+
+        if risky_rules:
+            if len(risky_sgs) < 5:  # 처음 5개만 표시 (나머지는 개수만 집계)
+                risky_sgs.append({
+                    "id": sg['GroupId'],
+                    "name": sg['GroupName'],
+                    "vpc": sg.get('VpcId', 'N/A'),
+                    "risky_rules": risky_rules
+                })
+            total_risky_rules += len(risky_rules)
+
+    print(f"[DEBUG] ✅ 보안 그룹 수집 완료: {total_sgs}개 (위험 규칙: {total_risky_rules}개)", flush=True)
+    return {
+        "total": total_sgs,
+        "risky": total_risky_rules,
+        "details": risky_sgs
+    }
+
+
+def _merge_encryption(values_by_region):
+    """암호화 섹션 병합 (EBS/RDS는 리전 합산, S3는 전역이므로 보고서 리전 값 사용)"""
+    values = list(values_by_region.values())
+    ebs_total = sum(value['ebs']['total'] for value in values)
+    ebs_encrypted = sum(value['ebs']['encrypted'] for value in values)
+    rds_total = sum(value['rds']['total'] for value in values)
+    rds_encrypted = sum(value['rds']['encrypted'] for value in values)
+    unencrypted_volumes = [volume_id for value in values for volume_id in value['ebs']['unencrypted_volumes']]
+    return {
+        "ebs": {
+            "total": ebs_total,
+            "encrypted": ebs_encrypted,
+            "unencrypted_volumes": unencrypted_volumes[:16]
+        },
+        "s3": values[0]['s3'],
+        "rds": {
+            "total": rds_total,
+            "encrypted": rds_encrypted,
+            "encrypted_rate": rds_encrypted / rds_total if rds_total > 0 else 0.0
+        }
+    }
+
+
+@register_section('encryption', ('encryption',),
+                  {"ebs": {"total": 0, "encrypted": 0, "unencrypted_volumes": []}, "s3": {"total": 0, "encrypted": 0, "encrypted_rate": 0.0}, "rds": {"total": 0, "encrypted": 0, "encrypted_rate": 0.0}},
+                  depends_on=('s3', 'rds'), merge=_merge_encryption)
+def collect_encryption(ctx, inputs):
+    """암호화 상태 수집 (EBS 볼륨 + S3/RDS 섹션 요약)"""
+    print(f"[DEBUG] 📦 암호화 상태 수집 중...", flush=True)
+    total_volumes = 0
+    encrypted_volumes = 0
+    unencrypted_volumes = []  # 처음 16개만
+    for volume in iter_paginated(ctx.client('ec2'), 'describe_volumes', 'Volumes'):
+        total_volumes += 1
+        if volume.get('Encrypted', False):
+            encrypted_volumes += 1
+        elif len(unencrypted_volumes) < 16:
+            unencrypted_volumes.append(volume['VolumeId'])
+
+    # S3, RDS 요약 정보 가져오기 (새 구조 반영)
+    s3_total = inputs['s3']['summary']['total']
+    s3_encrypted = inputs['s3']['summary']['encrypted']
+    rds_total = inputs['rds']['summary']['total']
+
+    # RDS 암호화 상태 계산
+    rds_instances = inputs['rds'].get('instances', [])
+    rds_encrypted = sum(1 for instance in rds_instances if instance.get('StorageEncrypted', False))
+    rds_encrypted_rate = rds_encrypted / rds_total if rds_total > 0 else 0.0
+
+    print(f"[DEBUG] ✅ 암호화 수집 완료: EBS {encrypted_volumes}/{total_volumes} 암호화됨", flush=True)
+    return {
+        "ebs": {
+            "total": total_volumes,
+            "encrypted": encrypted_volumes,
+            "unencrypted_volumes": unencrypted_volumes
+        },
+        "s3": {
+            "total": s3_total,
+            "encrypted": s3_encrypted,
+            "encrypted_rate": s3_encrypted / s3_total if s3_total > 0 else 0.0
+        },
+        "rds": {
+            "total": rds_total,
+            "encrypted": rds_encrypted,
+            "encrypted_rate": rds_encrypted_rate
+        }
+    }
+
+
+def get_trusted_advisor_checks(support):
+    """
+    Trusted Advisor 체크 목록 (프로세스 캐시, TA_CATALOGUE_TTL_SECONDS마다 갱신)
+    
+    Args:
+        support: us-east-1 Support 클라이언트
+    
+    Returns:
+        list: describe_trusted_advisor_checks의 checks (id, name, category 등)
+    """
+    with _ta_catalogue_lock:
+        if _ta_catalogue['checks'] is None or time.monotonic() - _ta_catalogue['loaded_at'] >= TA_CATALOGUE_TTL_SECONDS:
+            _ta_catalogue['checks'] = support.describe_trusted_advisor_checks(language='en')['checks']
+            _ta_catalogue['loaded_at'] = time.monotonic()
+        return _ta_catalogue['checks']
+
+
+def _fetch_check_summaries(support, check_ids):
+    """
+    체크 요약을 TA_SUMMARY_BATCH_SIZE개씩 배치 조회 (실패한 배치는 건너뜀)
+    
+    Returns:
+        tuple: (요약 목록, 모든 배치 성공 여부)
+    """
+    summaries = []
+    complete = True
+    for i in range(0, len(check_ids), TA_SUMMARY_BATCH_SIZE):
+        batch = check_ids[i:i + TA_SUMMARY_BATCH_SIZE]
+        try:
+            summaries.extend(support.describe_trusted_advisor_check_summaries(checkIds=batch)['summaries'])
+        except Exception as e:
+            print(f"[DEBUG] TA 체크 요약 {i + 1}~{i + len(batch)} 조회 실패: {e}", flush=True)
+            complete = False
+    return summaries, complete
+
+
+def _flagged_check_ids(summaries):
+    """체크 요약에서 문제가 있는(warning/error, 플래그된 리소스 있음) 체크 ID 집합 반환"""
+    return {
+        summary['checkId'] for summary in summaries
+        if summary['status'] in ['warning', 'error'] and summary.get('resourcesSummary', {}).get('resourcesFlagged', 0) > 0
+    }
+
+
+def _trusted_advisor_check_issue(support, check):
+    """플래그된 체크 1개의 전체 결과 조회 → 보고서 항목 (문제가 없거나 실패하면 None)"""
+    check_name = check['name']
+    check_category = check['category']
+
+    try:
+        result_response = support.describe_trusted_advisor_check_result(checkId=check['id'], language='en')
+        result = result_response['result']
+
+        status = result['status']
+        flagged_resources = len(result.get('flaggedResources', []))
+
+        # 문제가 있는 체크만 포함
+        if status in ['warning', 'error'] and flagged_resources > 0:
+            # 한글 번역
+            category_kr = {
+                'security': '보안',
+                'cost_optimizing': '비용 최적화',
+                'performance': '성능',
+                'fault_tolerance': '내결함성',
+                'service_limits': '서비스 한도'
+            }.get(check_category, check_category)
+
+            print(f"[DEBUG] TA 이슈 발견: [{category_kr}] {check_name} - {flagged_resources}개", flush=True)
+            return {
+                "category": category_kr,
+                "name": check_name,  # 영문 그대로 (한글 번역은 템플릿에서)
+                "status": status,
+                "flagged_resources": flagged_resources,
+                "details": []  # 상세 정보는 생략 (개수만 표시)
+            }
+    except Exception as e:
+        print(f"[DEBUG] TA 체크 {check_name} 결과 수집 실패: {e}", flush=True)
+    return None
+
+
+def _trusted_advisor_fingerprint(ctx):
+    """
+    Trusted Advisor 지문: 전체 체크의 상태/플래그된 리소스 수 (요약 배치 조회만 호출)
+    조회한 요약은 ctx.ta_summaries에 보관해 지문이 바뀌었을 때 수집에서 다시 조회하지 않음
+    """
+    support = ctx.client('support', 'us-east-1')
+    summaries, complete = _fetch_check_summaries(support, [check['id'] for check in get_trusted_advisor_checks(support)])
+    if not complete:
+        raise RuntimeError("TA 체크 요약 일부 조회 실패")
+    ctx.ta_summaries = summaries
+    return [
+        (summary['checkId'], summary['status'], summary.get('resourcesSummary', {}).get('resourcesFlagged', 0))
+        for summary in summaries
+    ]
+
+
+@register_section('trusted_advisor', ('trusted_advisor',), {"available": False, "checks": []},
+                  fingerprint=_trusted_advisor_fingerprint)
+def collect_trusted_advisor(ctx, inputs):
+    """Trusted Advisor 수집 (요약 배치 조회 후 문제가 있는 체크만 상세 결과 병렬 조회, TA는 us-east-1만 지원)"""
+    print(f"[DEBUG] 🔍 Trusted Advisor 수집 중... (이게 핵심!)", flush=True)
+    support = ctx.client('support', 'us-east-1')
+
+    # TA 체크 목록 (캐시)
+    checks = get_trusted_advisor_checks(support)
+    print(f"[DEBUG] TA 전체 체크 개수: {len(checks)}개", flush=True)
+
+    # 요약으로 문제가 있는 체크만 선별 → 상세 결과는 해당 체크만 조회 (체크 목록 순서 유지, 지문 계산의 요약 재사용)
+    summaries = ctx.ta_summaries
+    if summaries is None:
+        summaries, _ = _fetch_check_summaries(support, [check['id'] for check in checks])
+    flagged_ids = _flagged_check_ids(summaries)
+    flagged_checks = [check for check in checks if check['id'] in flagged_ids]
+    print(f"[DEBUG] TA 문제 체크: {len(flagged_checks)}개 (상세 결과 조회)", flush=True)
+
+    with ThreadPoolExecutor(max_workers=TA_RESULT_WORKERS, thread_name_prefix='ta-result') as executor:
+        ta_results = [
+            issue for issue in executor.map(lambda check: _trusted_advisor_check_issue(support, check), flagged_checks)
+            if issue is not None
+        ]
+
+    print(f"[DEBUG] ✅ Trusted Advisor 수집 완료: {len(ta_results)}개 이슈 발견!", flush=True)
+    return {
+        "available": True,
+        "checks": ta_results
+    }
+
+
+def _merge_cloudtrail(values_by_region):
+    """CloudTrail 섹션 병합 (이벤트별 건수 합산 + 리전별 건수, 표본은 최신순 CLOUDTRAIL_EVENT_SAMPLE_SIZE개)"""
+    values = list(values_by_region.values())
+    merged_events = {}
+    for region, value in values_by_region.items():
+        for event_name, event_data in value.get('critical_events', {}).items():
+            merged = merged_events.setdefault(event_name, dict(event_data, count=0, events=[], count_by_region={}))
+            merged['count'] += event_data.get('count', 0)
+            merged['events'].extend(event_data.get('events', []))
+            merged['count_by_region'][region] = event_data.get('count', 0)
+            if event_data.get('error'):
+                merged['error'] = event_data['error']
+
+    for merged in merged_events.values():
+        merged['events'] = sorted(merged['events'], key=_event_time_key, reverse=True)[:CLOUDTRAIL_EVENT_SAMPLE_SIZE]
+        merged['sampled'] = merged['count'] > len(merged['events'])
+
+    summary = dict(values[0].get('summary', {}))
+    summary['total_critical_events'] = sum(value.get('summary', {}).get('total_critical_events', 0) for value in values)
+    return {
+        "summary": summary,
+        "critical_events": merged_events
+    }
+
+
+@register_section('cloudtrail', ('cloudtrail_events',), {"summary": {"period_days": 30, "total_critical_events": 0, "monitored_event_types": 0}, "critical_events": {}},
+                  merge=_merge_cloudtrail)
+def collect_cloudtrail(ctx, inputs):
+    """CloudTrail 이벤트 수집 (정확한 기간, UTC+9, 같은 기간의 이전 스냅샷이 있으면 확정 구간 이후만 조회)"""
+    previous_settled = None
+    previous = (ctx.previous or {}).get('cloudtrail')
+    if previous and (previous.get('period_start'), previous.get('period_end')) == (ctx.start_date_str, ctx.end_date_str):
+        previous_settled = (previous.get('state') or {}).get('settled')
+
+    value, settled = collect_cloudtrail_events_incremental(
+        ctx.client('cloudtrail'), ctx.start_date_str, ctx.end_date_str, previous_settled,
+        track_settled=ctx.previous is not None, account_id=ctx.account_id
+    )
+    if ctx.previous is not None and settled:
+        ctx.snapshot_state['cloudtrail'] = {'settled': settled}
+    return value
+
+
+@register_section('cloudwatch', ('cloudwatch',), {"summary": {"total": 0, "in_alarm": 0, "ok": 0, "insufficient_data": 0}, "alarms": []},
+                  merge=lambda values: _merge_summary_lists(values, 'alarms'))
+def collect_cloudwatch(ctx, inputs):
+    """CloudWatch 알람 수집 (Raw 데이터 저장)"""
+    print(f"[DEBUG] 📦 CloudWatch 알람 수집 중...", flush=True)
+
+    # 페이지 단위로 알람 추출 (보관 필드만) + 상태별 개수 누적
+    alarms_raw = []
+    states = {'ALARM': 0, 'OK': 0, 'INSUFFICIENT_DATA': 0}
+    for alarm in iter_paginated(ctx.client('cloudwatch'), 'describe_alarms', 'MetricAlarms'):
+        alarms_raw.append(_pick_fields(alarm, CLOUDWATCH_ALARM_FIELDS))
+        if alarm['StateValue'] in states:
+            states[alarm['StateValue']] += 1
+
+    total = len(alarms_raw)
+    in_alarm = states['ALARM']
+    ok = states['OK']
+    insufficient_data = states['INSUFFICIENT_DATA']
+
+    print(f"[DEBUG] ✅ CloudWatch 수집 완료: {total}개 알람 (ALARM: {in_alarm}, OK: {ok})", flush=True)
+    return {
+        "summary": {
+            "total": total,
+            "in_alarm": in_alarm,
+            "ok": ok,
+            "insufficient_data": insufficient_data
+        },
+        "alarms": alarms_raw  # Raw 데이터 (AlarmName, StateValue, MetricName, Threshold 등 CLOUDWATCH_ALARM_FIELDS)
+    }
+
+
+@register_section('recommendations', ('recommendations',), [],
+                  depends_on=('iam', 'security_groups', 'encryption', 's3'), checkpoint=False)
+def build_recommendations(ctx, inputs):
+    """수집된 섹션으로 권장사항 생성 (체크포인트 없이 항상 다시 계산)"""
+    print(f"[DEBUG] 📝 권장사항 생성 중...", flush=True)
+    iam_security = inputs['iam']
+    security_groups = inputs['security_groups']
+    encryption = inputs['encryption']
+    s3_data = inputs['s3']
+    recommendations = []
+
+    # MFA 권장사항
+    if iam_security['users']['mfa_enabled'] < iam_security['users']['total']:
+        recommendations.append({
+            "priority": "critical",
+            "category": "security",
+            "title": "모든 IAM 사용자에 MFA 설정 필요",
+            "description": f"{iam_security['users']['total'] - iam_security['users']['mfa_enabled']}명의 IAM 사용자가 MFA를 설정하지 않았습니다.",
+            "affected_resources": [u['username'] for u in iam_security['users']['details'] if not u['mfa']],
+            "action": "모든 IAM 사용자에 대해 MFA를 활성화하고 정기적으로 검토하세요."
+        })
+
+    # 보안 그룹 권장사항
+    if security_groups['risky'] > 0:
+        recommendations.append({
+            "priority": "critical",
+            "category": "security",
+            "title": "보안 그룹 규칙 강화 필요",
+            "description": f"{security_groups['risky']}개의 위험한 보안 그룹 규칙이 발견되었습니다.",
+            "affected_resources": [sg['id'] for sg in security_groups['details']],
+            "action": "보안 그룹 규칙을 검토하고 필요한 IP 범위로만 제한하세요."
+        })
+
+    # EBS 암호화 권장사항
+    if encryption['ebs']['total'] > 0 and encryption['ebs']['encrypted'] < encryption['ebs']['total']:
+        recommendations.append({
+            "priority": "high",
+            "category": "security",
+            "title": "EBS 볼륨 암호화 활성화",
+            "description": f"{encryption['ebs']['total'] - encryption['ebs']['encrypted']}개의 EBS 볼륨이 암호화되지 않았습니다.",
+            "affected_resources": encryption['ebs']['unencrypted_volumes'][:5],
+            "action": "새로운 EBS 볼륨에 대해 기본 암호화를 활성화하고 기존 볼륨을 암호화된 볼륨으로 마이그레이션하세요."
+        })
+
+    # S3 암호화 권장사항 (새 구조 반영)
+    s3_total = s3_data['summary']['total']
+    s3_encrypted = s3_data['summary']['encrypted']
+    if s3_total > 0 and s3_encrypted < s3_total:
+        # 암호화되지 않은 버킷 찾기
+        unencrypted_buckets = [b['Name'] for b in s3_data['buckets'] if b.get('Encryption') is None]
+        recommendations.append({
+            "priority": "high",
+            "category": "security",
+            "title": "S3 버킷 암호화 설정",
+            "description": f"{s3_total - s3_encrypted}개의 S3 버킷이 암호화되지 않았습니다.",
+            "affected_resources": unencrypted_buckets[:5],
+            "action": "모든 S3 버킷에 대해 서버 측 암호화(SSE)를 활성화하세요."
+        })
+
+    print(f"[DEBUG] ✅ 권장사항 생성 완료: {len(recommendations)}개", flush=True)
+    return recommendations
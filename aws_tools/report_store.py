@@ -0,0 +1,245 @@
+"""
+보안 보고서 Raw 데이터 저장소
+수집 결과를 보고서/분석에 쓰는 필드만 남겨 gzip 압축 JSON Lines(.jsonl.gz)로 저장하고 레코드 단위로 스트리밍 읽기
+기존 JSON 파일(.json)도 같은 함수로 읽을 수 있고 migrate_reports로 변환 가능
+"""
+import os
+import sys
+import gzip
+import orjson
+from aws_tools.report_collectors import (
+    EC2_INSTANCE_FIELDS, LAMBDA_FUNCTION_FIELDS, RDS_INSTANCE_FIELDS, CLOUDWATCH_ALARM_FIELDS, _pick_fields
+)
+from utils.json_store import json_default
+
+# 저장 파일 확장자와 형식 정보 (첫 줄 헤더 레코드)
+REPORT_FILE_SUFFIX = '.jsonl.gz'
+FORMAT_NAME = 'security-report'
+FORMAT_VERSION = 1
+
+# 목록 항목을 나눠 쓰는 레코드당 항목 수, gzip 압축 수준
+STREAM_CHUNK_SIZE = 500
+COMPRESS_LEVEL = 6
+
+# 항목 단위 레코드로 저장하는 목록 위치 → 보관 필드 (None이면 전체 필드, 멀티 리전 Region 태그는 항상 보관)
+STREAMED_LISTS = {
+    ('resources', 'ec2', 'instances'): EC2_INSTANCE_FIELDS,
+    ('resources', 's3', 'buckets'): None,
+    ('resources', 'lambda', 'functions'): LAMBDA_FUNCTION_FIELDS,
+    ('resources', 'rds', 'instances'): RDS_INSTANCE_FIELDS,
+    ('iam_security', 'users', 'details'): None,
+    ('cloudwatch', 'alarms'): CLOUDWATCH_ALARM_FIELDS,
+}
+
+# CloudTrail 이벤트 보관 필드 (CloudTrailEvent 원문은 분석에 쓰는 필드만 남긴 JSON 문자열로 축소)
+CLOUDTRAIL_EVENT_FIELDS = (
+    'EventId', 'EventName', 'EventTime', 'EventSource', 'Username', 'ReadOnly', 'AccessKeyId', 'Resources',
+)
+CLOUDTRAIL_DETAIL_FIELDS = (
+    'awsRegion', 'sourceIPAddress', 'userAgent', 'userIdentity', 'requestParameters', 'errorCode', 'errorMessage',
+    'eventType',
+)
+
+
+def _dumps(record):
+    """
+    레코드 1개를 한 줄 JSON(bytes)으로 직렬화
+    datetime은 인코더가 ISO 8601 문자열로 바로 기록하므로 보고서 전체를 변환한 사본을 만들지 않음
+    """
+    return orjson.dumps(record, default=json_default, option=orjson.OPT_NON_STR_KEYS) + b'\n'
+
+
+def project_cloudtrail_event(event):
+    """
+    CloudTrail 이벤트 축소 (요약 필드 + CloudTrailEvent 원문 중 분석 필드)
+    
+    Args:
+        event (dict): lookup_events 응답의 이벤트
+    
+    Returns:
+        dict: 축소된 이벤트
+    """
+    projected = _pick_fields(event, CLOUDTRAIL_EVENT_FIELDS)
+    detail = event.get('CloudTrailEvent')
+    if isinstance(detail, str):
+        try:
+            detail = orjson.loads(detail)
+            projected['CloudTrailEvent'] = orjson.dumps(_pick_fields(detail, CLOUDTRAIL_DETAIL_FIELDS)).decode('utf-8')
+        except (orjson.JSONDecodeError, TypeError):
+            projected['CloudTrailEvent'] = detail
+    return projected
+
+
+def _project_cloudtrail_section(section):
+    """cloudtrail_events 섹션의 이벤트 표본 축소 (원본은 변경하지 않음)"""
+    if not isinstance(section, dict) or not isinstance(section.get('critical_events'), dict):
+        return section
+    critical_events = {
+        event_name: dict(event_data, events=[project_cloudtrail_event(e) for e in event_data.get('events', [])])
+        if isinstance(event_data, dict) else event_data
+        for event_name, event_data in section['critical_events'].items()
+    }
+    return dict(section, critical_events=critical_events)
+
+
+def _get_path(obj, path):
+    """중첩 딕셔너리에서 경로 값 조회 (없으면 None)"""
+    for key in path:
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(key)
+    return obj
+
+
+def _replace_path(obj, path, value):
+    """경로 값을 바꾼 얕은 복사본 반환 (경로가 없으면 원본 그대로)"""
+    if not path:
+        return value
+    if not isinstance(obj, dict) or path[0] not in obj:
+        return obj
+    return dict(obj, **{path[0]: _replace_path(obj[path[0]], path[1:], value)})
+
+
+def save_report(data, path):
+    """
+    보고서 데이터를 압축 JSON Lines로 저장 (임시 파일 작성 후 원자적 교체)
+    최상위 섹션마다 레코드 1개, STREAMED_LISTS 목록은 STREAM_CHUNK_SIZE개씩 별도 레코드
+    
+    Args:
+        data (dict): 보고서 데이터 (datetime 포함 가능)
+        path (str): 저장 경로 (.jsonl.gz)
+    
+    Returns:
+        str: 저장 경로
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wb', compresslevel=COMPRESS_LEVEL) as f:
+        f.write(_dumps({"format": FORMAT_NAME, "version": FORMAT_VERSION}))
+        for key, value in data.items():
+            if key == 'cloudtrail_events':
+                value = _project_cloudtrail_section(value)
+
+            # 목록은 비운 채로 섹션 레코드 작성 후 항목 레코드로 이어 씀
+            streamed = [(list_path, fields) for list_path, fields in STREAMED_LISTS.items() if list_path[0] == key]
+            section = value
+            for list_path, _ in streamed:
+                if isinstance(_get_path(data, list_path), list):
+                    section = _replace_path(section, list_path[1:], [])
+            f.write(_dumps({"path": [key], "value": section}))
+
+            for list_path, fields in streamed:
+                items = _get_path(data, list_path)
+                if not isinstance(items, list):
+                    continue
+                for i in range(0, len(items), STREAM_CHUNK_SIZE):
+                    chunk = items[i:i + STREAM_CHUNK_SIZE]
+                    if fields is not None:
+                        chunk = [_pick_fields(item, fields + ('Region',)) for item in chunk]
+                    f.write(_dumps({"path": list(list_path), "items": chunk}))
+    os.replace(tmp_path, path)
+    return path
+
+
+def iter_report_records(path):
+    """
+    저장된 보고서를 레코드 단위로 읽기 (압축 파일은 한 줄씩, 기존 .json은 최상위 섹션 단위)
+    
+    Args:
+        path (str): 보고서 파일 경로 (.jsonl.gz 또는 기존 .json)
+    
+    Yields:
+        dict: {"path": [...], "value": 값} 또는 {"path": [...], "items": [항목...]}
+    """
+    if not path.endswith('.gz'):
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read())
+        for key, value in data.items():
+            yield {"path": [key], "value": value}
+        return
+
+    with gzip.open(path, 'rb') as f:
+        header = orjson.loads(f.readline())
+        if header.get('format') != FORMAT_NAME:
+            raise ValueError(f"보고서 형식이 아님: {path}")
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def iter_report_items(path, list_path):
+    """
+    보고서의 목록 항목을 하나씩 읽기 (예: ('resources', 'ec2', 'instances'), 다른 목록은 메모리에 올리지 않음)
+    
+    Args:
+        path (str): 보고서 파일 경로
+        list_path (tuple): 목록 위치
+    
+    Yields:
+        dict: 목록 항목
+    """
+    list_path = list(list_path)
+    for record in iter_report_records(path):
+        record_path = record['path']
+        if 'items' in record and record_path == list_path:
+            yield from record['items']
+        elif 'value' in record and record_path == list_path[:len(record_path)]:
+            yield from _get_path(record['value'], list_path[len(record_path):]) or []
+
+
+def load_report(path):
+    """
+    저장된 보고서 전체 로드 (기존 JSON 파일 호환)
+    
+    Args:
+        path (str): 보고서 파일 경로 (.jsonl.gz 또는 기존 .json)
+    
+    Returns:
+        dict: 보고서 데이터
+    """
+    data = {}
+    for record in iter_report_records(path):
+        *parents, last = record['path']
+        parent = data
+        for key in parents:
+            parent = parent.setdefault(key, {})
+        if 'items' in record:
+            parent.setdefault(last, []).extend(record['items'])
+        else:
+            parent[last] = record['value']
+    return data
+
+
+def migrate_reports(directory='/tmp/reports'):
+    """
+    기존 Raw JSON 파일(security_data_*.json)을 압축 형식으로 변환 후 원본 삭제
+    
+    Args:
+        directory (str): 보고서 디렉터리
+    
+    Returns:
+        list: 변환된 파일 경로 목록
+    """
+    migrated = []
+    if not os.path.isdir(directory):
+        return migrated
+
+    for filename in sorted(os.listdir(directory)):
+        if not (filename.startswith('security_data_') and filename.endswith('.json')):
+            continue
+        source_path = os.path.join(directory, filename)
+        target_path = source_path[:-len('.json')] + REPORT_FILE_SUFFIX
+        try:
+            save_report(load_report(source_path), target_path)
+            os.remove(source_path)
+            migrated.append(target_path)
+            print(f"[DEBUG] 보고서 변환: {filename} → {os.path.basename(target_path)}", flush=True)
+        except Exception as e:
+            print(f"[ERROR] ❌ 보고서 변환 실패: {filename} - {e}", flush=True)
+    return migrated
+
+
+if __name__ == "__main__":
+    # python -m aws_tools.report_store [디렉터리]
+    results = migrate_reports(sys.argv[1] if len(sys.argv) > 1 else '/tmp/reports')
+    print(f"변환 완료: {len(results)}개")
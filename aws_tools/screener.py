@@ -11,6 +11,7 @@ import shutil
 import threading
 from datetime import datetime
 import traceback
+from aws_tools.auth import verify_account_identity
 
 
 def run_service_screener_async(account_id, credentials=None, websocket=None, session_id=None):
@@ -165,17 +166,10 @@ def run_service_screener_sync(account_id, credentials=None, websocket=None, sess
         # ========================================
         # 계정 검증 (Reference 코드와 동일)
         # ========================================
-        verify_cmd = ['aws', 'sts', 'get-caller-identity', '--query', 'Account', '--output', 'text']
-        verify_result = subprocess.run(
-            verify_cmd,
-            capture_output=True,
-            text=True,
-            env=env_vars,
-            timeout=10
-        )
-        
-        if verify_result.returncode == 0:
-            actual_account = verify_result.stdout.strip()
+        # 풀 STS 클라이언트로 프로세스 내에서 검증 (액세스 키별로 만료 시까지 결과 재사용)
+        actual_account, verify_error = verify_account_identity(account_id, credentials)
+        
+        if verify_error is None:
             print(f"[DEBUG] 계정 검증 - 요청: {account_id}, 실제: {actual_account}", flush=True)
             
             if actual_account != account_id:
@@ -189,12 +183,12 @@ def run_service_screener_sync(account_id, credentials=None, websocket=None, sess
             else:
                 print(f"[DEBUG] ✅ 계정 검증 성공: {actual_account}", flush=True)
         else:
-            print(f"[ERROR] 계정 검증 실패: {verify_result.stderr}", flush=True)
+            print(f"[ERROR] 계정 검증 실패: {verify_error}", flush=True)
             return {
                 "success": False,
                 "summary": None,
                 "report_url": None,
-                "error": f"계정 검증 실패: {verify_result.stderr[:200]}"
+                "error": f"계정 검증 실패: {verify_error[:200]}"
             }
         
         # 기존 Service Screener 결과 삭제 (실제 경로 기준)
@@ -386,6 +380,11 @@ def send_websocket_message_safe(websocket, session_id, message):
             "timestamp": datetime.now().isoformat()
         }
         
+        # 작업 채널이면 이벤트 루프 없이 바로 발행 (진행 이력에 기록되고 구독자에게 전달됨)
+        if hasattr(websocket, 'publish'):
+            websocket.publish(ws_message)
+            return
+        
         # 비동기 전송 시도 (실패해도 무시)
         try:
             loop = asyncio.get_event_loop()
@@ -5,41 +5,19 @@ Reference 코드의 완전한 데이터 수집 로직을 WebSocket 환경에 맞
 
 import os
 import json
-import boto3
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta
 import subprocess
 import traceback
+from aws_tools.client_pool import get_client
+from aws_tools.report_collectors import (
+    CollectorContext, SECTION_COLLECTORS, run_section_collectors, collect_cloudtrail_events,
+    resolve_report_regions, collect_other_regions, build_snapshot_entries, INCREMENTAL_COLLECTION
+)
+from aws_tools.report_store import save_report, load_report, REPORT_FILE_SUFFIX
+from utils.snapshot_store import load_snapshot_sections, save_snapshot_sections
 
-def convert_datetime_to_json_serializable(obj):
-    """
-    datetime 객체를 JSON 직렬화 가능한 형식으로 변환하는 재귀 함수
-    
-    Args:
-        obj: 변환할 Python 객체 (dict, list, datetime 등)
-    
-    Returns:
-        JSON 직렬화 가능한 객체
-    """
-    if isinstance(obj, (datetime, date)):
-        # datetime 또는 date 객체를 ISO 8601 형식 문자열로 변환
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        # 딕셔너리의 모든 값을 재귀적으로 변환
-        return {key: convert_datetime_to_json_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        # 리스트의 모든 요소를 재귀적으로 변환
-        return [convert_datetime_to_json_serializable(item) for item in obj]
-    elif isinstance(obj, tuple):
-        # 튜플을 리스트로 변환하고 재귀적으로 처리
-        return [convert_datetime_to_json_serializable(item) for item in obj]
-    elif isinstance(obj, set):
-        # 세트를 리스트로 변환하고 재귀적으로 처리
-        return [convert_datetime_to_json_serializable(item) for item in obj]
-    else:
-        # 기타 타입은 그대로 반환 (str, int, float, bool, None 등)
-        return obj
-
-def collect_raw_security_data(account_id, start_date_str, end_date_str, region='ap-northeast-2', credentials=None):
+def collect_raw_security_data(account_id, start_date_str, end_date_str, region='ap-northeast-2', credentials=None,
+                              resume_sections=None, on_section_complete=None, regions=None, incremental=None):
     """
     boto3를 사용하여 AWS raw 보안 데이터를 수집 (Q CLI 분석용)
     Reference 코드의 완전한 collect_raw_security_data 함수
@@ -50,10 +28,17 @@ def collect_raw_security_data(account_id, start_date_str, end_date_str, region='
         end_date_str (str): 종료 날짜 (YYYY-MM-DD) - UTC+9 기준
         region (str): AWS 리전
         credentials (dict): AWS 자격증명 (AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_SESSION_TOKEN)
+        resume_sections (dict): 체크포인트에서 복원할 섹션 데이터 (섹션 이름 → 데이터, 해당 섹션은 재수집하지 않음)
+        on_section_complete (callable): 섹션 수집 완료 시 호출되는 콜백 (section, value)
+        regions: 멀티 리전 수집 대상 ('all', 리전 목록, None이면 REPORT_REGIONS 환경 변수, 비어 있으면 단일 리전)
+        incremental (bool): 이전 스냅샷 기반 증분 수집 여부 (None이면 REPORT_INCREMENTAL 환경 변수)
     
     Returns:
-        dict: Raw 보안 데이터 JSON
+        dict: Raw 보안 데이터 (boto3 응답의 datetime 그대로 유지, 문자열 변환은 저장 시 report_store가 처리)
     """
+    resume_sections = resume_sections or {}
+    if incremental is None:
+        incremental = INCREMENTAL_COLLECTION
     print(f"[DEBUG] ✅ boto3로 raw 데이터 수집 시작: 계정 {account_id}, 리전 {region}", flush=True)
     print(f"[DEBUG] 분석 기간: {start_date_str} ~ {end_date_str} (UTC+9)", flush=True)
     
@@ -69,23 +54,13 @@ def collect_raw_security_data(account_id, start_date_str, end_date_str, region='
     
     print(f"[DEBUG] 자격증명 확인: ACCESS_KEY={access_key[:20] if access_key else 'None'}..., SESSION_TOKEN={'있음' if session_token else '없음'}", flush=True)
     
-    # boto3 세션 생성 (환경 변수의 임시 자격증명 사용)
-    session = boto3.Session(
-        aws_access_key_id=access_key,
-        aws_secret_access_key=secret_key,
-        aws_session_token=session_token,
-        region_name=region
-    )
-    
-    # boto3 클라이언트 생성
-    ec2 = session.client('ec2', region_name=region)
-    s3 = session.client('s3', region_name=region)
-    iam = session.client('iam', region_name=region)
-    support = session.client('support', region_name='us-east-1')  # TA는 us-east-1만 지원
-    cloudtrail = session.client('cloudtrail', region_name=region)
-    cloudwatch = session.client('cloudwatch', region_name=region)
-    
-    print(f"[DEBUG] boto3 클라이언트 생성 완료 (임시 자격증명 사용)", flush=True)
+    # 풀 클라이언트용 자격증명 (만료 시각은 풀에서 클라이언트 제거 기준으로 사용)
+    client_credentials = {
+        'AWS_ACCESS_KEY_ID': access_key,
+        'AWS_SECRET_ACCESS_KEY': secret_key,
+        'AWS_SESSION_TOKEN': session_token,
+        'AWS_CREDENTIAL_EXPIRATION': (credentials or {}).get('AWS_CREDENTIAL_EXPIRATION')
+    }
     
     report_data = {
         "metadata": {
@@ -105,503 +80,213 @@ def collect_raw_security_data(account_id, start_date_str, end_date_str, region='
         "recommendations": []
     }
     
-    # 1. EC2 인스턴스 수집 (Raw 데이터 저장)
-    print(f"[DEBUG] 📦 EC2 인스턴스 수집 중...", flush=True)
+    # 등록된 섹션 수집기 병렬 실행 (암호화 요약, 권장사항은 입력 섹션 완료 후 실행)
+    ctx = CollectorContext(account_id, start_date_str, end_date_str, region, client_credentials)
+    if incremental:
+        # 증분 수집: 지문이 같은 섹션은 스냅샷 재사용, CloudTrail은 이전 확정 구간 이후만 조회
+        ctx.previous = load_snapshot_sections(account_id, region)
+    sections, timings = run_section_collectors(ctx, resume_sections, on_section_complete)
+    if incremental:
+        save_snapshot_sections(account_id, region, build_snapshot_entries(ctx, sections))
+    if ctx.reused:
+        report_data['metadata']['reused_sections'] = ctx.reused
+    
+    # 멀티 리전: 리전별 섹션(EC2, RDS, Lambda, EBS, 보안 그룹, CloudTrail, CloudWatch)만 다른 리전에서 추가 수집 후 병합
     try:
-        ec2_response = ec2.describe_instances()
-        
-        # Raw 인스턴스 데이터 추출 (모든 필드 포함)
-        instances_raw = []
-        for reservation in ec2_response['Reservations']:
-            for instance in reservation['Instances']:
-                instances_raw.append(instance)
-        
-        # 요약 정보 계산
-        total = len(instances_raw)
-        running = sum(1 for i in instances_raw if i['State']['Name'] == 'running')
-        stopped = sum(1 for i in instances_raw if i['State']['Name'] == 'stopped')
-        
-        report_data['resources']['ec2'] = {
-            "summary": {
-                "total": total,
-                "running": running,
-                "stopped": stopped
-            },
-            "instances": instances_raw  # Raw 데이터 (datetime 변환은 나중에 일괄 처리)
-        }
-        print(f"[DEBUG] ✅ EC2 수집 완료: {total}개 (running: {running}, stopped: {stopped})", flush=True)
+        other_regions = resolve_report_regions(ctx, regions)
     except Exception as e:
-        print(f"[ERROR] ❌ EC2 수집 실패: {e}", flush=True)
-        report_data['resources']['ec2'] = {"summary": {"total": 0, "running": 0, "stopped": 0}, "instances": []}
+        print(f"[ERROR] ❌ 리전 목록 조회 실패, 단일 리전으로 수집: {e}", flush=True)
+        other_regions = []
+    if other_regions:
+        sections = collect_other_regions(ctx, sections, other_regions)
+        report_data['metadata']['regions'] = [region] + other_regions
     
-    # 2. S3 버킷 수집 (Raw 데이터 + 추가 정보)
-    print(f"[DEBUG] 📦 S3 버킷 수집 중...", flush=True)
-    try:
-        s3_response = s3.list_buckets()
-        buckets_raw = []
-        
-        for bucket in s3_response['Buckets']:
-            bucket_name = bucket['Name']
-            bucket_data = bucket.copy()  # 기본 정보 복사
-            
-            try:
-                # 버킷 리전 확인
-                location = s3.get_bucket_location(Bucket=bucket_name)
-                bucket_data['Location'] = location.get('LocationConstraint') or 'us-east-1'
-                
-                # 암호화 확인
-                try:
-                    encryption_response = s3.get_bucket_encryption(Bucket=bucket_name)
-                    bucket_data['Encryption'] = encryption_response.get('ServerSideEncryptionConfiguration')
-                except:
-                    bucket_data['Encryption'] = None
-                
-                # 버저닝 확인
-                try:
-                    versioning_response = s3.get_bucket_versioning(Bucket=bucket_name)
-                    bucket_data['Versioning'] = versioning_response
-                except:
-                    bucket_data['Versioning'] = None
-                
-                # 퍼블릭 액세스 블록 확인
-                try:
-                    public_access_response = s3.get_public_access_block(Bucket=bucket_name)
-                    bucket_data['PublicAccessBlock'] = public_access_response.get('PublicAccessBlockConfiguration')
-                except:
-                    bucket_data['PublicAccessBlock'] = None  # 블록 설정 없음 = 퍼블릭 가능
-                
-                buckets_raw.append(bucket_data)
-            except Exception as e:
-                print(f"[DEBUG] 버킷 {bucket_name} 상세 정보 수집 실패: {e}", flush=True)
-                buckets_raw.append(bucket_data)  # 기본 정보라도 저장
-        
-        # 요약 정보 계산
-        encrypted_count = sum(1 for b in buckets_raw if b.get('Encryption') is not None)
-        public_count = sum(1 for b in buckets_raw if b.get('PublicAccessBlock') is None)
-        
-        report_data['resources']['s3'] = {
-            "summary": {
-                "total": len(buckets_raw),
-                "encrypted": encrypted_count,
-                "public": public_count
-            },
-            "buckets": buckets_raw  # Raw 데이터 (모든 버킷, 모든 필드)
-        }
-        print(f"[DEBUG] ✅ S3 수집 완료: {len(buckets_raw)}개 (암호화: {encrypted_count}, 퍼블릭: {public_count})", flush=True)
-    except Exception as e:
-        print(f"[ERROR] ❌ S3 수집 실패: {e}", flush=True)
-        report_data['resources']['s3'] = {"summary": {"total": 0, "encrypted": 0, "public": 0}, "buckets": []}
+    # 등록 순서대로 결과 배치 (병렬 완료 순서와 무관하게 동일한 JSON 구조)
+    for name, collector in SECTION_COLLECTORS.items():
+        parent = report_data
+        for key in collector.target[:-1]:
+            parent = parent[key]
+        parent[collector.target[-1]] = sections[name]
     
-    # 3. Lambda 함수 수집 (Raw 데이터 저장)
-    print(f"[DEBUG] 📦 Lambda 함수 수집 중...", flush=True)
-    try:
-        lambda_client = session.client('lambda', region_name=region)
-        lambda_response = lambda_client.list_functions()
-        functions_raw = lambda_response.get('Functions', [])
-        
-        report_data['resources']['lambda'] = {
-            "summary": {
-                "total": len(functions_raw)
-            },
-            "functions": functions_raw  # Raw 데이터 (모든 필드 포함)
-        }
-        print(f"[DEBUG] ✅ Lambda 수집 완료: {len(functions_raw)}개", flush=True)
-    except Exception as e:
-        print(f"[ERROR] ❌ Lambda 수집 실패: {e}", flush=True)
-        report_data['resources']['lambda'] = {"summary": {"total": 0}, "functions": []}
+    print(f"[DEBUG] 🎉 boto3 데이터 수집 완료! 정확한 데이터를 수집했습니다. ({timings['total'] / 1000:.1f}초)", flush=True)
     
-    # 4. RDS 인스턴스 수집 (Raw 데이터 저장 - Multi-AZ, 엔진, 백업 등 모든 정보 포함)
-    print(f"[DEBUG] 📦 RDS 인스턴스 수집 중...", flush=True)
-    try:
-        rds_client = session.client('rds', region_name=region)
-        rds_response = rds_client.describe_db_instances()
-        db_instances_raw = rds_response.get('DBInstances', [])
-        
-        report_data['resources']['rds'] = {
-            "summary": {
-                "total": len(db_instances_raw)
-            },
-            "instances": db_instances_raw  # Raw 데이터 (Multi-AZ, Engine, BackupRetentionPeriod 등 모두 포함)
-        }
-        print(f"[DEBUG] ✅ RDS 수집 완료: {len(db_instances_raw)}개", flush=True)
-    except Exception as e:
-        print(f"[ERROR] ❌ RDS 수집 실패: {e}", flush=True)
-        report_data['resources']['rds'] = {"summary": {"total": 0}, "instances": []}
+    return report_data
+
+def collect_raw_security_data_for_periods(account_id, periods, region='ap-northeast-2', credentials=None, max_workers=3,
+                                          regions=None):
+    """
+    여러 기간(월별)의 Raw 보안 데이터를 일괄 수집
+    시점 기준 인벤토리(EC2, S3, IAM, TA 등)는 한 번만 수집하고
+    기간별로 달라지는 CloudTrail 이벤트만 월마다 병렬로 수집
     
-    # 5. IAM 사용자 수집
-    print(f"[DEBUG] 📦 IAM 사용자 수집 중...", flush=True)
-    try:
-        iam_response = iam.list_users()
-        users = []
-        issues = []
-        
-        for user in iam_response['Users']:
-            username = user['UserName']
-            
-            # MFA 확인
-            mfa_devices = iam.list_mfa_devices(UserName=username)
-            has_mfa = len(mfa_devices['MFADevices']) > 0
-            
-            # 액세스 키 확인
-            access_keys = iam.list_access_keys(UserName=username)
-            
-            users.append({
-                "username": username,
-                "mfa": has_mfa,
-                "access_keys": access_keys['AccessKeyMetadata'],
-                "policies": [],
-                "groups": []
-            })
-            
-            # MFA 미설정 이슈
-            if not has_mfa:
-                issues.append({
-                    "severity": "critical",
-                    "type": "no_mfa",
-                    "user": username,
-                    "description": "MFA 미설정"
-                })
-        
-        report_data['iam_security'] = {
-            "users": {
-                "total": len(users),
-                "mfa_enabled": sum(1 for u in users if u['mfa']),
-                "details": users
-            },
-            "issues": issues
-        }
-        print(f"[DEBUG] ✅ IAM 수집 완료: {len(users)}명 (MFA 활성화: {sum(1 for u in users if u['mfa'])}명)", flush=True)
-    except Exception as e:
-        print(f"[ERROR] ❌ IAM 수집 실패: {e}", flush=True)
-        report_data['iam_security'] = {"users": {"total": 0, "mfa_enabled": 0, "details": []}, "issues": []}
+    Args:
+        account_id (str): AWS 계정 ID
+        periods (list): [(시작일, 종료일), ...] YYYY-MM-DD 형식, 오래된 순
+        region (str): AWS 리전
+        credentials (dict): AWS 자격증명
+        max_workers (int): 동시 수집 스레드 수 (CloudTrail LookupEvents 스로틀링 고려)
+        regions: 멀티 리전 수집 대상 (collect_raw_security_data와 동일, 기간별 CloudTrail도 같은 리전에서 수집)
     
-    # 6. 보안 그룹 수집
-    print(f"[DEBUG] 📦 보안 그룹 수집 중...", flush=True)
-    try:
-        sg_response = ec2.describe_security_groups()
-        risky_sgs = []
-        total_risky_rules = 0
-        
-        for sg in sg_response['SecurityGroups']:
-            risky_rules = []
-            for rule in sg.get('IpPermissions', []):
-                for ip_range in rule.get('IpRanges', []):
-                    if ip_range.get('CidrIp') == '0.0.0.0/0':
-                        port = rule.get('FromPort', 'all')
-                        risky_rules.append({
-                            "port": port,
-                            "protocol": rule.get('IpProtocol', 'all'),
-                            "source": "0.0.0.0/0",
-                            "risk_level": "high" if port in [22, 3389, 3306, 5432] else "medium",
-                            "description": f"포트 {port} 전체 오픈"
-                        })
-            
-            if risky_rules:
-                risky_sgs.append({
-                    "id": sg['GroupId'],
-                    "name": sg['GroupName'],
-                    "vpc": sg.get('VpcId', 'N/A'),
-                    "risky_rules": risky_rules
-                })
-                total_risky_rules += len(risky_rules)
-        
-        report_data['security_groups'] = {
-            "total": len(sg_response['SecurityGroups']),
-            "risky": total_risky_rules,
-            "details": risky_sgs[:5]  # 처음 5개만 표시
-        }
-        print(f"[DEBUG] ✅ 보안 그룹 수집 완료: {len(sg_response['SecurityGroups'])}개 (위험 규칙: {total_risky_rules}개)", flush=True)
-    except Exception as e:
-        print(f"[ERROR] ❌ 보안 그룹 수집 실패: {e}", flush=True)
-        report_data['security_groups'] = {"total": 0, "risky": 0, "details": []}
+    Returns:
+        list: 기간 순서대로 정렬된 Raw 보안 데이터 목록
+    """
+    from concurrent.futures import ThreadPoolExecutor
     
-    # 7. 암호화 상태 수집
-    print(f"[DEBUG] 📦 암호화 상태 수집 중...", flush=True)
-    try:
-        volumes_response = ec2.describe_volumes()
-        volumes = volumes_response['Volumes']
-        encrypted_volumes = [v for v in volumes if v.get('Encrypted', False)]
-        unencrypted_volumes = [v['VolumeId'] for v in volumes if not v.get('Encrypted', False)]
-        
-        # S3, RDS 요약 정보 가져오기 (새 구조 반영)
-        s3_total = report_data['resources']['s3']['summary']['total']
-        s3_encrypted = report_data['resources']['s3']['summary']['encrypted']
-        rds_total = report_data['resources']['rds']['summary']['total']
-        
-        # RDS 암호화 상태 계산
-        rds_instances = report_data['resources']['rds'].get('instances', [])
-        rds_encrypted = sum(1 for instance in rds_instances if instance.get('StorageEncrypted', False))
-        rds_encrypted_rate = rds_encrypted / rds_total if rds_total > 0 else 0.0
-        
-        report_data['encryption'] = {
-            "ebs": {
-                "total": len(volumes),
-                "encrypted": len(encrypted_volumes),
-                "unencrypted_volumes": unencrypted_volumes[:16]  # 처음 16개만
-            },
-            "s3": {
-                "total": s3_total,
-                "encrypted": s3_encrypted,
-                "encrypted_rate": s3_encrypted / s3_total if s3_total > 0 else 0.0
-            },
-            "rds": {
-                "total": rds_total,
-                "encrypted": rds_encrypted,
-                "encrypted_rate": rds_encrypted_rate
-            }
-        }
-        print(f"[DEBUG] ✅ 암호화 수집 완료: EBS {len(encrypted_volumes)}/{len(volumes)} 암호화됨", flush=True)
-    except Exception as e:
-        print(f"[ERROR] ❌ 암호화 상태 수집 실패: {e}", flush=True)
-        report_data['encryption'] = {"ebs": {"total": 0, "encrypted": 0, "unencrypted_volumes": []}, "s3": {"total": 0, "encrypted": 0, "encrypted_rate": 0.0}, "rds": {"total": 0, "encrypted": 0, "encrypted_rate": 0.0}}
+    if not periods:
+        return []
     
-    # 8. Trusted Advisor 수집 (가장 중요!)
-    print(f"[DEBUG] 🔍 Trusted Advisor 수집 중... (이게 핵심!)", flush=True)
-    try:
-        # TA 체크 목록 가져오기
-        ta_checks_response = support.describe_trusted_advisor_checks(language='en')
-        checks = ta_checks_response['checks']
-        print(f"[DEBUG] TA 전체 체크 개수: {len(checks)}개", flush=True)
-        
-        ta_results = []
-        for check in checks:
-            check_id = check['id']
-            check_name = check['name']
-            check_category = check['category']
-            
-            try:
-                # 각 체크 결과 가져오기
-                result_response = support.describe_trusted_advisor_check_result(checkId=check_id, language='en')
-                result = result_response['result']
-                
-                status = result['status']
-                flagged_resources = len(result.get('flaggedResources', []))
-                
-                # 문제가 있는 체크만 포함
-                if status in ['warning', 'error'] and flagged_resources > 0:
-                    # 한글 번역
-                    category_kr = {
-                        'security': '보안',
-                        'cost_optimizing': '비용 최적화',
-                        'performance': '성능',
-                        'fault_tolerance': '내결함성',
-                        'service_limits': '서비스 한도'
-                    }.get(check_category, check_category)
-                    
-                    ta_results.append({
-                        "category": category_kr,
-                        "name": check_name,  # 영문 그대로 (한글 번역은 템플릿에서)
-                        "status": status,
-                        "flagged_resources": flagged_resources,
-                        "details": []  # 상세 정보는 생략 (개수만 표시)
-                    })
-                    print(f"[DEBUG] TA 이슈 발견: [{category_kr}] {check_name} - {flagged_resources}개", flush=True)
-            except Exception as e:
-                print(f"[DEBUG] TA 체크 {check_name} 결과 수집 실패: {e}", flush=True)
-        
-        report_data['trusted_advisor'] = {
-            "available": True,
-            "checks": ta_results
-        }
-        print(f"[DEBUG] ✅ Trusted Advisor 수집 완료: {len(ta_results)}개 이슈 발견!", flush=True)
-    except Exception as e:
-        print(f"[ERROR] ❌ Trusted Advisor 수집 실패: {e}", flush=True)
-        import traceback
-        traceback.print_exc()
-        report_data['trusted_advisor'] = {"available": False, "checks": []}
+    print(f"[DEBUG] ✅ 기간별 일괄 수집 시작: 계정 {account_id}, {len(periods)}개 기간", flush=True)
     
-    # 9. CloudTrail 이벤트 수집 (정확한 기간, UTC+9)
-    print(f"[DEBUG] 📦 CloudTrail 이벤트 수집 중 ({start_date_str} ~ {end_date_str})...", flush=True)
-    try:
-        from datetime import datetime as dt, timezone
-        
-        # UTC+9 (한국 시간) 적용
-        kst = timezone(timedelta(hours=9))
-        
-        # 시작일 00:00:00 KST → UTC 변환
-        start_time_kst = dt.strptime(start_date_str, "%Y-%m-%d").replace(hour=0, minute=0, second=0, tzinfo=kst)
-        start_time_utc = start_time_kst.astimezone(timezone.utc)
-        
-        # 종료일 23:59:59 KST → UTC 변환
-        end_time_kst = dt.strptime(end_date_str, "%Y-%m-%d").replace(hour=23, minute=59, second=59, tzinfo=kst)
-        end_time_utc = end_time_kst.astimezone(timezone.utc)
-        
-        print(f"[DEBUG] CloudTrail 조회 기간 (UTC): {start_time_utc} ~ {end_time_utc}", flush=True)
-        
-        # 보안 관점에서 중요한 이벤트 목록 (우선순위 순)
-        critical_events = {
-            # 🔴 Critical - 데이터 손실 및 서비스 중단
-            'DeleteBucket': {'severity': 'critical', 'category': 'data_loss', 'description': 'S3 버킷 삭제'},
-            'DeleteDBInstance': {'severity': 'critical', 'category': 'data_loss', 'description': 'RDS 인스턴스 삭제'},
-            'TerminateInstances': {'severity': 'critical', 'category': 'service_disruption', 'description': 'EC2 인스턴스 종료'},
-            'DeleteUser': {'severity': 'critical', 'category': 'account_security', 'description': 'IAM 사용자 삭제'},
-            'DeleteAccessKey': {'severity': 'critical', 'category': 'account_security', 'description': 'IAM 액세스 키 삭제'},
-            
-            # 🟡 High - 보안 설정 변경
-            'PutBucketPolicy': {'severity': 'high', 'category': 'permission_change', 'description': 'S3 버킷 정책 변경'},
-            'AuthorizeSecurityGroupIngress': {'severity': 'high', 'category': 'network_security', 'description': '보안 그룹 인바운드 규칙 추가'},
-            'CreateAccessKey': {'severity': 'high', 'category': 'account_security', 'description': '새 액세스 키 생성'},
-            'PutUserPolicy': {'severity': 'high', 'category': 'permission_change', 'description': 'IAM 사용자 정책 변경'},
-            'AttachUserPolicy': {'severity': 'high', 'category': 'permission_change', 'description': 'IAM 사용자 정책 연결'},
-        }
-        
-        # 각 중요 이벤트별로 수집
-        critical_events_data = {}
-        total_collected = 0
-        
-        for event_name, event_info in critical_events.items():
-            print(f"[DEBUG] 🔍 {event_name} 이벤트 조회 중...", flush=True)
-            
-            try:
-                # 해당 이벤트만 조회 (최대 50개)
-                events_response = cloudtrail.lookup_events(
-                    StartTime=start_time_utc,
-                    EndTime=end_time_utc,
-                    LookupAttributes=[
-                        {'AttributeKey': 'EventName', 'AttributeValue': event_name}
-                    ],
-                    MaxResults=50
-                )
-                
-                events = events_response.get('Events', [])
-                
-                if events:
-                    critical_events_data[event_name] = {
-                        'severity': event_info['severity'],
-                        'category': event_info['category'],
-                        'description': event_info['description'],
-                        'count': len(events),
-                        'events': events  # Raw 이벤트 데이터
-                    }
-                    total_collected += len(events)
-                    print(f"[DEBUG] ✅ {event_name}: {len(events)}개 발견", flush=True)
-                else:
-                    # 이벤트가 없어도 기록 (0건)
-                    critical_events_data[event_name] = {
-                        'severity': event_info['severity'],
-                        'category': event_info['category'],
-                        'description': event_info['description'],
-                        'count': 0,
-                        'events': []
-                    }
-                    
-            except Exception as e:
-                print(f"[DEBUG] ⚠️ {event_name} 조회 실패: {e}", flush=True)
-                critical_events_data[event_name] = {
-                    'severity': event_info['severity'],
-                    'category': event_info['category'],
-                    'description': event_info['description'],
-                    'count': 0,
-                    'events': [],
-                    'error': str(e)
-                }
-        
-        period_days = (end_time_kst - start_time_kst).days + 1
-        
-        report_data['cloudtrail_events'] = {
-            "summary": {
-                "period_days": period_days,
-                "total_critical_events": total_collected,
-                "monitored_event_types": len(critical_events)
-            },
-            "critical_events": critical_events_data  # 이벤트 타입별로 구조화된 데이터
-        }
-        print(f"[DEBUG] ✅ CloudTrail 중요 이벤트 수집 완료: {total_collected}개 ({period_days}일간)", flush=True)
-    except Exception as e:
-        print(f"[ERROR] ❌ CloudTrail 수집 실패: {e}", flush=True)
-        import traceback
-        traceback.print_exc()
-        report_data['cloudtrail_events'] = {"summary": {"period_days": 30, "total_critical_events": 0, "monitored_event_types": 0}, "critical_events": {}}
+    credentials = credentials or {}
+    client_credentials = {
+        'AWS_ACCESS_KEY_ID': credentials.get('AWS_ACCESS_KEY_ID', os.environ.get('AWS_ACCESS_KEY_ID')),
+        'AWS_SECRET_ACCESS_KEY': credentials.get('AWS_SECRET_ACCESS_KEY', os.environ.get('AWS_SECRET_ACCESS_KEY')),
+        'AWS_SESSION_TOKEN': credentials.get('AWS_SESSION_TOKEN', os.environ.get('AWS_SESSION_TOKEN')),
+        'AWS_CREDENTIAL_EXPIRATION': credentials.get('AWS_CREDENTIAL_EXPIRATION')
+    }
     
-    # 10. CloudWatch 알람 수집 (Raw 데이터 저장)
-    print(f"[DEBUG] 📦 CloudWatch 알람 수집 중...", flush=True)
+    # 멀티 리전이면 기간별 CloudTrail도 같은 리전에서 수집 후 병합 (리전 목록은 한 번만 결정)
+    latest_start, latest_end = periods[-1]
     try:
-        alarms_response = cloudwatch.describe_alarms()
-        alarms_raw = alarms_response['MetricAlarms']
-        
-        # 요약 정보 계산
-        total = len(alarms_raw)
-        in_alarm = sum(1 for a in alarms_raw if a['StateValue'] == 'ALARM')
-        ok = sum(1 for a in alarms_raw if a['StateValue'] == 'OK')
-        insufficient_data = sum(1 for a in alarms_raw if a['StateValue'] == 'INSUFFICIENT_DATA')
-        
-        report_data['cloudwatch'] = {
-            "summary": {
-                "total": total,
-                "in_alarm": in_alarm,
-                "ok": ok,
-                "insufficient_data": insufficient_data
-            },
-            "alarms": alarms_raw  # Raw 데이터 (AlarmName, StateValue, MetricName, Threshold 등 모든 필드)
-        }
-        print(f"[DEBUG] ✅ CloudWatch 수집 완료: {total}개 알람 (ALARM: {in_alarm}, OK: {ok})", flush=True)
+        other_regions = resolve_report_regions(
+            CollectorContext(account_id, latest_start, latest_end, region, client_credentials), regions
+        )
     except Exception as e:
-        print(f"[ERROR] ❌ CloudWatch 수집 실패: {e}", flush=True)
-        report_data['cloudwatch'] = {"summary": {"total": 0, "in_alarm": 0, "ok": 0, "insufficient_data": 0}, "alarms": []}
-    
-    # 11. 권장사항 생성
-    print(f"[DEBUG] 📝 권장사항 생성 중...", flush=True)
-    recommendations = []
-    
-    # MFA 권장사항
-    if report_data['iam_security']['users']['mfa_enabled'] < report_data['iam_security']['users']['total']:
-        recommendations.append({
-            "priority": "critical",
-            "category": "security",
-            "title": "모든 IAM 사용자에 MFA 설정 필요",
-            "description": f"{report_data['iam_security']['users']['total'] - report_data['iam_security']['users']['mfa_enabled']}명의 IAM 사용자가 MFA를 설정하지 않았습니다.",
-            "affected_resources": [u['username'] for u in report_data['iam_security']['users']['details'] if not u['mfa']],
-            "action": "모든 IAM 사용자에 대해 MFA를 활성화하고 정기적으로 검토하세요."
-        })
-    
-    # 보안 그룹 권장사항
-    if report_data['security_groups']['risky'] > 0:
-        recommendations.append({
-            "priority": "critical",
-            "category": "security",
-            "title": "보안 그룹 규칙 강화 필요",
-            "description": f"{report_data['security_groups']['risky']}개의 위험한 보안 그룹 규칙이 발견되었습니다.",
-            "affected_resources": [sg['id'] for sg in report_data['security_groups']['details']],
-            "action": "보안 그룹 규칙을 검토하고 필요한 IP 범위로만 제한하세요."
-        })
-    
-    # EBS 암호화 권장사항
-    if report_data['encryption']['ebs']['total'] > 0 and report_data['encryption']['ebs']['encrypted'] < report_data['encryption']['ebs']['total']:
-        recommendations.append({
-            "priority": "high",
-            "category": "security",
-            "title": "EBS 볼륨 암호화 활성화",
-            "description": f"{report_data['encryption']['ebs']['total'] - report_data['encryption']['ebs']['encrypted']}개의 EBS 볼륨이 암호화되지 않았습니다.",
-            "affected_resources": report_data['encryption']['ebs']['unencrypted_volumes'][:5],
-            "action": "새로운 EBS 볼륨에 대해 기본 암호화를 활성화하고 기존 볼륨을 암호화된 볼륨으로 마이그레이션하세요."
-        })
-    
-    # S3 암호화 권장사항 (새 구조 반영)
-    s3_total = report_data['resources']['s3']['summary']['total']
-    s3_encrypted = report_data['resources']['s3']['summary']['encrypted']
-    if s3_total > 0 and s3_encrypted < s3_total:
-        # 암호화되지 않은 버킷 찾기
-        unencrypted_buckets = [b['Name'] for b in report_data['resources']['s3']['buckets'] if b.get('Encryption') is None]
-        recommendations.append({
-            "priority": "high",
-            "category": "security",
-            "title": "S3 버킷 암호화 설정",
-            "description": f"{s3_total - s3_encrypted}개의 S3 버킷이 암호화되지 않았습니다.",
-            "affected_resources": unencrypted_buckets[:5],
-            "action": "모든 S3 버킷에 대해 서버 측 암호화(SSE)를 활성화하세요."
-        })
-    
-    report_data['recommendations'] = recommendations
-    print(f"[DEBUG] ✅ 권장사항 생성 완료: {len(recommendations)}개", flush=True)
-    
-    print(f"[DEBUG] 🎉 boto3 데이터 수집 완료! 정확한 데이터를 수집했습니다.", flush=True)
+        print(f"[ERROR] ❌ 리전 목록 조회 실패, 단일 리전으로 수집: {e}", flush=True)
+        other_regions = []
+    
+    def collect_period_cloudtrail(start_date_str, end_date_str):
+        values_by_region = {
+            r: collect_cloudtrail_events(
+                get_client('cloudtrail', r, client_credentials), start_date_str, end_date_str, account_id=account_id
+            )
+            for r in [region] + other_regions
+        }
+        if not other_regions:
+            return values_by_region[region]
+        return SECTION_COLLECTORS['cloudtrail'].merge(values_by_region)
+    
+    # 가장 최근 기간은 전체 수집 (인벤토리 포함), 나머지 기간은 CloudTrail만 수집
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        full_future = executor.submit(
+            collect_raw_security_data, account_id, latest_start, latest_end, region, credentials,
+            regions=other_regions
+        )
+        cloudtrail_futures = [
+            executor.submit(collect_period_cloudtrail, start_date_str, end_date_str)
+            for start_date_str, end_date_str in periods[:-1]
+        ]
+        latest_data = full_future.result()
+        cloudtrail_sections = [f.result() for f in cloudtrail_futures]
+    
+    # 인벤토리 섹션을 공유하여 기간별 보고서 데이터 구성
+    reports = []
+    for (start_date_str, end_date_str), cloudtrail_section in zip(periods[:-1], cloudtrail_sections):
+        period_data = dict(latest_data)
+        period_data['metadata'] = dict(latest_data['metadata'], period_start=start_date_str, period_end=end_date_str)
+        period_data['cloudtrail_events'] = cloudtrail_section
+        reports.append(period_data)
+    reports.append(latest_data)
+    
+    print(f"[DEBUG] 🎉 기간별 일괄 수집 완료: {len(reports)}개 기간 (인벤토리 1회 수집)", flush=True)
+    return reports
+
+def generate_trend_report(account_id, period_reports, html_paths=None):
+    """
+    기간별 보고서 데이터를 비교하는 추이(트렌드) HTML 보고서 생성
     
-    # datetime 객체를 JSON 직렬화 가능한 형식으로 변환
-    print(f"[DEBUG] 📝 datetime 객체 변환 중...", flush=True)
-    report_data = convert_datetime_to_json_serializable(report_data)
-    print(f"[DEBUG] ✅ datetime 변환 완료", flush=True)
+    Args:
+        account_id (str): AWS 계정 ID
+        period_reports (list): collect_raw_security_data_for_periods 결과
+        html_paths (list): 기간별 HTML 보고서 경로 (링크용, 선택적)
     
-    return report_data
+    Returns:
+        str: 생성된 HTML 파일 경로 또는 None
+    """
+    try:
+        html_paths = html_paths or [None] * len(period_reports)
+        
+        # 이벤트 타입 목록 (첫 보고서 기준, 순서 유지)
+        event_names = []
+        for report in period_reports:
+            for event_name in report.get('cloudtrail_events', {}).get('critical_events', {}):
+                if event_name not in event_names:
+                    event_names.append(event_name)
+        
+        header_cells = ''.join(f"<th>{name}</th>" for name in event_names)
+        rows = []
+        for report, html_path in zip(period_reports, html_paths):
+            metadata = report.get('metadata', {})
+            period_label = metadata.get('period_start', '')[:7]
+            if html_path:
+                period_label = f'<a href="{os.path.basename(html_path)}">{period_label}</a>'
+            ct_data = report.get('cloudtrail_events', {})
+            critical_events = ct_data.get('critical_events', {})
+            event_cells = ''.join(
+                f"<td>{critical_events.get(name, {}).get('count', 0)}</td>" for name in event_names
+            )
+            total = ct_data.get('summary', {}).get('total_critical_events', 0)
+            rows.append(f"<tr><td>{period_label}</td><td><strong>{total}</strong></td>{event_cells}</tr>")
+        
+        # 시점 기준 인벤토리 (모든 기간에 공통)
+        latest = period_reports[-1] if period_reports else {}
+        resources = latest.get('resources', {})
+        iam_users = latest.get('iam_security', {}).get('users', {})
+        inventory_rows = ''.join([
+            f"<tr><td>EC2 인스턴스</td><td>{resources.get('ec2', {}).get('summary', {}).get('total', 0)}</td></tr>",
+            f"<tr><td>S3 버킷</td><td>{resources.get('s3', {}).get('summary', {}).get('total', 0)}</td></tr>",
+            f"<tr><td>RDS 인스턴스</td><td>{resources.get('rds', {}).get('summary', {}).get('total', 0)}</td></tr>",
+            f"<tr><td>Lambda 함수</td><td>{resources.get('lambda', {}).get('summary', {}).get('total', 0)}</td></tr>",
+            f"<tr><td>IAM 사용자 (MFA)</td><td>{iam_users.get('total', 0)} ({iam_users.get('mfa_enabled', 0)})</td></tr>",
+            f"<tr><td>위험 보안 그룹 규칙</td><td>{latest.get('security_groups', {}).get('risky', 0)}</td></tr>",
+            f"<tr><td>Trusted Advisor 이슈</td><td>{len(latest.get('trusted_advisor', {}).get('checks', []))}</td></tr>",
+        ])
+        
+        first_period = period_reports[0].get('metadata', {}).get('period_start', '') if period_reports else ''
+        last_period = latest.get('metadata', {}).get('period_end', '')
+        
+        html_content = f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<title>AWS 보안 추이 보고서 - {account_id}</title>
+<style>
+body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; margin: 24px; color: #232f3e; }}
+table {{ border-collapse: collapse; margin-bottom: 24px; }}
+th, td {{ border: 1px solid #d5dbdb; padding: 6px 10px; text-align: center; }}
+th {{ background: #f2f3f3; }}
+</style>
+</head>
+<body>
+<h1>📈 AWS 보안 추이 보고서</h1>
+<p><strong>계정 ID</strong>: {account_id} &nbsp; <strong>분석 기간</strong>: {first_period} ~ {last_period}</p>
+<h2>월별 CloudTrail 중요 이벤트</h2>
+<table>
+<tr><th>기간</th><th>합계</th>{header_cells}</tr>
+{''.join(rows)}
+</table>
+<h2>현재 리소스 현황 (시점 기준)</h2>
+<table>
+<tr><th>항목</th><th>값</th></tr>
+{inventory_rows}
+</table>
+</body>
+</html>
+"""
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        html_file_path = os.path.join('/tmp/reports', f"security_trend_{account_id}_{timestamp}.html")
+        os.makedirs('/tmp/reports', exist_ok=True)
+        with open(html_file_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+
+        print(f"[DEBUG] ✅ 추이 보고서 생성 완료: {html_file_path}", flush=True)
+        return html_file_path
+
+    except Exception as e:
+        print(f"[ERROR] ❌ 추이 보고서 생성 실패: {str(e)}", flush=True)
+        traceback.print_exc()
+        return None
 
 def generate_html_report(json_file_path):
     """
@@ -609,8 +294,7 @@ def generate_html_report(json_file_path):
     Reference 코드에서 복사한 함수 (Flask 의존성 제거)
     """
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_report(json_file_path)
 
         # HTML 템플릿 읽기
         template_path = os.path.join(os.path.dirname(__file__), '..', 'reference_templates', 'json_report_template.html')
@@ -765,7 +449,8 @@ def generate_html_report(json_file_path):
         
         # HTML 파일 저장
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        html_filename = f"security_report_{metadata.get('account_id', 'unknown')}_{timestamp}.html"
+        period_month = metadata.get('period_start', '')[:7].replace('-', '')
+        html_filename = f"security_report_{metadata.get('account_id', 'unknown')}_{period_month}_{timestamp}.html"
         html_file_path = os.path.join('/tmp/reports', html_filename)
         
         os.makedirs('/tmp/reports', exist_ok=True)
@@ -1422,9 +1107,8 @@ def analyze_security_data_with_qcli(json_file_path, credentials=None):
     try:
         print(f"[DEBUG] 📊 Q CLI로 보안 데이터 분석 시작: {json_file_path}", flush=True)
         
-        # 기존 JSON 데이터 로드
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # 기존 Raw 데이터 로드
+        data = load_report(json_file_path)
         
         # 월간 보고서 컨텍스트 파일 경로
         context_file = '/root/core_contexts/security_report.md'
@@ -1595,8 +1279,7 @@ def analyze_security_data_with_qcli(json_file_path, credentials=None):
             }
         
         # 분석된 데이터를 다시 파일에 저장
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_report(data, json_file_path)
         
         print(f"[DEBUG] ✅ Q CLI 분석 완료 및 저장", flush=True)
         return data
@@ -1678,14 +1361,13 @@ def generate_security_report(account_id, start_date_str, end_date_str, region='a
         
         # 2. JSON 파일 저장
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        json_filename = f"security_data_{account_id}_{timestamp}.json"
+        json_filename = f"security_data_{account_id}_{timestamp}{REPORT_FILE_SUFFIX}"
         
         # /tmp/reports 디렉터리 생성
         os.makedirs('/tmp/reports', exist_ok=True)
         json_file_path = os.path.join('/tmp/reports', json_filename)
         
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(raw_data, f, indent=2, ensure_ascii=False)
+        save_report(raw_data, json_file_path)
         
         print(f"[DEBUG] ✅ Raw 데이터 저장 완료: {json_file_path}", flush=True)
         
@@ -1701,8 +1383,7 @@ def generate_security_report(account_id, start_date_str, end_date_str, region='a
         normalized_data = normalize_security_report_json(analyzed_data)
         
         # 정규화된 데이터 다시 저장
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(normalized_data, f, indent=2, ensure_ascii=False)
+        save_report(normalized_data, json_file_path)
         
         # 5. HTML 보고서 생성
         print(f"[DEBUG] 4️⃣ HTML 보고서 생성 중...", flush=True)
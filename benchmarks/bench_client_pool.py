@@ -0,0 +1,93 @@
+"""
+보고서 1건당 boto3 클라이언트 준비 시간 측정
+변경 전(보고서마다 boto3.Session 생성)과 클라이언트 풀(새 자격증명 / 같은 자격증명)을 비교
+클라이언트 생성만 측정하므로 네트워크 호출 없음 (가짜 자격증명 사용)
+
+실행: python -m benchmarks.bench_client_pool --reports 20
+"""
+import time
+import argparse
+import statistics
+
+import boto3
+
+from aws_tools import client_pool
+from aws_tools.client_pool import get_client
+
+REGION = 'ap-northeast-2'
+
+# 보안 보고서 수집에 쓰는 서비스 (support는 us-east-1)
+REPORT_CLIENTS = (
+    ('ec2', REGION),
+    ('s3', REGION),
+    ('iam', REGION),
+    ('support', 'us-east-1'),
+    ('cloudtrail', REGION),
+    ('cloudwatch', REGION),
+    ('lambda', REGION),
+    ('rds', REGION),
+)
+
+
+def _credentials(index):
+    """보고서별 가짜 임시 자격증명"""
+    return {
+        'AWS_ACCESS_KEY_ID': f'ASIABENCH{index:08d}',
+        'AWS_SECRET_ACCESS_KEY': 'secret',
+        'AWS_SESSION_TOKEN': 'token',
+    }
+
+
+def setup_with_session(credentials):
+    """변경 전: 보고서마다 boto3.Session을 만들고 서비스별 클라이언트 생성"""
+    session = boto3.Session(
+        aws_access_key_id=credentials['AWS_ACCESS_KEY_ID'],
+        aws_secret_access_key=credentials['AWS_SECRET_ACCESS_KEY'],
+        aws_session_token=credentials['AWS_SESSION_TOKEN'],
+        region_name=REGION
+    )
+    return [session.client(service, region_name=region) for service, region in REPORT_CLIENTS]
+
+
+def setup_with_pool(credentials):
+    """변경 후: 풀에서 서비스별 클라이언트 가져오기"""
+    return [get_client(service, region, credentials) for service, region in REPORT_CLIENTS]
+
+
+def _measure(setup, credentials_for, reports):
+    """보고서 reports건의 클라이언트 준비 시간 목록 (ms)"""
+    timings = []
+    for index in range(reports):
+        credentials = credentials_for(index)
+        started = time.perf_counter()
+        setup(credentials)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _summary(timings):
+    return (f"중앙값 {statistics.median(timings):8.2f}ms, 평균 {statistics.mean(timings):8.2f}ms, "
+            f"최대 {max(timings):8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보고서당 boto3 클라이언트 준비 시간 비교")
+    parser.add_argument('--reports', type=int, default=20, help="보고서 수")
+    args = parser.parse_args()
+
+    print(f"보고서 {args.reports}건, 보고서당 클라이언트 {len(REPORT_CLIENTS)}개")
+
+    before = _measure(setup_with_session, _credentials, args.reports)
+    print(f"보고서마다 boto3.Session      : {_summary(before)}")
+
+    client_pool._pool.clear()
+    cold = _measure(setup_with_pool, _credentials, args.reports)
+    print(f"풀, 보고서마다 새 자격증명    : {_summary(cold)}")
+
+    warm = _measure(setup_with_pool, lambda index: _credentials(0), args.reports)
+    print(f"풀, 같은 자격증명 (재사용)    : {_summary(warm)}")
+    print(f"풀 통계: {client_pool.get_pool_stats()}")
+
+
+if __name__ == "__main__":
+    main()
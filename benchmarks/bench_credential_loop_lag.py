@@ -0,0 +1,94 @@
+"""
+자격증명 발급 이벤트 루프 지연 측정
+캐시에 없는 계정 N개를 동시에 인증할 때 이벤트 루프 지연(lag)을 동기 경로와 비동기 경로로 비교
+SSM/STS 호출(_assume_crossaccount_role)은 지정한 시간만큼 블로킹하는 스텁으로 대체
+
+실행: python -m benchmarks.bench_credential_loop_lag --accounts 10 --stub-seconds 0.5
+"""
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from aws_tools import auth
+
+# 루프 지연 측정 주기 (초)
+PROBE_INTERVAL = 0.01
+
+
+def _stub_assume_role(stub_seconds):
+    """지정한 시간 동안 블로킹 후 1시간짜리 가짜 자격증명을 반환하는 SSM/STS 스텁"""
+    def assume(account_id, flight=None):
+        time.sleep(stub_seconds)
+        return {
+            'AWS_ACCESS_KEY_ID': f'AKIA{account_id}',
+            'AWS_SECRET_ACCESS_KEY': 'secret',
+            'AWS_SESSION_TOKEN': 'token',
+            'AWS_CREDENTIAL_EXPIRATION': (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+        }
+    return assume
+
+
+async def _probe_loop_lag(stop, samples):
+    """PROBE_INTERVAL마다 깨어나 예정 시각보다 늦은 시간(ms)을 기록"""
+    while not stop.is_set():
+        expected = time.perf_counter() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append(max(0.0, (time.perf_counter() - expected) * 1000))
+
+
+async def _authenticate_sync(account_id):
+    """변경 전 경로: 코루틴 안에서 동기 발급 함수를 직접 호출"""
+    return auth.get_crossaccount_session(account_id)
+
+
+async def _authenticate_async(account_id):
+    """변경 후 경로: 비동기 발급 (전용 스레드 풀)"""
+    return await auth.get_crossaccount_session_async(account_id)
+
+
+async def _run(mode, accounts):
+    """콜드 계정 동시 인증 1회 실행 후 (소요 시간, 지연 샘플, 성공 수) 반환"""
+    with auth._cache_lock:
+        auth._credentials_cache.clear()
+
+    authenticate = _authenticate_sync if mode == 'sync' else _authenticate_async
+    stop = asyncio.Event()
+    samples = []
+    probe = asyncio.create_task(_probe_loop_lag(stop, samples))
+    await asyncio.sleep(PROBE_INTERVAL * 5)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(authenticate(f"{100000000000 + i}") for i in range(accounts)))
+    elapsed = time.perf_counter() - started
+
+    await asyncio.sleep(PROBE_INTERVAL * 5)
+    stop.set()
+    await probe
+    return elapsed, samples, sum(1 for r in results if r)
+
+
+def _summary(samples):
+    ordered = sorted(samples) or [0.0]
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"루프 지연 최대 {ordered[-1]:.1f}ms, p99 {p99:.1f}ms ({len(samples)}회 측정)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="콜드 계정 동시 인증 시 이벤트 루프 지연 측정")
+    parser.add_argument('--accounts', type=int, default=10, help="동시에 인증할 캐시 미스 계정 수")
+    parser.add_argument('--stub-seconds', type=float, default=0.5, help="SSM/STS 스텁 블로킹 시간 (초)")
+    args = parser.parse_args()
+
+    print(f"콜드 계정 {args.accounts}개, SSM/STS 스텁 {args.stub_seconds}초, "
+          f"발급 스레드 {auth._CREDENTIAL_EXECUTOR_WORKERS}개")
+    with mock.patch.object(auth, '_assume_crossaccount_role', _stub_assume_role(args.stub_seconds)), \
+            mock.patch('aws_tools.credential_broker.is_broker_available', return_value=False):
+        for mode in ('sync', 'async'):
+            elapsed, samples, succeeded = asyncio.run(_run(mode, args.accounts))
+            print(f"{mode:>5}: 전체 {elapsed:.2f}초, 성공 {succeeded}/{args.accounts}, {_summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
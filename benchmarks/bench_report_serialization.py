@@ -0,0 +1,192 @@
+"""
+보고서 Raw 데이터 직렬화 시간/메모리 측정
+같은 (필드 축소 전) 보고서를 같은 형식(indent=2 JSON)으로 쓰는 방식끼리 비교해 datetime 처리 방식의 차이만 측정
+- deepcopy: 변경 전 (datetime 재귀 변환 사본 + json.dump)
+- json_default: json.dump(default=json_default), 사본 없이 인코더에서 datetime 변환
+- orjson: orjson.dumps(default=json_default), report_store가 쓰는 인코더
+- save_report: report_store.save_report 전체 경로 (필드 축소 + 레코드 분할 + gzip, 형식이 달라 참고용)
+방식마다 별도 프로세스에서 실행해 최대 RSS를 따로 측정 (resource.getrusage, Linux 기준 KB)
+모듈 로딩과 보고서 생성은 측정 전에 끝냄 (aws_tools 모듈 로딩만 tracemalloc 약 17MB, RSS 약 37MB)
+
+실행: python -m benchmarks.bench_report_serialization --instances 10000
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import resource
+import subprocess
+import tempfile
+import tracemalloc
+from datetime import datetime, date, timedelta, timezone
+
+import orjson
+
+from aws_tools.report_store import save_report, load_report, REPORT_FILE_SUFFIX
+from utils.json_store import json_default
+
+MODES = ('deepcopy', 'json_default', 'orjson', 'save_report')
+
+# 같은 내용을 쓰는 방식 (출력 내용 일치 확인 대상)
+SAME_OUTPUT_MODES = ('deepcopy', 'json_default', 'orjson')
+
+
+def build_synthetic_report(instance_count):
+    """
+    EC2 인스턴스 instance_count개와 datetime 필드를 포함한 합성 보고서 생성
+    
+    Args:
+        instance_count (int): EC2 인스턴스 수
+    
+    Returns:
+        dict: collect_raw_security_data와 같은 구조의 보고서 데이터
+    """
+    launched = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    instances = [{
+        'InstanceId': f'i-{i:017x}',
+        'InstanceType': 'm5.large',
+        'State': {'Code': 16, 'Name': 'running'},
+        'LaunchTime': launched + timedelta(minutes=i),
+        'Platform': 'linux',
+        'PrivateIpAddress': f'10.0.{i // 256 % 256}.{i % 256}',
+        'PublicIpAddress': None,
+        'VpcId': 'vpc-0123456789abcdef0',
+        'SubnetId': 'subnet-0123456789abcdef0',
+        'SecurityGroups': [{'GroupId': 'sg-0123456789abcdef0', 'GroupName': 'web'}],
+        'Tags': [{'Key': 'Name', 'Value': f'host-{i}'}, {'Key': 'env', 'Value': 'prod'}],
+        'BlockDeviceMappings': [{
+            'DeviceName': '/dev/xvda',
+            'Ebs': {'AttachTime': launched, 'DeleteOnTermination': True, 'Status': 'attached', 'VolumeId': f'vol-{i:017x}'}
+        }],
+    } for i in range(instance_count)]
+    return {
+        'metadata': {'account_id': '123456789012', 'report_date': '2026-02-01', 'period_start': '2026-01-01',
+                     'period_end': '2026-01-31', 'region': 'ap-northeast-2'},
+        'resources': {
+            'ec2': {'summary': {'total': instance_count, 'running': instance_count, 'stopped': 0}, 'instances': instances},
+            's3': {'summary': {'total': 0, 'encrypted': 0, 'public': 0}, 'buckets': []},
+        },
+        'cloudtrail_events': {'summary': {'total_critical_events': 0}, 'critical_events': {}},
+        'recommendations': [],
+    }
+
+
+def convert_datetime_to_json_serializable(obj):
+    """변경 전 방식: 보고서 전체를 재귀로 복사하며 datetime을 문자열로 변환 (비교 기준)"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    elif isinstance(obj, dict):
+        return {key: convert_datetime_to_json_serializable(value) for key, value in obj.items()}
+    elif isinstance(obj, (list, tuple, set)):
+        return [convert_datetime_to_json_serializable(item) for item in obj]
+    return obj
+
+
+def serialize_deepcopy(data, directory):
+    """변경 전: 변환 사본 생성 후 json.dump(indent=2)"""
+    path = os.path.join(directory, 'security_data.json')
+    converted = convert_datetime_to_json_serializable(data)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(converted, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def serialize_json_default(data, directory):
+    """사본 없이 json.dump(indent=2, default=json_default)"""
+    path = os.path.join(directory, 'security_data.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=json_default)
+    return path
+
+
+def serialize_orjson(data, directory):
+    """사본 없이 orjson.dumps(indent=2, default=json_default), datetime은 orjson이 직접 기록"""
+    path = os.path.join(directory, 'security_data.json')
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(data, default=json_default, option=orjson.OPT_INDENT_2))
+    return path
+
+
+def serialize_save_report(data, directory):
+    """report_store.save_report (필드 축소 + 레코드 분할 + gzip 압축 JSON Lines)"""
+    return save_report(data, os.path.join(directory, f'security_data{REPORT_FILE_SUFFIX}'))
+
+
+SERIALIZERS = {
+    'deepcopy': serialize_deepcopy,
+    'json_default': serialize_json_default,
+    'orjson': serialize_orjson,
+    'save_report': serialize_save_report,
+}
+
+
+def _content_digest(path):
+    """저장된 파일을 다시 읽은 내용의 SHA-256 (형식 차이와 무관하게 내용 비교)"""
+    data = load_report(path)
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _run_child(mode, instance_count):
+    """자식 프로세스: 보고서 생성 후 직렬화 1회의 시간/메모리를 JSON으로 출력"""
+    serialize = SERIALIZERS[mode]
+    data = build_synthetic_report(instance_count)
+    base_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with tempfile.TemporaryDirectory() as directory:
+        tracemalloc.start()
+        started = time.perf_counter()
+        path = serialize(data, directory)
+        elapsed = time.perf_counter() - started
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        size = os.path.getsize(path)
+
+        # tracemalloc 부하 없이 시간만 다시 측정
+        started = time.perf_counter()
+        serialize(data, directory)
+        elapsed_untraced = time.perf_counter() - started
+
+        # 최대 RSS는 내용 비교용 재로딩 전에 기록
+        peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        digest = _content_digest(path)
+
+    print(json.dumps({
+        'seconds': elapsed_untraced,
+        'seconds_traced': elapsed,
+        'traced_peak_mb': traced_peak / 1e6,
+        'peak_rss_mb': peak_rss_kb / 1024,
+        'rss_growth_mb': (peak_rss_kb - base_rss_kb) / 1024,
+        'file_bytes': size,
+        'content_digest': digest
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보고서 직렬화 방식별 시간/최대 메모리 비교")
+    parser.add_argument('--instances', type=int, default=10000, help="합성 보고서의 EC2 인스턴스 수")
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(args.child, args.instances)
+        return
+
+    print(f"합성 보고서: EC2 인스턴스 {args.instances}개 (인스턴스당 datetime 2개)")
+    digests = {}
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_report_serialization', '--child', mode, '--instances', str(args.instances)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        digests[mode] = result['content_digest']
+        print(f"{mode:>12}: {result['seconds']:.3f}초, tracemalloc 최대 {result['traced_peak_mb']:.1f}MB, "
+              f"최대 RSS {result['peak_rss_mb']:.1f}MB (직렬화 중 증가 {result['rss_growth_mb']:.1f}MB), "
+              f"파일 {result['file_bytes'] / 1e6:.2f}MB")
+    print(f"내용 일치 ({', '.join(SAME_OUTPUT_MODES)}): {len({digests[mode] for mode in SAME_OUTPUT_MODES}) == 1}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+S3 섹션 수집 시간 측정 (버킷별 조회 직렬 vs 병렬)
+list_buckets/get_bucket_* 호출마다 지정한 시간만큼 지연하는 S3 스텁으로 collect_s3를 실행
+직렬 기준은 S3_BUCKET_WORKERS=1로 같은 코드를 실행해 측정하고 두 결과가 같은지 확인
+
+실행: python -m benchmarks.bench_s3_buckets --buckets 200 --call-ms 10
+"""
+import time
+import argparse
+from datetime import datetime, timezone
+from unittest import mock
+
+from aws_tools import report_collectors
+from aws_tools.report_collectors import CollectorContext, collect_s3
+
+# 버킷 리전 분포 (LocationConstraint 값, None = us-east-1, 'EU' = 구형 eu-west-1)
+LOCATIONS = (None, 'ap-northeast-2', 'EU', 'us-west-2')
+
+
+class StubS3:
+    """호출마다 call_seconds 지연하는 S3 클라이언트 스텁 (스레드 안전, 상태 없음)"""
+
+    def __init__(self, buckets, call_seconds):
+        self.buckets = buckets
+        self.call_seconds = call_seconds
+
+    def can_paginate(self, operation_name):
+        return False
+
+    def _wait(self):
+        time.sleep(self.call_seconds)
+
+    def _index(self, name):
+        return int(name.rsplit('-', 1)[1])
+
+    def list_buckets(self):
+        self._wait()
+        return {'Buckets': [dict(bucket) for bucket in self.buckets]}
+
+    def get_bucket_location(self, Bucket):
+        self._wait()
+        return {'LocationConstraint': LOCATIONS[self._index(Bucket) % len(LOCATIONS)]}
+
+    def get_bucket_encryption(self, Bucket):
+        self._wait()
+        if self._index(Bucket) % 3 == 0:
+            raise RuntimeError('ServerSideEncryptionConfigurationNotFoundError')
+        return {'ServerSideEncryptionConfiguration': {'Rules': [{'ApplyServerSideEncryptionByDefault': {'SSEAlgorithm': 'AES256'}}]}}
+
+    def get_bucket_versioning(self, Bucket):
+        self._wait()
+        return {'Status': 'Enabled'} if self._index(Bucket) % 2 else {}
+
+    def get_public_access_block(self, Bucket):
+        self._wait()
+        if self._index(Bucket) % 5 == 0:
+            raise RuntimeError('NoSuchPublicAccessBlockConfiguration')
+        return {'PublicAccessBlockConfiguration': {'BlockPublicAcls': True, 'IgnorePublicAcls': True,
+                                                   'BlockPublicPolicy': True, 'RestrictPublicBuckets': True}}
+
+
+def _run(stub, workers):
+    """S3_BUCKET_WORKERS=workers로 collect_s3 실행 후 (소요 시간, 결과) 반환"""
+    ctx = CollectorContext('123456789012', '2026-01-01', '2026-01-31', 'ap-northeast-2', {})
+    ctx.client = lambda service, region=None: stub
+    with mock.patch.object(report_collectors, 'S3_BUCKET_WORKERS', workers):
+        started = time.perf_counter()
+        result = collect_s3(ctx, {})
+        return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="S3 버킷 상세 조회 직렬/병렬 비교")
+    parser.add_argument('--buckets', type=int, default=200, help="버킷 수")
+    parser.add_argument('--call-ms', type=float, default=10.0, help="스텁 호출 1회 지연 (ms)")
+    args = parser.parse_args()
+
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    buckets = [{'Name': f'bench-bucket-{i}', 'CreationDate': created} for i in range(args.buckets)]
+    stub = StubS3(buckets, args.call_ms / 1000)
+
+    serial_seconds, serial_result = _run(stub, 1)
+    concurrent_seconds, concurrent_result = _run(stub, report_collectors.S3_BUCKET_WORKERS)
+
+    print(f"버킷 {args.buckets}개, 호출당 {args.call_ms:g}ms, 리전 {len(LOCATIONS)}곳")
+    print(f"직렬 (workers=1)  : {serial_seconds:.2f}초")
+    print(f"병렬 (workers={report_collectors.S3_BUCKET_WORKERS}) : {concurrent_seconds:.2f}초 "
+          f"({serial_seconds / concurrent_seconds:.1f}배)")
+    print(f"결과 일치: {serial_result == concurrent_result} (요약 {concurrent_result['summary']})")
+
+
+if __name__ == "__main__":
+    main()
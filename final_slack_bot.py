@@ -140,7 +140,22 @@ def extract_account_id(text):
     return result
 
 def get_crossaccount_session(account_id):
-    """Cross-account 세션 생성"""
+    """Cross-account 세션 생성 (호스트 자격증명 브로커 우선, 브로커가 없으면 직접 생성)"""
+    try:
+        from aws_tools.credential_broker import is_broker_available, get_credentials_from_broker, BrokerUnavailableError
+    except ImportError:
+        return _create_crossaccount_session(account_id)
+
+    if is_broker_available():
+        try:
+            print(f"[DEBUG] 자격증명 브로커에서 계정 {account_id} 자격증명 조회", flush=True)
+            return get_credentials_from_broker(account_id)
+        except BrokerUnavailableError as e:
+            print(f"[DEBUG] 자격증명 브로커 사용 불가, 직접 생성: {e}", flush=True)
+    return _create_crossaccount_session(account_id)
+
+def _create_crossaccount_session(account_id):
+    """Cross-account 세션 직접 생성 (브로커 미사용 시)"""
     try:
         print(f"[DEBUG] 계정 {account_id}에 대한 cross-account 세션 생성 시도", flush=True)
         access_key, secret_key = get_crossaccount_credentials()
@@ -796,17 +811,11 @@ def process_question_async(channel, question, question_key):
                 # ========================================
                 # 계정 검증 (실행 전)
                 # ========================================
-                verify_cmd = ['aws', 'sts', 'get-caller-identity', '--query', 'Account', '--output', 'text']
-                verify_result = subprocess.run(
-                    verify_cmd,
-                    capture_output=True,
-                    text=True,
-                    env=env_vars,
-                    timeout=10
-                )
+                # 풀 STS 클라이언트로 프로세스 내에서 검증 (액세스 키별로 만료 시까지 결과 재사용)
+                from aws_tools.auth import verify_account_identity
+                actual_account, verify_error = verify_account_identity(account_id, credentials)
 
-                if verify_result.returncode == 0:
-                    actual_account = verify_result.stdout.strip()
+                if verify_error is None:
                     print(f"[DEBUG] 계정 검증 - 요청: {account_id}, 실제: {actual_account}", flush=True)
 
                     if actual_account != account_id:
@@ -816,8 +825,8 @@ def process_question_async(channel, question, question_key):
                     else:
                         print(f"[DEBUG] ✅ 계정 검증 성공: {actual_account}", flush=True)
                 else:
-                    print(f"[ERROR] 계정 검증 실패: {verify_result.stderr}", flush=True)
-                    send_message(channel, f"❌ 계정 검증 실패: {verify_result.stderr[:200]}")
+                    print(f"[ERROR] 계정 검증 실패: {verify_error}", flush=True)
+                    send_message(channel, f"❌ 계정 검증 실패: {verify_error[:200]}")
                     return
 
                 account_prefix = f"🏢 계정 {account_id} 결과:\n\n"
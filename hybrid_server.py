@@ -6,11 +6,18 @@ ALB 호환성을 위한 HTTP + WebSocket 서버
 import os
 import json
 import asyncio
-import threading
 import ssl
 from aiohttp import web, WSMsgType
 from datetime import datetime
-from langgraph_agent import process_question_workflow
+from langgraph_agent import MAX_RESUME_ATTEMPTS
+from job_manager import JobManager
+from aws_tools.auth import get_auth_stats
+from aws_tools.client_pool import get_pool_stats
+from aws_tools.credential_broker import is_broker_available, request_broker, BrokerUnavailableError
+from aws_tools.prewarm import select_prewarm_accounts, prewarm_account
+from utils.checkpoint_store import list_interrupted_checkpoints, mark_resume_attempt, cleanup_finished_checkpoints
+from utils.snapshot_store import cleanup_old_snapshots
+from utils.job_scheduler import LaneScheduler, LONG_LANE
 
 
 class HybridServer:
@@ -22,7 +29,12 @@ class HybridServer:
         self.use_ssl = use_ssl
         self.app = web.Application()
         self.connected_clients = {}
-        self.processing_questions = set()
+        
+        # 레인별 작업 스케줄러 (빠른 질문과 장시간 작업 분리)
+        self.scheduler = LaneScheduler()
+        
+        # 작업 관리자 (작업 ID, 상태, 진행 이력, 구독자)
+        self.jobs = JobManager(self.scheduler)
         
         # 라우트 설정
         self.setup_routes()
@@ -34,6 +46,14 @@ class HybridServer:
         self.app.router.add_get('/health', self.health_check)
         self.app.router.add_get('/ws', self.websocket_handler)
         
+        # 작업 API (생성, 상태 조회, 취소)
+        self.app.router.add_post('/jobs', self.create_job)
+        self.app.router.add_get('/jobs/{job_id}', self.get_job)
+        self.app.router.add_delete('/jobs/{job_id}', self.delete_job)
+        
+        # 인증 통계 API (캐시 적중률, STS/SSM 지연 시간 히스토그램)
+        self.app.router.add_get('/stats/auth', self.get_auth_stats)
+        
         # Static 파일 서빙 (보고서 파일들)
         self.app.router.add_static('/reports', '/tmp/reports', name='reports')
     
@@ -43,9 +63,64 @@ class HybridServer:
             "status": "healthy",
             "service": "AWS Zendesk Assistant",
             "timestamp": datetime.now().isoformat(),
-            "connected_clients": len(self.connected_clients)
+            "connected_clients": len(self.connected_clients),
+            "scheduler": self.scheduler.get_metrics(),
+            "jobs": self.jobs.get_metrics(),
+            "auth": get_auth_stats(),
+            "client_pool": get_pool_stats()
         })
     
+    async def create_job(self, request):
+        """작업 생성 (POST /jobs)"""
+        try:
+            data = await request.json()
+        except Exception:
+            return web.json_response({"error": "JSON 본문이 필요합니다"}, status=400)
+        
+        question = str(data.get("question") or data.get("message") or "").strip()
+        if not question:
+            return web.json_response({"error": "question 필드가 필요합니다"}, status=400)
+        
+        session_id = data.get("session_id") or f"rest:{request.remote}"
+        job, created = self.jobs.submit(question, session_id, client_id=session_id)
+        print(f"[DEBUG] REST 작업 {'생성' if created else '재사용'}: {job.job_id}", flush=True)
+        
+        return web.json_response(self.jobs.snapshot(job), status=202 if created else 200)
+    
+    async def get_job(self, request):
+        """작업 상태 조회 (GET /jobs/{job_id}?since=N, 순번 N부터의 진행 이력만 반환)"""
+        job = self.jobs.get(request.match_info['job_id'])
+        if job is None:
+            return web.json_response({"error": "작업을 찾을 수 없습니다"}, status=404)
+        
+        try:
+            since = max(0, int(request.query.get('since', 0)))
+        except ValueError:
+            since = 0
+        
+        return web.json_response(self.jobs.snapshot(job, since=since))
+    
+    async def get_auth_stats(self, request):
+        """인증 통계 조회 (GET /stats/auth, 자격증명 브로커가 실행 중이면 브로커 통계 포함)"""
+        stats = {"process": get_auth_stats(), "broker": None}
+        if is_broker_available():
+            try:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(None, request_broker, {"op": "stats"})
+                stats["broker"] = response.get("stats")
+            except BrokerUnavailableError as e:
+                print(f"[ERROR] 브로커 통계 조회 실패: {e}", flush=True)
+        stats["timestamp"] = datetime.now().isoformat()
+        return web.json_response(stats)
+    
+    async def delete_job(self, request):
+        """작업 취소 (DELETE /jobs/{job_id})"""
+        job = self.jobs.cancel(request.match_info['job_id'])
+        if job is None:
+            return web.json_response({"error": "작업을 찾을 수 없습니다"}, status=404)
+        
+        return web.json_response(self.jobs.snapshot(job))
+    
     async def websocket_handler(self, request):
         """WebSocket 연결 처리"""
         ws = web.WebSocketResponse()
@@ -80,6 +155,12 @@ class HybridServer:
                         elif data.get("type") == "pong":
                             # 서버 ping에 대한 클라이언트 pong 응답 - 무시
                             print(f"[DEBUG] Pong 수신: {client_id}", flush=True)
+                        elif data.get("type") in ("subscribe", "unsubscribe"):
+                            # 작업 구독/구독 해제
+                            await self.handle_subscription_message(ws, data)
+                        elif data.get("type") == "prewarm":
+                            # 티켓 컨텍스트의 계정 자격증명 예열
+                            await self.handle_prewarm_message(ws, data)
                         else:
                             # 일반 질문 메시지 처리
                             await self.handle_websocket_message(client_id, ws, msg.data)
@@ -92,9 +173,10 @@ class HybridServer:
         except Exception as e:
             print(f"[ERROR] WebSocket 처리 중 오류: {client_id} - {e}", flush=True)
         finally:
-            # 클라이언트 제거
+            # 클라이언트 제거 (진행 중인 작업은 계속 실행, 구독만 해제)
             if client_id in self.connected_clients:
                 del self.connected_clients[client_id]
+            self.jobs.unsubscribe_all(ws)
             print(f"[DEBUG] WebSocket 클라이언트 연결 해제: {client_id}", flush=True)
         
         return ws
@@ -113,34 +195,24 @@ class HybridServer:
                 question = message
                 session_id = client_id
             
-            # 중복 방지
+            # 작업 생성 후 클라이언트를 구독자로 등록 (같은 질문이 처리 중이면 기존 작업 사용, 연결이 끊겨도 작업은 계속 실행)
+            # 처리 중 메시지(대기 순번 포함)는 작업 메시지로 발행되어 첫 진행 메시지보다 먼저 전송됨
             question_key = f"{client_id}:{question}"
-            if question_key in self.processing_questions:
+            job, created = self.jobs.submit(
+                question, session_id, client_id, question_key=question_key, subscriber=ws, announce=True
+            )
+            
+            if not created:
+                self.jobs.subscribe(job.job_id, ws, since=job.progress_count)
                 print(f"[DEBUG] 중복 질문 무시: {question_key}", flush=True)
                 await ws.send_str(json.dumps({
                     "type": "error",
                     "message": "이미 처리 중인 질문입니다",
-                    "session_id": session_id
+                    "session_id": session_id,
+                    "job_id": job.job_id
                 }, ensure_ascii=False))
                 return
             
-            self.processing_questions.add(question_key)
-            
-            # 처리 중 메시지 전송
-            await ws.send_str(json.dumps({
-                "type": "processing",
-                "message": "요청을 처리하고 있습니다...",
-                "session_id": session_id
-            }, ensure_ascii=False))
-            
-            # 비동기로 질문 처리 (LangGraph 에이전트 사용)
-            thread = threading.Thread(
-                target=self._process_question_thread,
-                args=(question, session_id, client_id, ws, question_key)
-            )
-            thread.daemon = True
-            thread.start()
-            
         except Exception as e:
             print(f"[ERROR] 메시지 처리 중 오류: {e}", flush=True)
             await ws.send_str(json.dumps({
@@ -148,43 +220,70 @@ class HybridServer:
                 "message": f"오류 발생: {str(e)}"
             }, ensure_ascii=False))
     
-    def _process_question_thread(self, question: str, session_id: str, client_id: str, ws, question_key: str):
-        """질문 처리 스레드"""
-        try:
-            print(f"[DEBUG] 질문 처리 시작: {session_id} - {question}", flush=True)
+    async def handle_subscription_message(self, ws, data: dict):
+        """작업 구독/구독 해제 메시지 처리 (구독 시 현재 상태와 진행 이력을 먼저 전송)"""
+        job_id = data.get("job_id", "")
+        
+        if data.get("type") == "subscribe":
+            try:
+                since = max(0, int(data.get("since", 0)))
+            except (TypeError, ValueError):
+                since = 0
+            job = self.jobs.subscribe(job_id, ws, since=since)
+        else:
+            job = self.jobs.get(job_id) if self.jobs.unsubscribe(job_id, ws) else None
+            if job:
+                await ws.send_str(json.dumps({
+                    "type": "unsubscribed",
+                    "job_id": job_id
+                }, ensure_ascii=False))
+        
+        if job is None:
+            await ws.send_str(json.dumps({
+                "type": "error",
+                "message": "작업을 찾을 수 없습니다",
+                "job_id": job_id
+            }, ensure_ascii=False))
+    
+    async def handle_prewarm_message(self, ws, data: dict):
+        """계정 예열 메시지 처리 (백그라운드로 자격증명 발급, 응답은 기다리지 않음)"""
+        account_ids = data.get("account_ids")
+        if not isinstance(account_ids, list):
+            account_ids = []
+        selected = select_prewarm_accounts(account_ids)
+        
+        loop = asyncio.get_running_loop()
+        for account_id in selected:
+            loop.run_in_executor(None, prewarm_account, account_id)
+        
+        print(f"[DEBUG] 계정 예열 요청: {len(account_ids)}개 중 {selected} 예열 시작", flush=True)
+        await ws.send_str(json.dumps({
+            "type": "prewarm_ack",
+            "account_ids": selected
+        }, ensure_ascii=False))
+    
+    def resume_interrupted_jobs(self):
+        """재시작 전에 중단된 장시간 작업을 체크포인트에서 재개"""
+        cleanup_finished_checkpoints()
+        cleanup_old_snapshots()
+        
+        for record in list_interrupted_checkpoints():
+            job_id = record.get("job_id")
+            saved_state = record.get("state", {})
             
-            # 비동기 함수를 동기 스레드에서 실행
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            attempts = mark_resume_attempt(job_id)
+            if attempts > MAX_RESUME_ATTEMPTS:
+                print(f"[WARNING] 재개 시도 횟수 초과, 작업 건너뜀: {job_id} ({attempts}회)", flush=True)
+                continue
             
-            try:
-                # LangGraph 에이전트로 질문 처리
-                result = loop.run_until_complete(
-                    process_question_workflow(question, question_key, client_id, ws)
-                )
-                
-                print(f"[DEBUG] 질문 처리 완료: {session_id}", flush=True)
-            finally:
-                loop.close()
+            question = saved_state.get("question", "")
+            question_key = saved_state.get("question_key") or f"resumed:{job_id}"
+            client_id = saved_state.get("client_id", "")
             
-        except Exception as e:
-            print(f"[ERROR] 질문 처리 중 오류: {e}", flush=True)
-            try:
-                # 에러 메시지 전송 (새 루프에서 실행)
-                error_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(error_loop)
-                try:
-                    error_loop.run_until_complete(ws.send_str(json.dumps({
-                        "type": "error",
-                        "message": f"처리 중 오류 발생: {str(e)}",
-                        "session_id": session_id
-                    }, ensure_ascii=False)))
-                finally:
-                    error_loop.close()
-            except Exception as send_error:
-                print(f"[ERROR] 에러 메시지 전송 실패: {send_error}", flush=True)
-        finally:
-            self.processing_questions.discard(question_key)
+            print(f"[INFO] 중단된 작업 재개: {job_id} (단계: {record.get('stage')}, 시도: {attempts}회)", flush=True)
+            
+            # 같은 작업 ID로 재등록 (클라이언트는 재연결 후 job_id로 구독하거나 GET /jobs/{id}로 조회)
+            self.jobs.submit(question, job_id, client_id, question_key=question_key, job_id=job_id, lane=LONG_LANE)
     
     async def send_heartbeat(self):
         """주기적으로 클라이언트에 ping 전송"""
@@ -216,9 +315,15 @@ class HybridServer:
         """서버 시작"""
         print(f"[DEBUG] Hybrid 서버 시작: {self.host}:{self.port}", flush=True)
         
+        # 작업 구독자 전송용 이벤트 루프 등록
+        self.jobs.attach_loop(asyncio.get_running_loop())
+        
         # Heartbeat 태스크 시작
         heartbeat_task = asyncio.create_task(self.send_heartbeat())
         
+        # 중단된 작업 재개
+        self.resume_interrupted_jobs()
+        
         # SSL 설정
         ssl_context = None
         if self.use_ssl:
@@ -0,0 +1,465 @@
+"""
+작업 관리자
+질문 처리를 작업 ID 단위로 관리 (상태, 진행 이력, 결과, 구독자)
+WebSocket 연결이 끊겨도 작업은 계속 실행되며, 결과는 GET /jobs/{id} 또는 구독으로 다시 받을 수 있음
+"""
+import os
+import json
+import time
+import uuid
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple
+from langgraph_agent import process_question_workflow, analyze_question_type
+from utils.job_scheduler import LaneScheduler, lane_for_question_type
+from utils.logging_config import log_debug, log_error, log_info
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+TERMINAL_JOB_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# 진행 이력에 남기지 않는 메시지 유형 (스트리밍 조각은 streaming_complete에 전체 답변이 포함됨)
+_UNRECORDED_MESSAGE_TYPES = ('streaming_start', 'streaming_chunk', 'ping', 'pong')
+
+# 작업당 최대 진행 이력 수
+MAX_PROGRESS_HISTORY = 500
+
+# 구독자 전송 시 묶어서 보내는 메시지 유형과 최소 전송 간격 (기본 0.25초 = 작업당 초당 최대 4회)
+_BATCHED_MESSAGE_TYPES = ('progress', 'message')
+PROGRESS_MIN_INTERVAL = float(os.environ.get('JOB_PROGRESS_MIN_INTERVAL', '0.25'))
+
+# 종료된 작업 보관 시간 (초)
+JOB_RETENTION_SECONDS = 6 * 60 * 60
+
+
+class Job:
+    """작업 1건의 상태, 진행 이력, 결과, 구독자"""
+
+    def __init__(self, job_id: str, question: str, session_id: str, client_id: str, question_key: str, lane: str):
+        self.job_id = job_id
+        self.question = question
+        self.session_id = session_id
+        self.client_id = client_id
+        self.question_key = question_key
+        self.lane = lane
+        self.state = JOB_QUEUED
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.finished_monotonic = None
+        self.progress = deque(maxlen=MAX_PROGRESS_HISTORY)
+        self.progress_count = 0
+        self.result = None
+        self.error = None
+        self.cancel_requested = False
+        self.scheduled = None
+        self.subscribers = set()
+        
+        # 진행 메시지 묶음 전송 상태
+        self.pending_progress = []
+        self.last_progress_flush = 0.0
+        self.flush_scheduled = False
+        self.messages_published = 0
+        self.frames_sent = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.state in TERMINAL_JOB_STATES
+
+    def to_dict(self, since: int = 0, queue_position: int = 0) -> Dict[str, Any]:
+        """
+        작업 상태를 API 응답 형식으로 변환
+        
+        Args:
+            since: 이 순번(seq)부터의 진행 이력만 포함 (폴링 시 이미 받은 이력 생략)
+            queue_position: 대기열 순번
+        
+        Returns:
+            dict: 작업 상태
+        """
+        first_index = self.progress_count - len(self.progress)
+        progress = [
+            event for index, event in enumerate(self.progress, start=first_index)
+            if index >= since
+        ]
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "question": self.question,
+            "session_id": self.session_id,
+            "lane": self.lane,
+            "queue_position": queue_position,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": progress,
+            "progress_count": self.progress_count,
+            "messages_published": self.messages_published,
+            "frames_sent": self.frames_sent,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class JobChannel:
+    """
+    작업용 WebSocket 대체 객체 (AgentState['websocket']에 전달)
+    워크플로우가 보내는 프레임을 작업 진행 이력에 기록하고 현재 구독자에게 전달
+    """
+
+    def __init__(self, manager: 'JobManager', job: Job):
+        self.manager = manager
+        self.job = job
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self.job.cancel_requested
+
+    async def send_str(self, data: str):
+        """워크플로우에서 보낸 JSON 프레임 발행"""
+        try:
+            message = json.loads(data)
+        except (TypeError, json.JSONDecodeError):
+            message = {"type": "message", "message": str(data)}
+        self.manager.publish(self.job, message)
+
+    def publish(self, message: Dict[str, Any]):
+        """스레드에서 호출 가능한 동기 발행 (Service Screener 등)"""
+        self.manager.publish(self.job, message)
+
+
+class JobManager:
+    """작업 생성, 스케줄러 제출, 상태 조회, 취소, 구독 관리"""
+
+    def __init__(self, scheduler: LaneScheduler):
+        self.scheduler = scheduler
+        self.jobs: Dict[str, Job] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # 프레임 전송 순서를 지키기 위해 잠금 안에서 전송을 예약하므로 재진입 가능한 잠금 사용
+        self._lock = threading.RLock()
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        """구독자 WebSocket 전송에 사용할 서버 이벤트 루프 등록"""
+        self.loop = loop
+
+    def submit(
+        self,
+        question: str,
+        session_id: str,
+        client_id: str,
+        question_key: Optional[str] = None,
+        job_id: Optional[str] = None,
+        lane: Optional[str] = None,
+        subscriber=None,
+        announce: bool = False
+    ) -> Tuple[Job, bool]:
+        """
+        작업 생성 후 스케줄러에 제출 (같은 질문 키로 실행 중인 작업이 있으면 그 작업 반환)
+        
+        Args:
+            question: 사용자 질문
+            session_id: 세션 ID
+            client_id: 클라이언트 ID
+            question_key: 중복 방지용 질문 키 (기본값: session_id:question)
+            job_id: 작업 ID (재개 시 기존 ID 사용, 기본값: 새 UUID)
+            lane: 스케줄러 레인 (기본값: 질문 유형으로 결정)
+            subscriber: 작업 시작 전에 구독자로 등록할 WebSocket 연결 (첫 진행 메시지부터 수신)
+            announce: 접수 메시지(processing, 대기 순번 포함)를 작업 메시지로 발행 (작업의 첫 진행 메시지보다 항상 먼저 전송)
+        
+        Returns:
+            tuple: (작업, 새로 생성 여부)
+        """
+        question_key = question_key or f"{session_id}:{question}"
+        if lane is None:
+            question_type, _ = analyze_question_type(question)
+            lane = lane_for_question_type(question_type)
+
+        with self._lock:
+            self._purge_finished_locked()
+            for existing in self.jobs.values():
+                if existing.question_key == question_key and not existing.finished:
+                    return existing, False
+
+            job = Job(job_id or uuid.uuid4().hex, question, session_id, client_id, question_key, lane)
+            if subscriber is not None:
+                job.subscribers.add(subscriber)
+            self.jobs[job.job_id] = job
+
+            # 잠금을 유지한 채 제출하고 접수 메시지 발행 (작업 스레드의 발행은 잠금을 기다리므로 순서가 항상 같음)
+            job.scheduled = self.scheduler.submit(lane, self._run_job, args=(job,), name=job.job_id)
+            if announce:
+                self._publish_accepted_locked(job)
+
+        log_info(f"작업 등록: {job.job_id} (레인: {lane})")
+        return job, True
+
+    def _publish_accepted_locked(self, job: Job):
+        """접수 메시지 발행 (대기 중이면 대기 순번 포함, 잠금은 호출자가 보유)"""
+        queue_position = self.queue_position(job)
+        message = "요청을 처리하고 있습니다..."
+        if queue_position:
+            message = f"요청이 대기열에 등록되었습니다. (대기 순번: {queue_position})"
+        self.publish(job, {
+            "type": "processing",
+            "message": message,
+            "session_id": job.session_id,
+            "lane": job.lane,
+            "queue_position": queue_position
+        })
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업 조회"""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def queue_position(self, job: Job) -> int:
+        """대기열 순번 (실행 중이거나 종료된 작업은 0)"""
+        if job.state != JOB_QUEUED or job.scheduled is None:
+            return 0
+        return self.scheduler.queue_position(job.scheduled)
+
+    def snapshot(self, job: Job, since: int = 0) -> Dict[str, Any]:
+        """작업 상태 스냅샷 (API 응답, 구독 시 재전송용)"""
+        with self._lock:
+            return job.to_dict(since=since, queue_position=self.queue_position(job))
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        작업 취소
+        대기 중인 작업은 즉시 취소, 실행 중인 작업은 다음 단계 시작 전에 중단
+        
+        Args:
+            job_id: 작업 ID
+        
+        Returns:
+            Job: 취소 요청된 작업 (없으면 None)
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        job.cancel_requested = True
+        if job.scheduled is not None and self.scheduler.cancel(job.scheduled):
+            self._finish(job, JOB_CANCELLED)
+        else:
+            log_info(f"실행 중인 작업 취소 요청: {job_id}")
+        return job
+
+    def subscribe(self, job_id: str, ws, since: int = 0) -> Optional[Job]:
+        """
+        작업 구독 (현재 상태와 지나간 진행 이력을 먼저 전송)
+        
+        Args:
+            job_id: 작업 ID
+            ws: 구독할 WebSocket 연결
+            since: 이 순번(seq)부터의 진행 이력만 재전송
+        
+        Returns:
+            Job: 구독한 작업 (없으면 None)
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        with self._lock:
+            job.subscribers.add(ws)
+            status = {"type": "job_status", **job.to_dict(since=since, queue_position=self.queue_position(job))}
+        self._send(job, ws, json.dumps(status, ensure_ascii=False, default=str))
+        return job
+
+    def unsubscribe(self, job_id: str, ws) -> bool:
+        """작업 구독 해제"""
+        job = self.get(job_id)
+        if job is None:
+            return False
+        with self._lock:
+            job.subscribers.discard(ws)
+        return True
+
+    def unsubscribe_all(self, ws):
+        """연결 종료된 WebSocket을 모든 작업 구독자에서 제거 (작업은 계속 실행)"""
+        with self._lock:
+            for job in self.jobs.values():
+                job.subscribers.discard(ws)
+
+    def publish(self, job: Job, message: Dict[str, Any]):
+        """
+        작업 메시지를 진행 이력에 기록하고 구독자에게 전송
+        진행 메시지는 작업당 PROGRESS_MIN_INTERVAL 간격으로 묶어서 전송 (progress_batch)
+        그 외 메시지(결과, 오류, 작업 상태)는 대기 중인 진행 메시지를 먼저 보낸 뒤 즉시 전송
+        
+        Args:
+            job: 작업
+            message: 전송할 메시지 (job_id가 추가됨)
+        """
+        message = dict(message)
+        message["job_id"] = job.job_id
+        message.setdefault("timestamp", datetime.now().isoformat())
+
+        schedule_delay = None
+        with self._lock:
+            job.messages_published += 1
+            if message.get("type") not in _UNRECORDED_MESSAGE_TYPES:
+                message["seq"] = job.progress_count
+                job.progress.append(message)
+                job.progress_count += 1
+
+            if message.get("type") in _BATCHED_MESSAGE_TYPES:
+                job.pending_progress.append(message)
+                elapsed = time.monotonic() - job.last_progress_flush
+                if job.flush_scheduled:
+                    frames = []
+                elif elapsed >= PROGRESS_MIN_INTERVAL or self.loop is None:
+                    frames = self._drain_progress_locked(job)
+                else:
+                    job.flush_scheduled = True
+                    schedule_delay = PROGRESS_MIN_INTERVAL - elapsed
+                    frames = []
+            else:
+                frames = self._drain_progress_locked(job) + [message]
+
+            self._send_frames(job, frames)
+
+        if schedule_delay is not None:
+            self._schedule_progress_flush(job, schedule_delay)
+
+    def _drain_progress_locked(self, job: Job) -> list:
+        """대기 중인 진행 메시지를 전송할 프레임으로 변환 (2개 이상이면 progress_batch로 병합, 잠금은 호출자가 보유)"""
+        pending = job.pending_progress
+        job.pending_progress = []
+        if not pending:
+            return []
+
+        job.last_progress_flush = time.monotonic()
+        if len(pending) == 1:
+            return pending
+        return [{
+            "type": "progress_batch",
+            "job_id": job.job_id,
+            "messages": pending,
+            "count": len(pending),
+            "timestamp": pending[-1]["timestamp"]
+        }]
+
+    def _schedule_progress_flush(self, job: Job, delay: float):
+        """서버 이벤트 루프에서 delay초 후 대기 중인 진행 메시지 전송"""
+        try:
+            self.loop.call_soon_threadsafe(self.loop.call_later, delay, self._flush_progress, job)
+        except Exception as e:
+            log_error(f"진행 메시지 전송 예약 실패: {job.job_id} - {e}")
+            self._flush_progress(job)
+
+    def _flush_progress(self, job: Job):
+        """예약된 진행 메시지 묶음 전송"""
+        with self._lock:
+            job.flush_scheduled = False
+            self._send_frames(job, self._drain_progress_locked(job))
+
+    def _send_frames(self, job: Job, frames: list):
+        """프레임마다 한 번만 직렬화해 모든 구독자에게 전송 (잠금은 호출자가 보유)"""
+        subscribers = list(job.subscribers)
+        if not subscribers:
+            return
+        job.frames_sent += len(frames)
+        for message in frames:
+            frame = json.dumps(message, ensure_ascii=False, default=str)
+            for ws in subscribers:
+                self._send(job, ws, frame)
+
+    def _send(self, job: Job, ws, frame: str):
+        """서버 이벤트 루프에서 구독자에게 프레임 전송 (실패한 구독자는 제거)"""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+
+        def _on_done(future):
+            if future.cancelled() or future.exception() is not None:
+                with self._lock:
+                    job.subscribers.discard(ws)
+
+        try:
+            future = asyncio.run_coroutine_threadsafe(ws.send_str(frame), loop)
+            future.add_done_callback(_on_done)
+        except Exception as e:
+            log_error(f"작업 메시지 전송 실패: {job.job_id} - {e}")
+            with self._lock:
+                job.subscribers.discard(ws)
+
+    def _run_job(self, job: Job):
+        """스케줄러 스레드에서 워크플로우 실행"""
+        if job.cancel_requested:
+            self._finish(job, JOB_CANCELLED)
+            return
+
+        with self._lock:
+            job.state = JOB_RUNNING
+            job.started_at = datetime.now().isoformat()
+        self.publish(job, {"type": "job_status", "state": JOB_RUNNING})
+        log_debug(f"작업 실행 시작: {job.job_id} - {job.question}")
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            final_state = loop.run_until_complete(
+                process_question_workflow(
+                    job.question, job.question_key, job.client_id, JobChannel(self, job), job_id=job.job_id
+                )
+            )
+            status = final_state.get("processing_status")
+            if job.cancel_requested or status == "cancelled":
+                self._finish(job, JOB_CANCELLED)
+            elif status == "error":
+                self._finish(job, JOB_FAILED, error=final_state.get("error_message"))
+            else:
+                self._finish(job, JOB_DONE, result=final_state.get("results"))
+        except Exception as e:
+            log_error(f"작업 실행 중 오류: {job.job_id} - {e}")
+            self.publish(job, {
+                "type": "error",
+                "message": f"처리 중 오류 발생: {str(e)}",
+                "session_id": job.session_id
+            })
+            self._finish(job, JOB_FAILED, error=str(e))
+        finally:
+            loop.close()
+
+    def _finish(self, job: Job, state: str, result: Any = None, error: Optional[str] = None):
+        """작업 종료 상태 기록 후 구독자에게 알림"""
+        with self._lock:
+            if job.finished:
+                return
+            job.state = state
+            job.result = result
+            job.error = error
+            job.finished_at = datetime.now().isoformat()
+            job.finished_monotonic = time.monotonic()
+        log_info(f"작업 종료: {job.job_id} ({state})")
+        self.publish(job, {"type": "job_status", "state": state, "error": error})
+
+    def _purge_finished_locked(self):
+        """보관 시간이 지난 종료 작업 제거 (잠금은 호출자가 보유)"""
+        cutoff = time.monotonic() - JOB_RETENTION_SECONDS
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished and job.finished_monotonic is not None and job.finished_monotonic < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """상태별 작업 수"""
+        with self._lock:
+            counts = {state: 0 for state in (JOB_QUEUED, JOB_RUNNING) + TERMINAL_JOB_STATES}
+            for job in self.jobs.values():
+                counts[job.state] += 1
+            return {
+                "total": len(self.jobs),
+                "by_state": counts,
+                "messages_published": sum(job.messages_published for job in self.jobs.values()),
+                "frames_sent": sum(job.frames_sent for job in self.jobs.values())
+            }
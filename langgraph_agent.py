@@ -30,18 +30,23 @@ class AgentState(TypedDict):
     # 처리 결과
     results: Dict[str, Any]                 # 처리 결과 저장
     error_message: Optional[str]            # 오류 메시지
-    processing_status: str                  # 처리 상태 (started, authenticated, processing, completed, error)
+    processing_status: str                  # 처리 상태 (started, authenticated, processing, completed, error, cancelled)
     
     # 메타데이터
     started_at: str                         # 처리 시작 시간
     completed_at: Optional[str]             # 처리 완료 시간
+    
+    # 체크포인트 (재시작 후 재개용)
+    job_id: Optional[str]                   # 작업 ID (체크포인트 파일 키)
+    stage_outputs: Dict[str, Any]           # 단계별 산출물 (수집된 보고서 섹션, JSON 경로 등)
 
 
 def create_initial_state(
     question: str,
     question_key: str,
     client_id: str,
-    websocket: websockets.WebSocketServerProtocol
+    websocket: websockets.WebSocketServerProtocol,
+    job_id: Optional[str] = None
 ) -> AgentState:
     """
     초기 에이전트 상태 생성
@@ -51,6 +56,7 @@ def create_initial_state(
         question_key: 질문 고유 키
         client_id: 클라이언트 ID
         websocket: WebSocket 연결
+        job_id: 작업 ID (체크포인트 저장용, 선택적)
         
     Returns:
         초기화된 AgentState
@@ -68,7 +74,9 @@ def create_initial_state(
         error_message=None,
         processing_status="started",
         started_at=datetime.now().isoformat(),
-        completed_at=None
+        completed_at=None,
+        job_id=job_id,
+        stage_outputs={}
     )
 
 
@@ -87,7 +95,7 @@ def update_state_status(state: AgentState, status: str, error_message: Optional[
     state["processing_status"] = status
     if error_message:
         state["error_message"] = error_message
-    if status in ["completed", "error"]:
+    if status in ["completed", "error", "cancelled"]:
         state["completed_at"] = datetime.now().isoformat()
     
     return state
@@ -105,6 +113,106 @@ def log_state_transition(state: AgentState, from_status: str, to_status: str):
     log_debug(f"상태 전환: {from_status} -> {to_status} (질문: {state['question_key']})")
 
 
+# 체크포인트 대상 질문 유형 (수 분 이상 걸리는 장시간 작업)
+CHECKPOINT_QUESTION_TYPES = ('screener', 'report')
+
+# 같은 작업의 최대 재개 시도 횟수 (재시작마다 프로세스를 죽이는 작업 차단)
+MAX_RESUME_ATTEMPTS = 3
+
+# 워크플로우 단계 순서 (체크포인트의 stage 값)
+WORKFLOW_STAGES = ('routed', 'authenticated', 'executed')
+
+
+def checkpoint_state(state: AgentState, stage: str):
+    """
+    단계 완료 후 상태 체크포인트 저장
+    장시간 작업(screener, report)만 저장하며 WebSocket 핸들과 자격증명은 제외
+    
+    Args:
+        state: 현재 상태
+        stage: 완료된 단계 이름
+    """
+    if not state.get("job_id") or state.get("question_type") not in CHECKPOINT_QUESTION_TYPES:
+        return
+
+    from utils.checkpoint_store import save_checkpoint
+    save_checkpoint(state["job_id"], state, stage)
+
+
+def record_stage_output(state: AgentState, key: str, value: Any, stage: str = "authenticated"):
+    """
+    단계 내부 산출물 기록 및 체크포인트 저장 (예: 수집 완료된 보고서 섹션)
+    
+    Args:
+        state: 현재 상태
+        key: 산출물 키
+        value: 산출물 값
+        stage: 체크포인트에 기록할 마지막 완료 단계
+    """
+    state["stage_outputs"][key] = value
+    checkpoint_state(state, stage)
+
+
+def restore_state_from_checkpoint(
+    record: Dict[str, Any],
+    websocket: Optional[websockets.WebSocketServerProtocol]
+) -> AgentState:
+    """
+    체크포인트 레코드에서 에이전트 상태 복원
+    자격증명은 저장하지 않으므로 인증 단계는 항상 다시 실행됨 (자격증명 캐시 사용)
+    
+    Args:
+        record: 체크포인트 레코드
+        websocket: 현재 WebSocket 연결 (재시작 후 재개 시 None)
+    
+    Returns:
+        복원된 AgentState
+    """
+    saved = record.get("state", {})
+    state = create_initial_state(
+        saved.get("question", ""),
+        saved.get("question_key", ""),
+        saved.get("client_id", ""),
+        websocket,
+        job_id=record.get("job_id")
+    )
+    for key, value in saved.items():
+        if key in state and key not in ("websocket", "credentials"):
+            state[key] = value
+    state["stage_outputs"] = saved.get("stage_outputs") or {}
+    return state
+
+
+def is_cancel_requested(state: AgentState) -> bool:
+    """
+    작업 취소 요청 여부 (작업 관리자의 JobChannel이 websocket 자리에 전달됨)
+    
+    Args:
+        state: 현재 상태
+    
+    Returns:
+        bool: 취소 요청 여부 (일반 WebSocket 연결이면 항상 False)
+    """
+    return bool(getattr(state.get("websocket"), "cancel_requested", False))
+
+
+async def cancel_workflow(state: AgentState) -> AgentState:
+    """
+    단계 사이에서 취소된 워크플로우 종료 처리
+    
+    Args:
+        state: 현재 상태
+    
+    Returns:
+        취소 상태로 변경된 AgentState
+    """
+    log_info(f"워크플로우 취소: {state['question_key']}")
+    await send_websocket_progress(state, "🛑 작업이 취소되었습니다.")
+    state = update_state_status(state, "cancelled")
+    checkpoint_state(state, "cancelled")
+    return state
+
+
 def analyze_question_type(question: str) -> tuple[str, Optional[str]]:
     """
     질문 유형 분석 및 적절한 컨텍스트 파일 경로 반환
@@ -199,6 +307,89 @@ def parse_month_from_question(question: str) -> tuple[str, str]:
     return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
 
 
+# 일괄 보고서 최대 기간 (월 수)
+MAX_REPORT_MONTHS = 12
+
+
+def _month_period(year: int, month: int) -> tuple[str, str]:
+    """해당 월의 (시작일, 종료일) YYYY-MM-DD 형식 반환"""
+    from calendar import monthrange
+    
+    _, last_day = monthrange(year, month)
+    return f"{year:04d}-{month:02d}-01", f"{year:04d}-{month:02d}-{last_day:02d}"
+
+
+def _month_range(start_year: int, start_month: int, end_year: int, end_month: int) -> list[tuple[str, str]]:
+    """시작 월부터 종료 월까지(포함) 월별 기간 목록 반환 (최대 MAX_REPORT_MONTHS개, 최근 월 우선)"""
+    months = []
+    year, month = start_year, start_month
+    while (year, month) <= (end_year, end_month):
+        months.append((year, month))
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return [_month_period(y, m) for y, m in months[-MAX_REPORT_MONTHS:]]
+
+
+def parse_report_periods_from_question(question: str) -> list[tuple[str, str]]:
+    """
+    질문에서 보고서 기간(분기, 최근 N개월, 시작~종료 월)을 추출하여 월별 기간 목록 반환
+    기간 표현이 없으면 parse_month_from_question의 단일 월 결과를 사용
+    
+    Args:
+        question: 사용자 질문
+    
+    Returns:
+        list: [(시작일, 종료일), ...] YYYY-MM-DD 형식, 오래된 순
+    """
+    import re
+    
+    now = datetime.now()
+    
+    # 1. 명시적 시작~종료 (2024년 1월부터 2024년 3월, 2024-01 ~ 2024-03, 2024년 1월~3월)
+    range_patterns = [
+        r'(\d{4})년\s*(\d{1,2})월\s*(?:부터|~|-|에서)\s*(?:(\d{4})년\s*)?(\d{1,2})월',
+        r'(\d{4})-(\d{1,2})\s*(?:~|부터|to)\s*(?:(\d{4})-)?(\d{1,2})\b',
+    ]
+    for pattern in range_patterns:
+        match = re.search(pattern, question, re.IGNORECASE)
+        if match:
+            start_year, start_month = int(match.group(1)), int(match.group(2))
+            end_year = int(match.group(3)) if match.group(3) else start_year
+            end_month = int(match.group(4))
+            if 1 <= start_month <= 12 and 1 <= end_month <= 12 and (start_year, start_month) <= (end_year, end_month):
+                log_debug(f"보고서 기간 (범위): {start_year}-{start_month} ~ {end_year}-{end_month}")
+                return _month_range(start_year, start_month, end_year, end_month)
+    
+    # 2. 분기 (2024년 3분기, 3분기, 2024 Q3, Q3 2024)
+    quarter_patterns = [
+        (r'(\d{4})년\s*([1-4])\s*분기', 1, 2),
+        (r'(\d{4})\s*-?\s*Q([1-4])\b', 1, 2),
+        (r'\bQ([1-4])\s*(\d{4})', 2, 1),
+        (r'([1-4])\s*분기', None, 1),
+    ]
+    for pattern, year_group, quarter_group in quarter_patterns:
+        match = re.search(pattern, question, re.IGNORECASE)
+        if match:
+            year = int(match.group(year_group)) if year_group else now.year
+            quarter = int(match.group(quarter_group))
+            start_month = (quarter - 1) * 3 + 1
+            log_debug(f"보고서 기간 (분기): {year}년 {quarter}분기")
+            return _month_range(year, start_month, year, start_month + 2)
+    
+    # 3. 최근 N개월 (이번 달 포함)
+    match = re.search(r'(?:최근|지난)\s*(\d{1,2})\s*개월|last\s*(\d{1,2})\s*months?', question, re.IGNORECASE)
+    if match:
+        count = max(1, min(int(match.group(1) or match.group(2)), MAX_REPORT_MONTHS))
+        start_index = now.year * 12 + (now.month - 1) - (count - 1)
+        start_year, start_month = divmod(start_index, 12)
+        log_debug(f"보고서 기간 (최근 {count}개월)")
+        return _month_range(start_year, start_month + 1, now.year, now.month)
+    
+    # 4. 단일 월 (기존 방식)
+    return [parse_month_from_question(question)]
+
+
 def load_context_file(context_path: str) -> str:
     """
     컨텍스트 파일 로드
@@ -266,7 +457,11 @@ async def send_websocket_progress(state: AgentState, message: str):
                 "message": message,
                 "timestamp": datetime.now().isoformat()
             }
-            await state["websocket"].send_str(json.dumps(progress_message, ensure_ascii=False))
+            if hasattr(state["websocket"], "publish"):
+                # 작업 채널: 직렬화 없이 발행 (작업당 전송 빈도 제한 및 progress_batch 병합)
+                state["websocket"].publish(progress_message)
+            else:
+                await state["websocket"].send_str(json.dumps(progress_message, ensure_ascii=False))
             log_debug(f"진행 상황 전송: {message}")
         except Exception as e:
             log_error(f"진행 상황 전송 실패: {e}")
@@ -411,7 +606,10 @@ async def authenticate_aws(state: AgentState, local_test_mode: bool = True) -> A
         인증 완료된 상태
     """
     try:
-        from aws_tools.auth import extract_account_id, get_crossaccount_session, validate_account_id
+        from aws_tools.auth import (
+            extract_account_id, get_crossaccount_session_async, validate_account_id,
+            get_credentials_remaining_seconds, LONG_JOB_MIN_CREDENTIAL_SECONDS
+        )
         
         # 계정 ID 추출
         account_id = extract_account_id(state["question"])
@@ -435,13 +633,18 @@ async def authenticate_aws(state: AgentState, local_test_mode: bool = True) -> A
             else:
                 # 실제 인증 모드
                 try:
-                    credentials = get_crossaccount_session(account_id)
+                    # 장시간 작업은 작업 도중 만료되지 않도록 충분히 남은 자격증명 요구
+                    min_remaining_seconds = 0
+                    if state.get("question_type") in CHECKPOINT_QUESTION_TYPES:
+                        min_remaining_seconds = LONG_JOB_MIN_CREDENTIAL_SECONDS
+                    credentials = await get_crossaccount_session_async(account_id, min_remaining_seconds=min_remaining_seconds)
                     
                     if credentials:
                         state["credentials"] = credentials
                         state["processing_status"] = "authenticated"
                         await send_websocket_progress(state, "✅ AWS 인증 성공! 요청을 처리합니다...")
-                        log_info(f"AWS 인증 성공: {account_id}")
+                        remaining = get_credentials_remaining_seconds(credentials)
+                        log_info(f"AWS 인증 성공: {account_id} (자격증명 남은 시간: {int(remaining) if remaining is not None else '알 수 없음'}초)")
                         log_debug(f"자격증명 키: {list(credentials.keys())}")
                     else:
                         # 실제 환경에서 인증 실패
@@ -476,6 +679,102 @@ async def authenticate_aws(state: AgentState, local_test_mode: bool = True) -> A
         return state
 
 
+async def execute_batch_report(state: AgentState, periods: list[tuple[str, str]]) -> Dict[str, Any]:
+    """
+    여러 달 일괄 보고서 생성 단계
+    인벤토리는 한 번만 수집하고 CloudTrail만 월별 병렬 수집한 뒤
+    월별 HTML 보고서와 전체 추이 보고서를 생성
+    
+    Args:
+        state: 현재 상태
+        periods: [(시작일, 종료일), ...] 월별 기간 목록
+    
+    Returns:
+        결과 데이터
+    """
+    from aws_tools.security_report import collect_raw_security_data_for_periods, generate_html_report, generate_trend_report
+    from aws_tools.report_store import save_report, load_report, REPORT_FILE_SUFFIX
+    
+    account_id = state.get("account_id")
+    credentials = state.get("credentials")
+    report_base_url = "http://web-tool-lb-627934048.ap-northeast-2.elb.amazonaws.com/reports"
+    
+    first_dt = datetime.strptime(periods[0][0], '%Y-%m-%d')
+    last_dt = datetime.strptime(periods[-1][0], '%Y-%m-%d')
+    period_text = f"{first_dt.year}년 {first_dt.month}월 ~ {last_dt.year}년 {last_dt.month}월"
+    
+    result = {
+        "question": state["question"],
+        "question_type": "report",
+        "account_id": account_id,
+        "authenticated": True
+    }
+    
+    try:
+        stage_outputs = state["stage_outputs"]
+        json_paths = stage_outputs.get("batch_json_paths") or []
+        
+        if json_paths and all(os.path.exists(path) for path in json_paths):
+            # 체크포인트에서 재개 - 이미 저장된 월별 Raw 데이터 재사용
+            await send_websocket_progress(state, f"♻️ {period_text} 이전에 수집된 보안 데이터를 재사용합니다...")
+            period_reports = [load_report(path) for path in json_paths]
+        else:
+            await send_websocket_progress(state, f"🔍 {period_text} ({len(periods)}개월) AWS 보안 데이터를 수집하고 있습니다...")
+            await send_websocket_progress(state, "📦 리소스 인벤토리는 1회만 수집하고 CloudTrail 이벤트는 월별로 병렬 수집합니다")
+            
+            period_reports = collect_raw_security_data_for_periods(
+                account_id,
+                periods,
+                region='ap-northeast-2',
+                credentials=credentials
+            )
+            
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            os.makedirs('/tmp/reports', exist_ok=True)
+            
+            json_paths = []
+            for report in period_reports:
+                period_month = report['metadata']['period_start'][:7].replace('-', '')
+                raw_json_path = f"/tmp/reports/security_data_{account_id}_{period_month}_{timestamp}{REPORT_FILE_SUFFIX}"
+                json_paths.append(save_report(report, raw_json_path))
+            
+            record_stage_output(state, "batch_json_paths", json_paths)
+        
+        # 월별 HTML 보고서 + 추이 보고서 생성
+        await send_websocket_progress(state, f"📊 {period_text} 월별 HTML 보고서와 추이 보고서를 생성하고 있습니다...")
+        html_paths = [generate_html_report(path) for path in json_paths]
+        trend_path = generate_trend_report(account_id, period_reports, html_paths)
+        
+        report_links = []
+        for report, html_path in zip(period_reports, html_paths):
+            report_month = datetime.strptime(report['metadata']['period_start'], '%Y-%m-%d')
+            if html_path:
+                report_links.append(f"- **{report_month.year}년 {report_month.month}월**: [월간 보안 점검 보고서 보기]({report_base_url}/{os.path.basename(html_path)})")
+            else:
+                report_links.append(f"- **{report_month.year}년 {report_month.month}월**: ❌ 보고서 생성 실패")
+        
+        trend_link = f"[월별 추이 보고서 보기]({report_base_url}/{os.path.basename(trend_path)})" if trend_path else "❌ 추이 보고서 생성 실패"
+        
+        result["answer"] = f"""
+## 📊 {period_text} AWS 보고서 생성 완료
+
+**계정 ID**: {account_id}
+**분석 기간**: {periods[0][0]} ~ {periods[-1][1]} ({len(periods)}개월)
+
+### 📈 추이 보고서
+- {trend_link}
+
+### 📋 월별 보고서
+{chr(10).join(report_links)}
+
+※ 리소스 현황(EC2, S3, IAM, Trusted Advisor 등)은 현재 시점 기준이며, CloudTrail 이벤트는 월별로 집계되었습니다.
+"""
+    except Exception as e:
+        result["answer"] = f"❌ {period_text} 보고서 생성 중 오류가 발생했습니다: {str(e)}"
+
+    return result
+
+
 async def execute_aws_operation(state: AgentState) -> AgentState:
     """
     AWS 작업 실행 단계
@@ -490,6 +789,9 @@ async def execute_aws_operation(state: AgentState) -> AgentState:
         question_type = state.get("question_type", "general")
         account_id = state.get("account_id")
         credentials = state.get("credentials")
+    
+        # 보고서 기간 분석 (여러 달이면 일괄 보고서 모드)
+        report_periods = parse_report_periods_from_question(state["question"]) if question_type == "report" else []
         
         # 진행 상황 전송
         await send_websocket_progress(state, f"⚙️ {question_type} 작업을 실행합니다...")
@@ -542,10 +844,15 @@ async def execute_aws_operation(state: AgentState) -> AgentState:
                     "account_id": account_id,
                     "authenticated": True
                 }
+    
+        elif question_type == "report" and account_id and credentials and len(report_periods) > 1:
+            # 여러 달(분기, 최근 N개월, 기간 지정) 일괄 보고서 생성
+            result = await execute_batch_report(state, report_periods)
         
         elif question_type == "report" and account_id and credentials:
             # 월간 보고서 생성 (기존 reference 코드 방식 사용)
             from aws_tools.security_report import collect_raw_security_data, generate_html_report
+            from aws_tools.report_store import save_report, REPORT_FILE_SUFFIX
             import json
             from datetime import date
             
@@ -557,27 +864,44 @@ async def execute_aws_operation(state: AgentState) -> AgentState:
             period_text = f"{start_dt.year}년 {start_dt.month}월"
             
             try:
-                # 진행 상황 업데이트
-                await send_websocket_progress(state, f"🔍 {period_text} AWS 보안 데이터를 수집하고 있습니다...")
-                
-                # 1. Raw 데이터 수집 (기존 방식 그대로)
-                raw_data = collect_raw_security_data(
-                    account_id, 
-                    start_date_str, 
-                    end_date_str, 
-                    region='ap-northeast-2',
-                    credentials=credentials
-                )
-                
-                # 2. JSON 파일 저장
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                raw_json_path = f"/tmp/reports/security_data_{account_id}_{timestamp}.json"
+                stage_outputs = state["stage_outputs"]
+                raw_json_path = stage_outputs.get("raw_json_path")
                 
-                # /tmp/reports 디렉터리 생성
-                os.makedirs('/tmp/reports', exist_ok=True)
-                
-                with open(raw_json_path, 'w', encoding='utf-8') as f:
-                    json.dump(raw_data, f, indent=2, ensure_ascii=False)
+                if raw_json_path and os.path.exists(raw_json_path):
+                    # 체크포인트에서 재개 - 이미 저장된 Raw 데이터 재사용
+                    await send_websocket_progress(state, f"♻️ {period_text} 이전에 수집된 보안 데이터를 재사용합니다...")
+                else:
+                    # 진행 상황 업데이트
+                    await send_websocket_progress(state, f"🔍 {period_text} AWS 보안 데이터를 수집하고 있습니다...")
+                    
+                    # 수집 완료된 섹션은 체크포인트에 기록 (재시작 시 재수집 생략)
+                    collected_sections = dict(stage_outputs.get("report_sections") or {})
+                    
+                    def on_section_complete(section, value):
+                        collected_sections[section] = value
+                        record_stage_output(state, "report_sections", collected_sections)
+                    
+                    # 1. Raw 데이터 수집 (기존 방식 그대로)
+                    raw_data = collect_raw_security_data(
+                        account_id, 
+                        start_date_str, 
+                        end_date_str, 
+                        region='ap-northeast-2',
+                        credentials=credentials,
+                        resume_sections=collected_sections,
+                        on_section_complete=on_section_complete
+                    )
+                    
+                    # 2. JSON 파일 저장
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                    raw_json_path = f"/tmp/reports/security_data_{account_id}_{timestamp}{REPORT_FILE_SUFFIX}"
+                    
+                    # 필요한 필드만 압축 저장 (/tmp/reports 디렉터리는 save_report가 생성)
+                    save_report(raw_data, raw_json_path)
+                    
+                    # JSON 파일이 섹션 데이터를 대체하므로 체크포인트에서는 경로만 유지
+                    stage_outputs.pop("report_sections", None)
+                    record_stage_output(state, "raw_json_path", raw_json_path)
                 
                 # 3. HTML 보고서 생성
                 await send_websocket_progress(state, f"📊 {period_text} HTML 보고서를 생성하고 있습니다...")
@@ -697,16 +1021,19 @@ async def process_question_workflow(
     question: str,
     question_key: str,
     client_id: str,
-    websocket: websockets.WebSocketServerProtocol
+    websocket: websockets.WebSocketServerProtocol,
+    job_id: Optional[str] = None
 ) -> AgentState:
     """
     질문 처리 워크플로우 (LangGraph 스타일)
+    job_id에 해당하는 체크포인트가 있으면 마지막 완료 단계부터 재개
     
     Args:
         question: 사용자 질문
         question_key: 질문 고유 키
         client_id: 클라이언트 ID
         websocket: WebSocket 연결
+        job_id: 작업 ID (체크포인트 저장/재개용, 선택적)
         
     Returns:
         최종 상태
@@ -714,21 +1041,43 @@ async def process_question_workflow(
     try:
         log_info(f"워크플로우 시작: {question_key}")
         
-        # 1. 초기 상태 생성
-        state = create_initial_state(question, question_key, client_id, websocket)
+        # 1. 초기 상태 생성 (체크포인트가 있으면 복원)
+        checkpoint = None
+        if job_id:
+            from utils.checkpoint_store import load_checkpoint
+            checkpoint = load_checkpoint(job_id)
+        
+        if checkpoint:
+            state = restore_state_from_checkpoint(checkpoint, websocket)
+            completed_stage = checkpoint.get("stage")
+            log_info(f"체크포인트에서 재개: {job_id} (완료 단계: {completed_stage})")
+        else:
+            state = create_initial_state(question, question_key, client_id, websocket, job_id=job_id)
+            completed_stage = None
         
         # 2. 질문 분석 및 라우팅
-        state = route_question(state)
-        if state["processing_status"] == "error":
-            return state
+        if completed_stage not in WORKFLOW_STAGES:
+            state = route_question(state)
+            if state["processing_status"] == "error":
+                return state
+            checkpoint_state(state, "routed")
+        
+        if is_cancel_requested(state):
+            return await cancel_workflow(state)
         
-        # 3. AWS 인증 (필수) - 실제 인증 모드
+        # 3. AWS 인증 (필수) - 실제 인증 모드 (자격증명은 체크포인트에 없으므로 항상 실행)
         state = await authenticate_aws(state, local_test_mode=False)
         if state["processing_status"] == "error":
+            checkpoint_state(state, "authenticated")
             return state
+        checkpoint_state(state, "authenticated")
+        
+        if is_cancel_requested(state):
+            return await cancel_workflow(state)
         
         # 4. AWS 작업 실행
         state = await execute_aws_operation(state)
+        checkpoint_state(state, "executed")
         
         log_info(f"워크플로우 완료: {question_key} (상태: {state['processing_status']})")
         return state
@@ -737,9 +1086,15 @@ async def process_question_workflow(
         log_error(f"워크플로우 실행 중 오류: {question_key} - {e}")
         
         # 오류 상태 생성
-        error_state = create_initial_state(question, question_key, client_id, websocket)
+        error_state = create_initial_state(question, question_key, client_id, websocket, job_id=job_id)
         error_state["error_message"] = f"워크플로우 실행 중 오류: {str(e)}"
         error_state["processing_status"] = "error"
         error_state["completed_at"] = datetime.now().isoformat()
-        
-        return error_state
\ No newline at end of file
+
+        # 체크포인트가 있으면 오류로 종료 처리 (재시작 시 재개 대상에서 제외)
+        if job_id:
+            from utils.checkpoint_store import load_checkpoint, save_checkpoint
+            if load_checkpoint(job_id):
+                save_checkpoint(job_id, error_state, "error")
+
+        return error_state
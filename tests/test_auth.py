@@ -0,0 +1,183 @@
+"""
+Cross-account 인증 테스트
+STS/SSM 스텁으로 계정별 single-flight 발급과 만료 전 백그라운드 갱신 검증
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from aws_tools import auth
+
+ACCOUNT_ID = '123456789012'
+OLD_KEYS = ('AKIAOLD', 'old-secret')
+NEW_KEYS = ('AKIANEW', 'new-secret')
+WAIT_SECONDS = 5
+
+
+def wait_until(predicate):
+    deadline = time.monotonic() + WAIT_SECONDS
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class StubSSM:
+    """Parameter Store 스텁 (current 키 반환, 조회 횟수 기록)"""
+
+    def __init__(self, keys):
+        self.current = keys
+        self.fetches = 0
+
+    def get_parameters(self, Names, WithDecryption):
+        self.fetches += 1
+        values = dict(zip([auth._SSM_ACCESS_KEY_PARAMETER, auth._SSM_SECRET_KEY_PARAMETER], self.current))
+        return {'Parameters': [{'Name': name, 'Value': values[name]} for name in Names], 'InvalidParameters': []}
+
+
+class StubSTS:
+    """
+    STS 스텁 (assume_role 호출 기록, lifetime 동안 유효한 임시 자격증명 발급)
+    valid_access_key 외의 키로 호출하면 InvalidClientTokenId 오류
+    """
+
+    def __init__(self, valid_access_key=OLD_KEYS[0], lifetime=timedelta(hours=1)):
+        self.valid_access_key = valid_access_key
+        self.lifetime = lifetime
+        self.calls = []
+        self.before_assume = None
+        self._lock = threading.Lock()
+
+    def client(self, service, region=None, credentials=None):
+        access_key = (credentials or {}).get('AWS_ACCESS_KEY_ID')
+        return mock.Mock(assume_role=lambda **kwargs: self.assume_role(access_key, **kwargs))
+
+    def assume_role(self, access_key, RoleArn, RoleSessionName, **kwargs):
+        if self.before_assume:
+            self.before_assume(access_key)
+        with self._lock:
+            self.calls.append((access_key, RoleArn))
+            serial = len(self.calls)
+        if access_key != self.valid_access_key:
+            raise ClientError({'Error': {'Code': 'InvalidClientTokenId', 'Message': 'invalid'}}, 'AssumeRole')
+        return {'Credentials': {
+            'AccessKeyId': f'ASIA{serial:04d}',
+            'SecretAccessKey': 'secret',
+            'SessionToken': 'token',
+            'Expiration': datetime.now(timezone.utc) + self.lifetime,
+        }}
+
+
+@pytest.fixture
+def sts():
+    """빈 캐시/통계와 STS·SSM 스텁으로 인증 모듈 실행 (백그라운드 갱신 스레드는 시작하지 않음)"""
+    stub_sts = StubSTS()
+    stub_ssm = StubSSM(OLD_KEYS)
+    stub_sts.ssm = stub_ssm
+    with mock.patch.dict(auth._credentials_cache, clear=True), \
+            mock.patch.dict(auth._inflight_acquisitions, clear=True), \
+            mock.patch.dict(auth._ssm_key_cache, {"keys": None, "fetched_at": 0.0}), \
+            mock.patch.dict(auth._hop1_cache, {"credentials": None, "last_used": 0.0}), \
+            mock.patch.dict(auth._auth_stats, {name: 0 for name in auth._auth_stats}), \
+            mock.patch.object(auth, 'get_client', stub_sts.client), \
+            mock.patch.object(auth, '_get_ssm_client', lambda: stub_ssm), \
+            mock.patch.object(auth, 'evict_credentials'), \
+            mock.patch.object(auth, '_start_background_refresh'):
+        yield stub_sts
+
+
+def run_concurrently(count, target):
+    """count개 스레드에서 target을 동시에 시작하고 결과 목록 반환"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index):
+        barrier.wait(WAIT_SECONDS)
+        results[index] = target(index)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(WAIT_SECONDS)
+    return results
+
+
+def test_concurrent_callers_share_one_assume_role(sts):
+    callers = 8
+    # 첫 요청의 assume_role은 나머지 요청이 모두 single-flight 대기에 들어간 뒤에 응답
+    sts.before_assume = lambda access_key: wait_until(lambda: auth._auth_stats["singleflight_waits"] == callers - 1)
+
+    results = run_concurrently(callers, lambda index: auth.get_crossaccount_session(ACCOUNT_ID, use_broker=False))
+
+    assert len(sts.calls) == 1
+    assert sts.calls[0] == (OLD_KEYS[0], f'arn:aws:iam::{ACCOUNT_ID}:role/SaltwareCrossAccount')
+    assert all(result == results[0] for result in results)
+    assert results[0]['AWS_ACCESS_KEY_ID'] == 'ASIA0001'
+
+    stats = auth.get_auth_stats()
+    assert stats["acquisitions"] == 1
+    assert stats["singleflight_waits"] == callers - 1
+    assert stats["sts_calls_saved"] == callers - 1
+    assert stats["ssm_key_fetches"] == 1
+
+    # 이후 요청은 캐시에서 반환
+    assert auth.get_crossaccount_session(ACCOUNT_ID, use_broker=False) == results[0]
+    assert len(sts.calls) == 1
+
+
+def test_recently_used_credentials_are_refreshed_before_expiry(sts):
+    sts.lifetime = timedelta(minutes=10)
+    expiring = auth.get_crossaccount_session(ACCOUNT_ID, use_broker=False)
+    idle = auth.get_crossaccount_session('210987654321', use_broker=False)
+    sts.lifetime = timedelta(minutes=50)
+    fresh = auth.get_crossaccount_session('111122223333', use_broker=False)
+    auth._credentials_cache['210987654321']['last_used'] -= auth._RECENT_USE_SECONDS + 60
+    assert len(sts.calls) == 3
+
+    # 10분 남은 자격증명은 아직 유효 (요청 경로에서는 재발급하지 않음)
+    assert auth.get_crossaccount_session(ACCOUNT_ID, use_broker=False) == expiring
+    assert len(sts.calls) == 3
+
+    sts.lifetime = timedelta(hours=1)
+    assert auth.refresh_expiring_credentials() == 1
+
+    # 최근 사용되고 15분 미만 남은 계정만 만료 전에 갱신
+    assert [role_arn for _, role_arn in sts.calls[3:]] == [f'arn:aws:iam::{ACCOUNT_ID}:role/SaltwareCrossAccount']
+    refreshed = auth.get_crossaccount_session(ACCOUNT_ID, use_broker=False)
+    assert refreshed['AWS_ACCESS_KEY_ID'] == 'ASIA0004'
+    assert auth.get_credentials_remaining_seconds(refreshed) > auth._PROACTIVE_REFRESH_SECONDS
+    assert auth.get_crossaccount_session('111122223333', use_broker=False) == fresh
+    assert auth._credentials_cache['210987654321']['AWS_ACCESS_KEY_ID'] == idle['AWS_ACCESS_KEY_ID']
+    assert len(sts.calls) == 4
+
+
+def test_rotated_key_is_refetched_once_and_not_cleared_again(sts):
+    assert auth.get_crossaccount_credentials() == OLD_KEYS
+    # 키 교체: Parameter Store는 새 키, STS는 캐시에 남은 옛 키를 거부
+    sts.ssm.current = NEW_KEYS
+    sts.valid_access_key = NEW_KEYS[0]
+
+    accounts = ['123456789012', '210987654321', '111122223333', '444455556666']
+    # 모든 요청이 옛 키로 거부된 뒤에 재조회 시작 (재조회 경쟁 재현)
+    rejected = threading.Barrier(len(accounts))
+    sts.before_assume = lambda access_key: rejected.wait(WAIT_SECONDS) if access_key == OLD_KEYS[0] else None
+
+    results = run_concurrently(len(accounts), lambda index: auth.get_crossaccount_session(accounts[index], use_broker=False))
+
+    assert all(result and result['AWS_ACCESS_KEY_ID'].startswith('ASIA') for result in results)
+    assert sorted(access_key for access_key, _ in sts.calls) == [NEW_KEYS[0]] * 4 + [OLD_KEYS[0]] * 4
+    # 처음 거부된 요청만 무효화/재조회하고, 나머지는 교체된 새 키를 그대로 사용
+    assert sts.ssm.fetches == 2
+    assert auth._ssm_key_cache["keys"] == NEW_KEYS
+    stats = auth.get_auth_stats()
+    assert stats["ssm_key_invalidations"] == 1
+    assert stats["path_user"] == 4 and stats["path_role_fallback"] == 0
+    auth.evict_credentials.assert_called_once_with(OLD_KEYS[0])
+
+    # 이미 교체된 뒤에 옛 키 거부가 늦게 도착해도 새 키를 지우지 않음
+    assert auth.get_crossaccount_credentials(rejected_access_key=OLD_KEYS[0]) == NEW_KEYS
+    assert sts.ssm.fetches == 2
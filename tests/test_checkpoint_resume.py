@@ -0,0 +1,167 @@
+"""
+작업 체크포인트 재개/취소 테스트
+임시 체크포인트 디렉토리에서 마지막 완료 단계부터의 재개, 단계 사이 취소, 완료 체크포인트 정리 검증
+"""
+import asyncio
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+import langgraph_agent
+from utils import checkpoint_store
+from utils.checkpoint_store import (
+    save_checkpoint, load_checkpoint, list_interrupted_checkpoints, cleanup_finished_checkpoints, mark_resume_attempt
+)
+
+
+class FakeChannel:
+    """작업 채널 대체 (발행 메시지 기록, cancel_requested로 취소 요청 재현)"""
+
+    def __init__(self):
+        self.cancel_requested = False
+        self.published = []
+
+    def publish(self, message):
+        self.published.append(message)
+
+
+class FakeWorkflow:
+    """라우팅/인증/실행 단계 대체 (호출된 단계와 실행 시점의 상태 기록)"""
+
+    def __init__(self, cancel_after_auth=False):
+        self.calls = []
+        self.cancel_after_auth = cancel_after_auth
+        self.executed_state = None
+
+    def route_question(self, state):
+        self.calls.append('route')
+        state["question_type"] = 'report'
+        state["account_id"] = '123456789012'
+        return state
+
+    async def authenticate_aws(self, state, local_test_mode=True):
+        self.calls.append('authenticate')
+        state["credentials"] = {'AWS_ACCESS_KEY_ID': 'ASIASECRET'}
+        state["processing_status"] = 'authenticated'
+        if self.cancel_after_auth:
+            state["websocket"].cancel_requested = True
+        return state
+
+    async def execute_aws_operation(self, state):
+        self.calls.append('execute')
+        self.executed_state = dict(state)
+        state["results"] = {'report': 'done'}
+        state["processing_status"] = 'completed'
+        return state
+
+
+@pytest.fixture
+def checkpoint_dir(tmp_path):
+    with mock.patch.object(checkpoint_store, 'CHECKPOINT_DIR', str(tmp_path)):
+        yield tmp_path
+
+
+def run_workflow(workflow, channel, job_id):
+    with mock.patch.object(langgraph_agent, 'route_question', workflow.route_question), \
+            mock.patch.object(langgraph_agent, 'authenticate_aws', workflow.authenticate_aws), \
+            mock.patch.object(langgraph_agent, 'execute_aws_operation', workflow.execute_aws_operation):
+        return asyncio.run(langgraph_agent.process_question_workflow(
+            '123456789012 보고서', 'question-key', 'client', channel, job_id=job_id
+        ))
+
+
+def interrupted_record(job_id, stage, stage_outputs):
+    """routed/authenticated 단계까지 끝나고 중단된 보고서 작업의 체크포인트 저장"""
+    state = langgraph_agent.create_initial_state('123456789012 보고서', 'question-key', 'client', None, job_id=job_id)
+    state.update(question_type='report', account_id='123456789012', processing_status='authenticated',
+                 credentials={'AWS_ACCESS_KEY_ID': 'ASIASECRET'}, stage_outputs=stage_outputs)
+    save_checkpoint(job_id, state, stage)
+
+
+def test_full_run_checkpoints_each_stage_without_secrets(checkpoint_dir):
+    workflow = FakeWorkflow()
+    state = run_workflow(workflow, FakeChannel(), 'job-full')
+
+    assert workflow.calls == ['route', 'authenticate', 'execute']
+    assert state["processing_status"] == 'completed'
+    record = load_checkpoint('job-full')
+    assert record["stage"] == 'executed'
+    assert record["status"] == 'completed'
+    assert 'credentials' not in record["state"] and 'websocket' not in record["state"]
+    assert list_interrupted_checkpoints() == []
+
+
+def test_resume_skips_completed_stages_and_restores_outputs(checkpoint_dir):
+    sections = {'ec2': {'summary': {'total': 3}}, 's3': {'summary': {'total': 1}}}
+    interrupted_record('job-resume', 'authenticated', {'report_sections': sections})
+    assert [record["job_id"] for record in list_interrupted_checkpoints()] == ['job-resume']
+
+    workflow = FakeWorkflow()
+    state = run_workflow(workflow, FakeChannel(), 'job-resume')
+
+    # 라우팅은 건너뛰고, 자격증명은 저장하지 않으므로 인증은 다시 실행
+    assert workflow.calls == ['authenticate', 'execute']
+    assert workflow.executed_state["question_type"] == 'report'
+    assert workflow.executed_state["stage_outputs"] == {'report_sections': sections}
+    assert state["processing_status"] == 'completed'
+    assert load_checkpoint('job-resume')["stage"] == 'executed'
+    assert list_interrupted_checkpoints() == []
+
+
+def test_cancel_between_stages_stops_before_execution(checkpoint_dir):
+    workflow = FakeWorkflow(cancel_after_auth=True)
+    channel = FakeChannel()
+    state = run_workflow(workflow, channel, 'job-cancel')
+
+    assert workflow.calls == ['route', 'authenticate']
+    assert state["processing_status"] == 'cancelled'
+    assert state["completed_at"] is not None
+    assert channel.published[-1]["message"] == "🛑 작업이 취소되었습니다."
+    record = load_checkpoint('job-cancel')
+    assert (record["stage"], record["status"]) == ('cancelled', 'cancelled')
+    assert list_interrupted_checkpoints() == []
+
+
+def test_cancel_requested_before_resume_does_not_reauthenticate(checkpoint_dir):
+    interrupted_record('job-cancel-resume', 'routed', {})
+    channel = FakeChannel()
+    channel.cancel_requested = True
+
+    workflow = FakeWorkflow()
+    state = run_workflow(workflow, channel, 'job-cancel-resume')
+
+    assert workflow.calls == []
+    assert state["processing_status"] == 'cancelled'
+    assert load_checkpoint('job-cancel-resume')["status"] == 'cancelled'
+
+
+def test_cleanup_prunes_only_old_finished_checkpoints(checkpoint_dir):
+    def save(job_id, status, hours_ago):
+        state = langgraph_agent.create_initial_state('q', job_id, 'client', None, job_id=job_id)
+        state.update(question_type='report', processing_status=status)
+        save_checkpoint(job_id, state, 'executed')
+        record = load_checkpoint(job_id)
+        record["updated_at"] = (datetime.now() - timedelta(hours=hours_ago)).isoformat()
+        checkpoint_store._write_checkpoint_file(job_id, record)
+
+    for status in checkpoint_store.FINISHED_STATUSES:
+        save(f'old-{status}', status, hours_ago=48)
+        save(f'recent-{status}', status, hours_ago=1)
+    save('old-interrupted', 'authenticated', hours_ago=48)
+
+    assert cleanup_finished_checkpoints(max_age_hours=24) == len(checkpoint_store.FINISHED_STATUSES)
+
+    remaining = sorted(path.name for path in checkpoint_dir.iterdir())
+    assert remaining == sorted(
+        [f'job_recent-{status}.json' for status in checkpoint_store.FINISHED_STATUSES] + ['job_old-interrupted.json']
+    )
+    assert [record["job_id"] for record in list_interrupted_checkpoints()] == ['old-interrupted']
+
+
+def test_mark_resume_attempt_counts_restarts(checkpoint_dir):
+    interrupted_record('job-retry', 'routed', {})
+
+    assert [mark_resume_attempt('job-retry') for _ in range(3)] == [1, 2, 3]
+    assert load_checkpoint('job-retry')["resume_count"] == 3
+    assert mark_resume_attempt('missing') == 0
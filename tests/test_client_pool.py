@@ -0,0 +1,92 @@
+"""
+boto3 클라이언트 풀 테스트
+botocore 세션 스텁으로 생성 중 풀 조회가 막히지 않는지, 같은 키 동시 요청의 생성 1회, 만료 클라이언트 교체 검증
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from aws_tools import client_pool
+from aws_tools.client_pool import get_client, get_pool_stats
+
+WAIT_SECONDS = 5
+
+
+class BlockingSession:
+    """create_client가 release 전까지 끝나지 않는 botocore 세션 스텁 (생성한 클라이언트 기록)"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+        self.creating = threading.Event()
+        self.created = []
+
+    def create_client(self, service, **kwargs):
+        self.creating.set()
+        assert self.release.wait(WAIT_SECONDS)
+        client = mock.Mock(service=service, region=kwargs['region_name'])
+        self.created.append(client)
+        return client
+
+
+@pytest.fixture
+def session():
+    stub = BlockingSession()
+    with mock.patch.dict(client_pool._pool, clear=True), \
+            mock.patch.dict(client_pool._stats, {"hits": 0, "misses": 0, "evictions": 0, "create_ms_total": 0.0}), \
+            mock.patch.object(client_pool, '_get_shared_session', lambda: stub):
+        yield stub
+
+
+def start(target, *args):
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_pooled_lookup_is_not_blocked_by_client_creation(session):
+    sts = get_client('sts')
+
+    session.release.clear()
+    creating = start(get_client, 'ec2', 'ap-northeast-2')
+    assert session.creating.wait(WAIT_SECONDS)
+
+    # 다른 스레드가 클라이언트를 생성하는 동안에도 풀에 있는 클라이언트는 바로 반환
+    assert get_client('sts') is sts
+    assert get_pool_stats()["hits"] == 1
+
+    session.release.set()
+    creating.join(WAIT_SECONDS)
+    assert [client.service for client in session.created] == ['sts', 'ec2']
+
+
+def test_concurrent_requests_for_same_key_create_one_client(session):
+    session.release.clear()
+    results = []
+    threads = [start(lambda: results.append(get_client('s3', 'us-east-1'))) for _ in range(6)]
+    assert session.creating.wait(WAIT_SECONDS)
+    session.release.set()
+    for thread in threads:
+        thread.join(WAIT_SECONDS)
+
+    assert len(session.created) == 1
+    assert results == [session.created[0]] * 6
+    stats = get_pool_stats()
+    assert (stats["misses"], stats["hits"], stats["size"]) == (1, 5, 1)
+
+
+def test_expired_client_is_replaced(session):
+    expiring = {
+        'AWS_ACCESS_KEY_ID': 'ASIATEST',
+        'AWS_SECRET_ACCESS_KEY': 'secret',
+        'AWS_SESSION_TOKEN': 'token',
+        'AWS_CREDENTIAL_EXPIRATION': (datetime.now(timezone.utc) + timedelta(seconds=30)).isoformat(),
+    }
+    first = get_client('ec2', 'ap-northeast-2', expiring)
+    second = get_client('ec2', 'ap-northeast-2', expiring)
+
+    assert first is not second
+    stats = get_pool_stats()
+    assert (stats["misses"], stats["evictions"], stats["size"]) == (2, 1, 1)
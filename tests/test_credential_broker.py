@@ -0,0 +1,75 @@
+"""
+자격증명 브로커 소켓 테스트
+실행 중인 브로커 감지(연결 시도), 중복 실행 거부, 이전 브로커가 남긴 소켓 파일 정리 검증
+"""
+import os
+import socket
+import threading
+from unittest import mock
+
+import pytest
+
+from aws_tools import credential_broker
+from aws_tools.credential_broker import CredentialBrokerServer, is_broker_available, request_broker, serve
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / 'broker.sock')
+
+
+@pytest.fixture
+def running_broker(socket_path):
+    """socket_path에서 실행 중인 브로커"""
+    server = CredentialBrokerServer(socket_path, credential_broker._BrokerRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(5)
+
+
+def leave_stale_socket(path):
+    """비정상 종료한 브로커처럼 받는 프로세스 없는 소켓 파일만 남김"""
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+
+
+def test_availability_requires_a_listening_broker(socket_path, running_broker):
+    with mock.patch.object(credential_broker, 'log_error') as log_error:
+        assert is_broker_available(socket_path)
+        assert request_broker({"op": "unknown"}, socket_path=socket_path) == {"ok": False, "error": "알 수 없는 요청: unknown"}
+    # 연결 확인만 하고 닫은 연결은 오류로 기록하지 않음
+    log_error.assert_not_called()
+
+
+def test_stale_socket_file_is_not_available(socket_path):
+    assert not is_broker_available(socket_path)
+    leave_stale_socket(socket_path)
+    assert os.path.exists(socket_path)
+    assert not is_broker_available(socket_path)
+
+
+def test_serve_refuses_to_replace_running_broker(socket_path, running_broker):
+    with pytest.raises(RuntimeError):
+        serve(socket_path)
+
+    # 기존 브로커의 소켓은 그대로 동작
+    assert is_broker_available(socket_path)
+    assert request_broker({"op": "unknown"}, socket_path=socket_path)["ok"] is False
+
+
+def test_serve_replaces_stale_socket(socket_path):
+    leave_stale_socket(socket_path)
+    served = []
+
+    def serve_once(server):
+        served.append(is_broker_available(socket_path))
+
+    with mock.patch.object(CredentialBrokerServer, 'serve_forever', serve_once):
+        serve(socket_path)
+
+    assert served == [True]
+    assert not os.path.exists(socket_path)
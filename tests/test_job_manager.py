@@ -0,0 +1,160 @@
+"""
+JobManager 진행 메시지 묶음 전송 테스트
+가짜 이벤트 루프/시계와 프레임을 기록하는 구독자로 전송 순서와 유실 여부 검증
+"""
+import json
+from contextlib import contextmanager
+from unittest import mock
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+import job_manager
+from job_manager import Job, JobManager, JOB_DONE
+
+# 테스트용 최소 전송 간격 (초)
+MIN_INTERVAL = 0.05
+
+
+class FakeClock:
+    """job_manager.time 대체 (monotonic만 제공, advance로 시간 이동 후 도래한 타이머 실행)"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.timers = []
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+        due = sorted((t for t in self.timers if t[0] <= self.now), key=lambda t: t[0])
+        self.timers = [t for t in self.timers if t[0] > self.now]
+        for _, callback, args in due:
+            callback(*args)
+
+
+class FakeLoop:
+    """서버 이벤트 루프 대체 (call_later는 가짜 시계의 타이머로 등록)"""
+
+    def __init__(self, clock):
+        self.clock = clock
+
+    def is_closed(self):
+        return False
+
+    def call_soon_threadsafe(self, callback, *args):
+        callback(*args)
+
+    def call_later(self, delay, callback, *args):
+        self.clock.timers.append((self.clock.now + delay, callback, args))
+
+
+class RecordingSubscriber:
+    """전송된 프레임을 순서대로 기록하는 구독자"""
+
+    def __init__(self):
+        self.frames = []
+
+
+@contextmanager
+def job_fixture():
+    """가짜 시계/루프에 연결된 JobManager, 구독자가 1개 등록된 작업 반환"""
+    clock = FakeClock()
+    with mock.patch.object(job_manager, 'time', clock), \
+            mock.patch.object(job_manager, 'PROGRESS_MIN_INTERVAL', MIN_INTERVAL):
+        manager = JobManager(scheduler=None)
+        manager.attach_loop(FakeLoop(clock))
+        manager._send = lambda job, ws, frame: ws.frames.append(json.loads(frame))
+
+        job = Job('job-1', 'question', 'session', 'client', 'key', 'interactive')
+        subscriber = RecordingSubscriber()
+        job.subscribers.add(subscriber)
+        manager.jobs[job.job_id] = job
+        yield manager, job, subscriber, clock
+
+
+def progress(index):
+    return {"type": "progress", "message": f"step {index}"}
+
+
+def test_progress_burst_collapses_into_batch():
+    with job_fixture() as (manager, job, subscriber, clock):
+        for i in range(10):
+            manager.publish(job, progress(i))
+
+        # 첫 메시지는 즉시, 나머지는 간격이 지날 때까지 대기
+        assert [f["type"] for f in subscriber.frames] == ["progress"]
+        assert len(clock.timers) == 1
+
+        clock.advance(MIN_INTERVAL)
+        assert [f["type"] for f in subscriber.frames] == ["progress", "progress_batch"]
+        batch = subscriber.frames[1]
+        assert batch["count"] == 9
+        assert [m["message"] for m in batch["messages"]] == [f"step {i}" for i in range(1, 10)]
+        assert job.frames_sent == 2
+        assert job.messages_published == 10
+
+
+@pytest.mark.parametrize("terminal", [
+    {"type": "result", "message": "done"},
+    {"type": "error", "message": "failed"},
+    {"type": "job_status", "state": JOB_DONE},
+])
+def test_pending_batch_flushed_before_terminal_message(terminal):
+    with job_fixture() as (manager, job, subscriber, clock):
+        for i in range(3):
+            manager.publish(job, progress(i))
+        manager.publish(job, terminal)
+
+        assert [f["type"] for f in subscriber.frames] == ["progress", "progress_batch", terminal["type"]]
+        assert [m["seq"] for m in subscriber.frames[1]["messages"]] == [1, 2]
+        assert subscriber.frames[2]["seq"] == 3
+
+        # 예약된 전송이 나중에 실행돼도 같은 메시지를 다시 보내지 않음
+        clock.advance(MIN_INTERVAL)
+        assert len(subscriber.frames) == 3
+
+
+def test_last_progress_sent_when_job_finishes_inside_interval():
+    with job_fixture() as (manager, job, subscriber, clock):
+        manager.publish(job, progress(0))
+        clock.advance(MIN_INTERVAL / 5)
+        manager.publish(job, progress(1))
+        clock.advance(MIN_INTERVAL / 5)
+        manager._finish(job, JOB_DONE, result="ok")
+
+        assert [f["type"] for f in subscriber.frames] == ["progress", "progress", "job_status"]
+        assert subscriber.frames[1]["message"] == "step 1"
+        assert subscriber.frames[2]["state"] == JOB_DONE
+
+        clock.advance(MIN_INTERVAL)
+        assert len(subscriber.frames) == 3
+
+
+MESSAGE_TYPES = st.sampled_from(["progress", "message", "result", "error", "job_status", "streaming_chunk"])
+DELAYS = st.sampled_from([0.0, MIN_INTERVAL / 10, MIN_INTERVAL / 2, MIN_INTERVAL, MIN_INTERVAL * 3])
+
+
+@settings(max_examples=100, deadline=None)
+@given(st.lists(st.tuples(MESSAGE_TYPES, DELAYS), min_size=1, max_size=60))
+def test_every_seq_delivered_once_in_order(events):
+    """
+    **Feature: aws-zendesk-assistant, Property: Progress delivery completeness**
+    For any sequence of job messages and publish timings, every recorded message reaches the
+    subscriber exactly once and in seq order, including the frames sent when the job finishes
+    """
+    with job_fixture() as (manager, job, subscriber, clock):
+        for message_type, delay in events:
+            manager.publish(job, {"type": message_type, "message": "x"})
+            clock.advance(delay)
+        manager._finish(job, JOB_DONE)
+        clock.advance(MIN_INTERVAL * 10)
+
+        delivered = []
+        for frame in subscriber.frames:
+            messages = frame["messages"] if frame["type"] == "progress_batch" else [frame]
+            delivered.extend(m["seq"] for m in messages if "seq" in m)
+
+        assert delivered == list(range(job.progress_count))
+        assert subscriber.frames[-1]["type"] == "job_status"
@@ -0,0 +1,132 @@
+"""
+레인 스케줄러 테스트
+장시간 레인을 상한까지 채운 상태에서 대화형 작업의 즉시 시작, 예약 용량 보호, 레인 지표 검증
+"""
+import threading
+import time
+
+from utils.job_scheduler import LaneScheduler, INTERACTIVE_LANE, LONG_LANE
+
+WAIT_SECONDS = 5
+
+
+class BlockingJobs:
+    """release 전까지 끝나지 않는 작업 생성 (레인별 동시 실행 수 최대값 기록)"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+        self.running = {INTERACTIVE_LANE: 0, LONG_LANE: 0}
+        self.max_running = {INTERACTIVE_LANE: 0, LONG_LANE: 0}
+        self.started = {INTERACTIVE_LANE: threading.Semaphore(0), LONG_LANE: threading.Semaphore(0)}
+
+    def target(self, lane):
+        with self._lock:
+            self.running[lane] += 1
+            self.max_running[lane] = max(self.max_running[lane], self.running[lane])
+        self.started[lane].release()
+        self.release.wait(WAIT_SECONDS)
+        with self._lock:
+            self.running[lane] -= 1
+
+    def submit(self, scheduler, lane, count):
+        return [scheduler.submit(lane, self.target, (lane,), name=f"{lane}-{i}") for i in range(count)]
+
+    def wait_started(self, lane, count):
+        for _ in range(count):
+            assert self.started[lane].acquire(timeout=WAIT_SECONDS)
+
+
+def wait_until(predicate):
+    deadline = time.monotonic() + WAIT_SECONDS
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def lanes(interactive_max, reserved, long_max):
+    return {
+        INTERACTIVE_LANE: {"max_concurrency": interactive_max, "reserved": reserved, "priority": 0},
+        LONG_LANE: {"max_concurrency": long_max, "reserved": 0, "priority": 1},
+    }
+
+
+def test_interactive_job_starts_immediately_when_long_lane_is_full():
+    scheduler = LaneScheduler(lanes(interactive_max=8, reserved=4, long_max=3), total_capacity=10)
+    jobs = BlockingJobs()
+    try:
+        long_jobs = jobs.submit(scheduler, LONG_LANE, 6)
+        jobs.wait_started(LONG_LANE, 3)
+        assert [job.started for job in long_jobs] == [True] * 3 + [False] * 3
+
+        interactive = jobs.submit(scheduler, INTERACTIVE_LANE, 1)[0]
+        assert interactive.started  # 대기열을 거치지 않고 submit 안에서 시작
+        jobs.wait_started(INTERACTIVE_LANE, 1)
+
+        metrics = scheduler.get_metrics()["lanes"]
+        assert metrics[LONG_LANE]["running"] == 3
+        assert metrics[LONG_LANE]["queued"] == 3
+        assert metrics[INTERACTIVE_LANE]["running"] == 1
+        assert metrics[INTERACTIVE_LANE]["queued"] == 0
+    finally:
+        jobs.release.set()
+
+
+def test_reserved_slots_are_never_lent_to_long_lane():
+    # 장시간 레인 상한(4)은 전체 용량과 같지만 대화형 예약 2개는 비워 둠
+    scheduler = LaneScheduler(lanes(interactive_max=4, reserved=2, long_max=4), total_capacity=4)
+    jobs = BlockingJobs()
+    try:
+        long_jobs = jobs.submit(scheduler, LONG_LANE, 5)
+        jobs.wait_started(LONG_LANE, 2)
+        assert sum(job.started for job in long_jobs) == 2
+
+        # 예약 용량으로 대화형 작업 2개 즉시 시작, 그 이상은 대기
+        interactive = jobs.submit(scheduler, INTERACTIVE_LANE, 3)
+        assert [job.started for job in interactive] == [True, True, False]
+        jobs.wait_started(INTERACTIVE_LANE, 2)
+        assert scheduler.get_metrics()["running"] == 4
+    finally:
+        jobs.release.set()
+
+    wait_until(lambda: scheduler.get_metrics()["lanes"][LONG_LANE]["completed"] == 5)
+    wait_until(lambda: scheduler.get_metrics()["lanes"][INTERACTIVE_LANE]["completed"] == 3)
+    assert jobs.max_running[LONG_LANE] == 2
+
+
+def test_freed_slot_goes_to_interactive_lane_first():
+    scheduler = LaneScheduler(lanes(interactive_max=1, reserved=0, long_max=1), total_capacity=1)
+    order = []
+    gate = threading.Event()
+    first = scheduler.submit(LONG_LANE, gate.wait, (WAIT_SECONDS,), name="first")
+    scheduler.submit(LONG_LANE, order.append, (LONG_LANE,), name="long")
+    scheduler.submit(INTERACTIVE_LANE, order.append, (INTERACTIVE_LANE,), name="interactive")
+    assert first.started
+
+    gate.set()
+    wait_until(lambda: len(order) == 2)
+    assert order == [INTERACTIVE_LANE, LONG_LANE]
+
+
+def test_metrics_track_queue_depth_cancellations_and_failures():
+    scheduler = LaneScheduler(lanes(interactive_max=2, reserved=1, long_max=1), total_capacity=3)
+    jobs = BlockingJobs()
+    try:
+        long_jobs = jobs.submit(scheduler, LONG_LANE, 3)
+        jobs.wait_started(LONG_LANE, 1)
+        assert scheduler.queue_position(long_jobs[2]) == 2
+        assert scheduler.cancel(long_jobs[2])
+        assert not scheduler.cancel(long_jobs[0])  # 이미 시작된 작업은 취소 불가
+        scheduler.submit(INTERACTIVE_LANE, lambda: 1 / 0, name="failing")
+    finally:
+        jobs.release.set()
+
+    wait_until(lambda: scheduler.get_metrics()["lanes"][LONG_LANE]["completed"] == 2)
+    wait_until(lambda: scheduler.get_metrics()["lanes"][INTERACTIVE_LANE]["failed"] == 1)
+    metrics = scheduler.get_metrics()["lanes"]
+    assert metrics[LONG_LANE]["submitted"] == 3
+    assert metrics[LONG_LANE]["cancelled"] == 1
+    assert metrics[LONG_LANE]["max_queue_depth"] == 2  # 첫 작업은 바로 시작
+    assert metrics[LONG_LANE]["queued"] == 0
+    assert metrics[LONG_LANE]["wait_ms_p95"] >= metrics[LONG_LANE]["wait_ms_p50"] >= 0
+    assert jobs.max_running[LONG_LANE] == 1
@@ -0,0 +1,267 @@
+"""
+보고서 섹션 증분 수집 테스트
+임시 스냅샷 디렉토리와 AWS 클라이언트 스텁으로 지문 재사용/재수집 조건, CloudTrail 확정 구간, reused_sections,
+LookupEvents NextToken 페이지 조회, 구간 분할, (계정, 리전)별 토큰 버킷 검증
+"""
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from aws_tools import report_collectors, security_report
+from aws_tools.report_collectors import (
+    CollectorContext, CLOUDTRAIL_CRITICAL_EVENTS, collect_cloudtrail_events, collect_cloudtrail_events_incremental
+)
+from utils import snapshot_store
+from utils.json_store import json_default
+
+ACCOUNT_ID = '123456789012'
+REGION = 'ap-northeast-2'
+KST = timezone(timedelta(hours=9))
+
+
+class StubSupport:
+    """Trusted Advisor 스텁 (체크 ID → 플래그된 리소스 수, 호출 횟수 기록)"""
+
+    def __init__(self, flagged):
+        self.flagged = dict(flagged)
+        self.calls = {'summaries': 0, 'result': 0}
+
+    def describe_trusted_advisor_checks(self, language):
+        return {'checks': [{'id': check_id, 'name': f'check {check_id}', 'category': 'security'} for check_id in self.flagged]}
+
+    def describe_trusted_advisor_check_summaries(self, checkIds):
+        self.calls['summaries'] += 1
+        return {'summaries': [
+            {'checkId': check_id, 'status': 'warning' if self.flagged[check_id] else 'ok',
+             'resourcesSummary': {'resourcesFlagged': self.flagged[check_id]}}
+            for check_id in checkIds
+        ]}
+
+    def describe_trusted_advisor_check_result(self, checkId, language):
+        self.calls['result'] += 1
+        flagged = self.flagged[checkId]
+        return {'result': {'status': 'warning' if flagged else 'ok', 'flaggedResources': [{}] * flagged}}
+
+
+class StubCloudTrail:
+    """CloudTrail 스텁 (조회마다 구간 시작 시각의 이벤트 1개 반환, 조회 구간 기록)"""
+
+    def __init__(self, region=REGION):
+        self.meta = mock.Mock(region_name=region)
+        self.lookups = []
+
+    def lookup_events(self, **kwargs):
+        event_name = kwargs['LookupAttributes'][0]['AttributeValue']
+        self.lookups.append((event_name, kwargs['StartTime'], kwargs['EndTime']))
+        return {'Events': [{'EventName': event_name, 'EventTime': kwargs['StartTime']}]}
+
+
+class PagingCloudTrail:
+    """CloudTrail 페이지 스텁 (조회 구간마다 events_per_window개 이벤트를 page_size개씩 NextToken으로 나눠 반환)"""
+
+    def __init__(self, events_per_window, page_size, region=REGION):
+        self.meta = mock.Mock(region_name=region)
+        self.events_per_window = events_per_window
+        self.page_size = page_size
+        self.requests = []
+
+    def lookup_events(self, **kwargs):
+        event_name = kwargs['LookupAttributes'][0]['AttributeValue']
+        token = kwargs.get('NextToken')
+        self.requests.append((event_name, kwargs['StartTime'], kwargs['EndTime'], token))
+        offset = int(token or 0)
+        page_end = min(offset + self.page_size, self.events_per_window)
+        response = {'Events': [
+            {'EventName': event_name, 'EventTime': kwargs['EndTime'] - timedelta(seconds=index)}
+            for index in range(offset, page_end)
+        ]}
+        if page_end < self.events_per_window:
+            response['NextToken'] = str(page_end)
+        return response
+
+
+@contextmanager
+def trusted_advisor_only(tmp_path, support):
+    """임시 스냅샷 디렉토리에서 Trusted Advisor 섹션만 등록된 상태로 수집"""
+    collectors = {'trusted_advisor': report_collectors.SECTION_COLLECTORS['trusted_advisor']}
+    with mock.patch.object(snapshot_store, 'SNAPSHOT_DIR', str(tmp_path)), \
+            mock.patch.dict(report_collectors.SECTION_COLLECTORS, collectors, clear=True), \
+            mock.patch.dict(report_collectors._ta_catalogue, {'checks': None, 'loaded_at': 0.0}), \
+            mock.patch.object(CollectorContext, 'client', lambda self, service, region=None: support):
+        yield
+
+
+def collect(incremental=True):
+    return security_report.collect_raw_security_data(
+        ACCOUNT_ID, '2026-09-01', '2026-09-30', REGION, {'AWS_ACCESS_KEY_ID': 'AKIATEST'},
+        regions=[], incremental=incremental
+    )
+
+
+def test_matching_fingerprint_reuses_section(tmp_path):
+    support = StubSupport({'c1': 2, 'c2': 0})
+    with trusted_advisor_only(tmp_path, support):
+        first = collect()
+        first_collected_at = snapshot_store.load_snapshot_sections(ACCOUNT_ID, REGION)['trusted_advisor']['collected_at']
+        second = collect()
+
+        assert 'reused_sections' not in first['metadata']
+        assert second['metadata']['reused_sections'] == ['trusted_advisor']
+        assert second['trusted_advisor'] == first['trusted_advisor']
+        assert support.calls['result'] == 1  # 재사용한 실행은 상세 결과를 조회하지 않음
+
+        # 재사용한 값은 원래 수집 시각을 유지 (재사용으로 최대 경과 시간이 늘어나지 않음)
+        snapshot = snapshot_store.load_snapshot_sections(ACCOUNT_ID, REGION)
+        assert snapshot['trusted_advisor']['collected_at'] == first_collected_at
+
+
+def test_changed_fingerprint_recollects_section(tmp_path):
+    support = StubSupport({'c1': 2, 'c2': 0})
+    with trusted_advisor_only(tmp_path, support):
+        collect()
+        support.flagged['c2'] = 3
+        second = collect()
+
+        assert 'reused_sections' not in second['metadata']
+        assert [check['name'] for check in second['trusted_advisor']['checks']] == ['check c1', 'check c2']
+        assert support.calls['result'] == 3
+        # 지문 계산의 요약을 수집에서 다시 쓰므로 실행당 요약 조회 1회
+        assert support.calls['summaries'] == 2
+
+
+def test_expired_snapshot_recollects_section(tmp_path):
+    support = StubSupport({'c1': 2})
+    with trusted_advisor_only(tmp_path, support):
+        collect()
+        sections = snapshot_store.load_snapshot_sections(ACCOUNT_ID, REGION)
+        expired = datetime.now() - timedelta(hours=report_collectors.SNAPSHOT_MAX_AGE_HOURS + 1)
+        sections['trusted_advisor']['collected_at'] = expired.isoformat()
+        snapshot_store.save_snapshot_sections(ACCOUNT_ID, REGION, sections)
+
+        second = collect()
+
+        assert 'reused_sections' not in second['metadata']
+        assert support.calls['result'] == 2
+
+
+def test_snapshot_ignored_when_incremental_disabled(tmp_path):
+    support = StubSupport({'c1': 2})
+    with trusted_advisor_only(tmp_path, support):
+        collect()
+        second = collect(incremental=False)
+
+        assert 'reused_sections' not in second['metadata']
+        assert support.calls['result'] == 2
+
+
+@contextmanager
+def fast_lookups():
+    """LookupEvents 토큰 버킷 대기 없이 실행 (테스트마다 새 버킷)"""
+    with mock.patch.object(report_collectors, 'CLOUDTRAIL_LOOKUP_TPS', 1000.0), \
+            mock.patch.dict(report_collectors._lookup_limiters, clear=True):
+        yield
+
+
+def snapshot_round_trip(settled):
+    """스냅샷 파일 저장/읽기와 같은 JSON 왕복 (datetime → 문자열)"""
+    return json.loads(json.dumps(settled, default=json_default))
+
+
+def test_settled_window_queries_only_new_time():
+    today = datetime.now(KST).date()
+    start, end = (today - timedelta(days=2)).isoformat(), today.isoformat()
+    cloudtrail = StubCloudTrail()
+    with fast_lookups():
+        first, settled = collect_cloudtrail_events_incremental(cloudtrail, start, end, account_id=ACCOUNT_ID)
+        previous_until = datetime.fromisoformat(settled['until'])
+
+        # 다음 실행: 확정 시점이 30분 뒤로 이동한 것과 같음
+        cloudtrail.lookups.clear()
+        with mock.patch.object(report_collectors, 'CLOUDTRAIL_SETTLE_MINUTES', report_collectors.CLOUDTRAIL_SETTLE_MINUTES - 30):
+            second, _ = collect_cloudtrail_events_incremental(
+                cloudtrail, start, end, snapshot_round_trip(settled), account_id=ACCOUNT_ID
+            )
+
+    assert all(window_start >= previous_until for _, window_start, _ in cloudtrail.lookups)
+    assert sorted(name for name, window_start, _ in cloudtrail.lookups if window_start == previous_until) == sorted(CLOUDTRAIL_CRITICAL_EVENTS)
+    for event_name in CLOUDTRAIL_CRITICAL_EVENTS:
+        # 이전 확정 구간 1건 + 새 확정 구간 1건 + 미확정 구간 1건
+        assert first['critical_events'][event_name]['count'] == 2
+        assert second['critical_events'][event_name]['count'] == 3
+
+
+def test_closed_period_reuses_settled_window_without_lookups():
+    cloudtrail = StubCloudTrail()
+    with fast_lookups():
+        first, settled = collect_cloudtrail_events_incremental(cloudtrail, '2026-08-01', '2026-08-31', account_id=ACCOUNT_ID)
+        assert len(cloudtrail.lookups) == len(CLOUDTRAIL_CRITICAL_EVENTS)
+
+        cloudtrail.lookups.clear()
+        second, _ = collect_cloudtrail_events_incremental(
+            cloudtrail, '2026-08-01', '2026-08-31', snapshot_round_trip(settled), account_id=ACCOUNT_ID
+        )
+
+    assert cloudtrail.lookups == []
+    assert second['summary'] == first['summary']
+    assert {name: data['count'] for name, data in second['critical_events'].items()} == \
+        {name: data['count'] for name, data in first['critical_events'].items()}
+
+
+def test_lookup_follows_next_token_to_last_page():
+    cloudtrail = PagingCloudTrail(events_per_window=120, page_size=50)
+    with fast_lookups():
+        result = collect_cloudtrail_events(cloudtrail, '2026-08-01', '2026-08-31', slice_days=0, account_id=ACCOUNT_ID)
+
+    for event_name in CLOUDTRAIL_CRITICAL_EVENTS:
+        tokens = [token for name, _, _, token in cloudtrail.requests if name == event_name]
+        assert sorted(tokens, key=lambda token: int(token or 0)) == [None, '50', '100']
+        event_data = result['critical_events'][event_name]
+        assert event_data['count'] == 120  # 표본 크기와 무관하게 마지막 페이지까지 건수 집계
+        assert len(event_data['events']) == report_collectors.CLOUDTRAIL_EVENT_SAMPLE_SIZE
+        assert event_data['sampled'] and 'error' not in event_data
+    assert result['summary']['total_critical_events'] == 120 * len(CLOUDTRAIL_CRITICAL_EVENTS)
+
+
+def test_slice_days_splits_period_into_contiguous_windows():
+    cloudtrail = PagingCloudTrail(events_per_window=3, page_size=2)
+    with fast_lookups():
+        result = collect_cloudtrail_events(cloudtrail, '2026-08-01', '2026-08-31', slice_days=7, account_id=ACCOUNT_ID)
+
+    windows = sorted({(window_start, window_end) for _, window_start, window_end, _ in cloudtrail.requests})
+    # 31일 기간 → 7일 구간 4개 + 나머지 구간 1개, 빈틈이나 겹침 없이 기간 전체를 덮음
+    assert len(windows) == 5
+    assert windows[0][0] == datetime(2026, 8, 1, tzinfo=KST)
+    assert windows[-1][1] == datetime(2026, 8, 31, 23, 59, 59, tzinfo=KST)
+    assert all(previous_end == next_start for (_, previous_end), (next_start, _) in zip(windows, windows[1:]))
+    assert all(window_end - window_start <= timedelta(days=7) for window_start, window_end in windows)
+
+    for event_name in CLOUDTRAIL_CRITICAL_EVENTS:
+        # 구간마다 NextToken을 따라 2페이지씩 조회하고 구간별 건수를 합산
+        assert len([name for name, _, _, _ in cloudtrail.requests if name == event_name]) == 2 * len(windows)
+        assert result['critical_events'][event_name]['count'] == 3 * len(windows)
+
+
+def test_lookup_limiter_is_shared_per_account_and_region():
+    other_account = '210987654321'
+    runs = [
+        (StubCloudTrail(), ACCOUNT_ID),
+        (StubCloudTrail(), ACCOUNT_ID),  # 클라이언트가 달라도 같은 계정·리전이면 같은 버킷
+        (StubCloudTrail('us-east-1'), ACCOUNT_ID),
+        (StubCloudTrail(), other_account),
+    ]
+    acquired = []
+    with fast_lookups(), mock.patch.object(report_collectors.TokenBucket, 'acquire', autospec=True, side_effect=acquired.append):
+        for cloudtrail, account_id in runs:
+            collect_cloudtrail_events(cloudtrail, '2026-08-01', '2026-08-31', account_id=account_id)
+        limiters = dict(report_collectors._lookup_limiters)
+
+    assert sorted(limiters) == sorted([(ACCOUNT_ID, REGION), (ACCOUNT_ID, 'us-east-1'), (other_account, REGION)])
+    assert len({id(limiter) for limiter in limiters.values()}) == 3
+    lookups_per_run = len(CLOUDTRAIL_CRITICAL_EVENTS)
+    assert {key: acquired.count(limiter) for key, limiter in limiters.items()} == {
+        (ACCOUNT_ID, REGION): 2 * lookups_per_run,
+        (ACCOUNT_ID, 'us-east-1'): lookups_per_run,
+        (other_account, REGION): lookups_per_run,
+    }
+    assert all(limiter.rate == 1000.0 for limiter in limiters.values())
@@ -0,0 +1,119 @@
+"""
+보고서 Raw 데이터 저장소 테스트
+압축 JSON Lines 저장/읽기 왕복, 기존 JSON 파일 호환, migrate_reports 변환 검증
+"""
+import gzip
+import json
+from datetime import datetime, timezone
+from unittest import mock
+
+from aws_tools import report_store
+from aws_tools.report_store import (
+    save_report, load_report, iter_report_items, iter_report_records, migrate_reports, REPORT_FILE_SUFFIX
+)
+
+LAUNCHED = datetime(2026, 9, 1, 12, 30, tzinfo=timezone.utc)
+EC2_PATH = ('resources', 'ec2', 'instances')
+
+
+def build_report(instance_count=7):
+    """EC2 인스턴스 instance_count개, S3 버킷 1개, CloudTrail 이벤트 1개가 있는 보고서"""
+    return {
+        'metadata': {'account_id': '123456789012', 'period_start': '2026-09-01', 'period_end': '2026-09-30'},
+        'resources': {
+            'ec2': {
+                'summary': {'total': instance_count, 'running': instance_count, 'stopped': 0},
+                'instances': [{
+                    'InstanceId': f'i-{i:04d}',
+                    'State': {'Name': 'running'},
+                    'LaunchTime': LAUNCHED,
+                    'Region': 'ap-northeast-2',
+                    'UserData': 'not kept',
+                } for i in range(instance_count)]
+            },
+            's3': {'summary': {'total': 1, 'encrypted': 1, 'public': 0},
+                   'buckets': [{'Name': 'bucket', 'CreationDate': LAUNCHED, 'Encryption': {'Rules': []}}]},
+        },
+        'cloudtrail_events': {
+            'summary': {'total_critical_events': 1},
+            'critical_events': {'DeleteBucket': {'count': 1, 'events': [{
+                'EventId': 'e-1',
+                'EventName': 'DeleteBucket',
+                'EventTime': LAUNCHED,
+                'CloudTrailEvent': json.dumps({'awsRegion': 'ap-northeast-2', 'sourceIPAddress': '10.0.0.1',
+                                               'responseElements': {'large': 'payload'}}),
+            }]}}
+        },
+        'recommendations': [{'priority': 'high', 'title': 'encrypt'}],
+    }
+
+
+def test_round_trip_projects_fields_and_serializes_datetimes(tmp_path):
+    path = str(tmp_path / f'security_data{REPORT_FILE_SUFFIX}')
+    with mock.patch.object(report_store, 'STREAM_CHUNK_SIZE', 3):
+        assert save_report(build_report(), path) == path
+
+    loaded = load_report(path)
+
+    instances = loaded['resources']['ec2']['instances']
+    assert [instance['InstanceId'] for instance in instances] == [f'i-{i:04d}' for i in range(7)]
+    assert instances[0] == {'InstanceId': 'i-0000', 'State': {'Name': 'running'},
+                            'LaunchTime': LAUNCHED.isoformat(), 'Region': 'ap-northeast-2'}
+    assert loaded['resources']['ec2']['summary'] == {'total': 7, 'running': 7, 'stopped': 0}
+    assert loaded['resources']['s3']['buckets'] == [
+        {'Name': 'bucket', 'CreationDate': LAUNCHED.isoformat(), 'Encryption': {'Rules': []}}
+    ]
+    assert loaded['recommendations'] == [{'priority': 'high', 'title': 'encrypt'}]
+
+    event = loaded['cloudtrail_events']['critical_events']['DeleteBucket']['events'][0]
+    assert event['EventTime'] == LAUNCHED.isoformat()
+    assert json.loads(event['CloudTrailEvent']) == {'awsRegion': 'ap-northeast-2', 'sourceIPAddress': '10.0.0.1'}
+
+    # 목록은 STREAM_CHUNK_SIZE개씩 별도 레코드로 저장
+    chunks = [record for record in iter_report_records(path) if record['path'] == list(EC2_PATH)]
+    assert [len(record['items']) for record in chunks] == [3, 3, 1]
+
+
+def test_iter_report_items_streams_one_list(tmp_path):
+    path = str(tmp_path / f'security_data{REPORT_FILE_SUFFIX}')
+    with mock.patch.object(report_store, 'STREAM_CHUNK_SIZE', 2):
+        save_report(build_report(5), path)
+
+    assert [item['InstanceId'] for item in iter_report_items(path, EC2_PATH)] == [f'i-{i:04d}' for i in range(5)]
+    # 섹션 레코드 안의 목록(스트리밍 대상이 아닌 목록)도 같은 함수로 읽음
+    assert list(iter_report_items(path, ('recommendations',))) == [{'priority': 'high', 'title': 'encrypt'}]
+    assert list(iter_report_items(path, ('resources', 'rds', 'instances'))) == []
+
+
+def test_legacy_json_report_is_readable(tmp_path):
+    data = json.loads(json.dumps(build_report(), default=str))
+    path = tmp_path / 'security_data_123456789012_20260930.json'
+    path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+
+    assert load_report(str(path)) == data
+    assert [item['InstanceId'] for item in iter_report_items(str(path), EC2_PATH)] == [f'i-{i:04d}' for i in range(7)]
+
+
+def test_migrate_reports_converts_legacy_files(tmp_path):
+    data = json.loads(json.dumps(build_report(), default=str))
+    legacy = tmp_path / 'security_data_123456789012_20260930.json'
+    legacy.write_text(json.dumps(data, indent=2), encoding='utf-8')
+    unrelated = tmp_path / 'analysis_123456789012.json'
+    unrelated.write_text('{}', encoding='utf-8')
+
+    migrated = migrate_reports(str(tmp_path))
+
+    target = tmp_path / f'security_data_123456789012_20260930{REPORT_FILE_SUFFIX}'
+    assert migrated == [str(target)]
+    assert not legacy.exists()
+    assert unrelated.exists()
+    with gzip.open(target, 'rb') as f:
+        assert json.loads(f.readline()) == {'format': report_store.FORMAT_NAME, 'version': report_store.FORMAT_VERSION}
+
+    loaded = load_report(str(target))
+    assert loaded['metadata'] == data['metadata']
+    assert [item['InstanceId'] for item in loaded['resources']['ec2']['instances']] == [f'i-{i:04d}' for i in range(7)]
+    assert 'UserData' not in loaded['resources']['ec2']['instances'][0]
+
+    # 이미 변환된 디렉터리는 다시 변환하지 않음
+    assert migrate_reports(str(tmp_path)) == []
@@ -0,0 +1,173 @@
+"""
+작업 체크포인트 저장소
+장시간 작업(Service Screener, 월간 보고서)의 AgentState와 단계별 산출물을 로컬 디스크에 저장
+백엔드 재시작(deploy.sh, systemd 재시작) 후 마지막 완료 단계부터 작업 재개
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List
+from utils.logging_config import log_debug, log_error
+from utils.json_store import read_json_file, write_json_file
+
+# 체크포인트 저장 경로 (환경 변수로 변경 가능)
+CHECKPOINT_DIR = os.environ.get('JOB_CHECKPOINT_DIR', '/tmp/jobs')
+
+# 체크포인트에서 제외할 상태 필드 (WebSocket 핸들은 직렬화 불가, 자격증명은 디스크에 남기지 않음)
+_EXCLUDED_STATE_FIELDS = ('websocket', 'credentials')
+
+# 종료 상태 (재개 대상 아님)
+FINISHED_STATUSES = ('completed', 'error', 'cancelled')
+
+_store_lock = threading.Lock()
+
+
+def _checkpoint_path(job_id: str) -> str:
+    """작업 ID에 해당하는 체크포인트 파일 경로 반환"""
+    return os.path.join(CHECKPOINT_DIR, f"job_{job_id}.json")
+
+
+def serialize_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    AgentState에서 직렬화 가능한 필드만 추출
+    
+    Args:
+        state: 에이전트 상태
+    
+    Returns:
+        WebSocket 핸들과 자격증명을 제외한 상태 딕셔너리
+    """
+    return {key: value for key, value in state.items() if key not in _EXCLUDED_STATE_FIELDS}
+
+
+def save_checkpoint(job_id: str, state: Dict[str, Any], stage: str) -> bool:
+    """
+    작업 상태를 체크포인트 파일로 저장 (임시 파일 작성 후 원자적 교체)
+    
+    Args:
+        job_id: 작업 ID
+        state: 현재 에이전트 상태
+        stage: 마지막으로 완료된 단계 이름
+    
+    Returns:
+        bool: 저장 성공 여부
+    """
+    with _store_lock:
+        previous = _read_checkpoint_file(job_id)
+        record = {
+            "job_id": job_id,
+            "stage": stage,
+            "status": state.get("processing_status"),
+            "resume_count": previous.get("resume_count", 0) if previous else 0,
+            "created_at": previous.get("created_at") if previous else datetime.now().isoformat(),
+            "updated_at": datetime.now().isoformat(),
+            "state": serialize_state(state)
+        }
+        return _write_checkpoint_file(job_id, record)
+
+
+def _write_checkpoint_file(job_id: str, record: Dict[str, Any]) -> bool:
+    """체크포인트 레코드를 디스크에 기록 (잠금은 호출자가 보유)"""
+    saved = write_json_file(_checkpoint_path(job_id), record)
+    if saved:
+        log_debug(f"체크포인트 저장: {job_id} (단계: {record.get('stage')})")
+    else:
+        log_error(f"체크포인트 저장 실패: {job_id}")
+    return saved
+
+
+def _read_checkpoint_file(job_id: str) -> Optional[Dict[str, Any]]:
+    """체크포인트 파일 읽기 (잠금은 호출자가 보유)"""
+    return read_json_file(_checkpoint_path(job_id))
+
+
+def load_checkpoint(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    체크포인트 로드
+    
+    Args:
+        job_id: 작업 ID
+    
+    Returns:
+        dict: 체크포인트 레코드 또는 None
+    """
+    with _store_lock:
+        return _read_checkpoint_file(job_id)
+
+
+def mark_resume_attempt(job_id: str) -> int:
+    """
+    재개 시도 횟수 증가 (재시작 때마다 같은 작업이 프로세스를 죽이는 무한 루프 방지)
+    
+    Args:
+        job_id: 작업 ID
+    
+    Returns:
+        int: 증가된 재개 시도 횟수 (체크포인트가 없으면 0)
+    """
+    with _store_lock:
+        record = _read_checkpoint_file(job_id)
+        if not record:
+            return 0
+        record["resume_count"] = record.get("resume_count", 0) + 1
+        record["updated_at"] = datetime.now().isoformat()
+        _write_checkpoint_file(job_id, record)
+        return record["resume_count"]
+
+
+def list_interrupted_checkpoints() -> List[Dict[str, Any]]:
+    """
+    완료되지 않은 체크포인트 목록 반환 (재시작 후 재개 대상)
+    
+    Returns:
+        list: 생성 시간 순으로 정렬된 체크포인트 레코드
+    """
+    if not os.path.isdir(CHECKPOINT_DIR):
+        return []
+
+    interrupted = []
+    with _store_lock:
+        for filename in os.listdir(CHECKPOINT_DIR):
+            if not (filename.startswith('job_') and filename.endswith('.json')):
+                continue
+            job_id = filename[len('job_'):-len('.json')]
+            record = _read_checkpoint_file(job_id)
+            if record and record.get("status") not in FINISHED_STATUSES:
+                interrupted.append(record)
+
+    interrupted.sort(key=lambda r: r.get("created_at", ""))
+    log_debug(f"중단된 체크포인트: {len(interrupted)}개")
+    return interrupted
+
+
+def cleanup_finished_checkpoints(max_age_hours: int = 24) -> int:
+    """
+    오래된 완료 체크포인트 삭제
+    
+    Args:
+        max_age_hours: 보관 시간 (시간)
+    
+    Returns:
+        int: 삭제된 체크포인트 수
+    """
+    if not os.path.isdir(CHECKPOINT_DIR):
+        return 0
+
+    cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
+    removed = 0
+    with _store_lock:
+        for filename in os.listdir(CHECKPOINT_DIR):
+            if not (filename.startswith('job_') and filename.endswith('.json')):
+                continue
+            job_id = filename[len('job_'):-len('.json')]
+            record = _read_checkpoint_file(job_id)
+            if record and record.get("status") in FINISHED_STATUSES and record.get("updated_at", "") < cutoff:
+                try:
+                    os.remove(_checkpoint_path(job_id))
+                    removed += 1
+                except OSError as e:
+                    log_error(f"체크포인트 삭제 실패: {job_id} - {e}")
+
+    if removed:
+        log_debug(f"완료된 체크포인트 정리: {removed}개 삭제")
+    return removed
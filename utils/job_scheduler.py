@@ -0,0 +1,222 @@
+"""
+작업 스케줄러 (우선순위 레인)
+빠른 질문(general, cloudtrail, cloudwatch)과 장시간 작업(screener, report)을 레인별로 분리 실행
+레인별 동시 실행 상한 + 대화형 질문용 최소 예약 용량 + 레인별 대기열 지표 제공
+"""
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
+from utils.logging_config import log_debug, log_error
+from utils.metrics import percentile
+
+# 레인 이름
+INTERACTIVE_LANE = 'interactive'
+LONG_LANE = 'long'
+
+# 질문 유형 → 레인 매핑 (매핑되지 않은 유형은 대화형 레인)
+LANE_BY_QUESTION_TYPE = {
+    'screener': LONG_LANE,
+    'report': LONG_LANE,
+}
+
+# 기본 레인 설정 (환경 변수로 조정 가능)
+DEFAULT_TOTAL_CAPACITY = int(os.environ.get('SCHEDULER_TOTAL_CAPACITY', '10'))
+DEFAULT_LANES = {
+    INTERACTIVE_LANE: {
+        "max_concurrency": int(os.environ.get('SCHEDULER_INTERACTIVE_MAX', '8')),
+        "reserved": int(os.environ.get('SCHEDULER_INTERACTIVE_RESERVED', '4')),
+        "priority": 0
+    },
+    LONG_LANE: {
+        "max_concurrency": int(os.environ.get('SCHEDULER_LONG_MAX', '3')),
+        "reserved": 0,
+        "priority": 1
+    },
+}
+
+# 지연 시간 지표 계산에 사용할 최근 샘플 수
+_LATENCY_SAMPLE_SIZE = 200
+
+
+def lane_for_question_type(question_type: Optional[str]) -> str:
+    """
+    질문 유형에 해당하는 레인 반환
+    
+    Args:
+        question_type: 질문 유형 (screener, report, cloudtrail, cloudwatch, general)
+    
+    Returns:
+        str: 레인 이름
+    """
+    return LANE_BY_QUESTION_TYPE.get(question_type, INTERACTIVE_LANE)
+
+
+class ScheduledJob:
+    """스케줄러에 제출된 작업 (대기 중 취소 가능)"""
+
+    def __init__(self, lane: str, target: Callable, args: tuple, name: str):
+        self.lane = lane
+        self.target = target
+        self.args = args
+        self.name = name
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.cancelled = False
+
+    @property
+    def started(self) -> bool:
+        return self.started_at is not None
+
+
+class LaneScheduler:
+    """레인별 동시 실행 상한과 예약 용량을 지키며 작업을 스레드로 실행하는 스케줄러"""
+
+    def __init__(self, lanes: Dict[str, Dict[str, int]] = None, total_capacity: int = DEFAULT_TOTAL_CAPACITY):
+        self.lanes = lanes or DEFAULT_LANES
+        self.total_capacity = total_capacity
+        self._lock = threading.Lock()
+        self._queues = {lane: deque() for lane in self.lanes}
+        self._running = {lane: 0 for lane in self.lanes}
+        self._stats = {
+            lane: {
+                "submitted": 0,
+                "completed": 0,
+                "failed": 0,
+                "cancelled": 0,
+                "max_queue_depth": 0,
+                "wait_ms": deque(maxlen=_LATENCY_SAMPLE_SIZE),
+                "run_ms": deque(maxlen=_LATENCY_SAMPLE_SIZE)
+            }
+            for lane in self.lanes
+        }
+        log_debug(f"스케줄러 초기화: 전체 {total_capacity}, 레인 {self.lanes}")
+
+    def submit(self, lane: str, target: Callable, args: tuple = (), name: str = "") -> ScheduledJob:
+        """
+        작업 제출 (용량이 있으면 즉시 시작, 없으면 레인 대기열에 추가)
+        
+        Args:
+            lane: 레인 이름
+            target: 실행할 함수
+            args: 함수 인자
+            name: 로그용 작업 이름
+        
+        Returns:
+            ScheduledJob: 제출된 작업
+        """
+        if lane not in self.lanes:
+            lane = INTERACTIVE_LANE
+        job = ScheduledJob(lane, target, args, name)
+        with self._lock:
+            self._queues[lane].append(job)
+            stats = self._stats[lane]
+            stats["submitted"] += 1
+            stats["max_queue_depth"] = max(stats["max_queue_depth"], len(self._queues[lane]))
+            self._dispatch_locked()
+        return job
+
+    def cancel(self, job: ScheduledJob) -> bool:
+        """
+        대기 중인 작업 취소 (이미 시작된 작업은 취소 불가)
+        
+        Args:
+            job: 취소할 작업
+        
+        Returns:
+            bool: 취소 성공 여부
+        """
+        with self._lock:
+            if job.started or job.cancelled:
+                return False
+            try:
+                self._queues[job.lane].remove(job)
+            except ValueError:
+                return False
+            job.cancelled = True
+            self._stats[job.lane]["cancelled"] += 1
+            return True
+
+    def queue_position(self, job: ScheduledJob) -> int:
+        """대기열 내 위치 (1부터 시작, 시작됐거나 없으면 0)"""
+        with self._lock:
+            try:
+                return list(self._queues[job.lane]).index(job) + 1
+            except ValueError:
+                return 0
+
+    def _can_start_locked(self, lane: str) -> bool:
+        """레인 상한, 전체 용량, 다른 레인의 미사용 예약 용량을 고려한 시작 가능 여부"""
+        if self._running[lane] >= self.lanes[lane]["max_concurrency"]:
+            return False
+        total_running = sum(self._running.values())
+        held_for_others = sum(
+            max(0, config.get("reserved", 0) - self._running[other])
+            for other, config in self.lanes.items() if other != lane
+        )
+        return total_running + held_for_others < self.total_capacity
+
+    def _dispatch_locked(self):
+        """우선순위 순으로 대기 작업 시작 (잠금은 호출자가 보유)"""
+        for lane in sorted(self.lanes, key=lambda l: self.lanes[l].get("priority", 0)):
+            queue = self._queues[lane]
+            while queue and self._can_start_locked(lane):
+                job = queue.popleft()
+                job.started_at = time.monotonic()
+                self._running[lane] += 1
+                self._stats[lane]["wait_ms"].append((job.started_at - job.submitted_at) * 1000)
+
+                thread = threading.Thread(target=self._run_job, args=(job,), name=f"{lane}-{job.name}")
+                thread.daemon = True
+                thread.start()
+
+    def _run_job(self, job: ScheduledJob):
+        """작업 실행 후 슬롯 반환 및 다음 작업 시작"""
+        failed = False
+        try:
+            job.target(*job.args)
+        except Exception as e:
+            failed = True
+            log_error(f"스케줄러 작업 실패: {job.lane}/{job.name} - {e}")
+        finally:
+            with self._lock:
+                self._running[job.lane] -= 1
+                stats = self._stats[job.lane]
+                stats["failed" if failed else "completed"] += 1
+                stats["run_ms"].append((time.monotonic() - job.started_at) * 1000)
+                self._dispatch_locked()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        레인별 대기열 지표 반환 (레인 분할 튜닝용)
+        
+        Returns:
+            dict: 레인별 대기/실행 수, 누적 건수, 대기·실행 시간 백분위수(ms)
+        """
+        with self._lock:
+            lanes = {}
+            for lane, config in self.lanes.items():
+                stats = self._stats[lane]
+                lanes[lane] = {
+                    "max_concurrency": config["max_concurrency"],
+                    "reserved": config.get("reserved", 0),
+                    "queued": len(self._queues[lane]),
+                    "running": self._running[lane],
+                    "submitted": stats["submitted"],
+                    "completed": stats["completed"],
+                    "failed": stats["failed"],
+                    "cancelled": stats["cancelled"],
+                    "max_queue_depth": stats["max_queue_depth"],
+                    "wait_ms_p50": percentile(stats["wait_ms"], 50),
+                    "wait_ms_p95": percentile(stats["wait_ms"], 95),
+                    "run_ms_p50": percentile(stats["run_ms"], 50),
+                    "run_ms_p95": percentile(stats["run_ms"], 95)
+                }
+            return {
+                "total_capacity": self.total_capacity,
+                "running": sum(self._running.values()),
+                "lanes": lanes,
+                "timestamp": datetime.now().isoformat()
+            }
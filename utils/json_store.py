@@ -0,0 +1,70 @@
+"""
+로컬 JSON 파일 저장소 공통 함수
+체크포인트/스냅샷 저장소의 레코드 읽기와 원자적 쓰기(임시 파일 작성 후 교체), datetime 직렬화 규칙
+"""
+import os
+import json
+from datetime import datetime, date
+from typing import Optional, Dict, Any
+from utils.logging_config import log_error
+
+
+def json_default(obj):
+    """
+    JSON 인코더 기본 변환 함수 (datetime → ISO 8601 문자열, 집합/튜플 → 목록)
+    json.dump와 orjson.dumps의 default 인자로 같이 사용
+    
+    Args:
+        obj: 기본 인코더가 처리하지 못한 객체
+    
+    Returns:
+        JSON 직렬화 가능한 값
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def read_json_file(path: str) -> Optional[Dict[str, Any]]:
+    """
+    JSON 레코드 파일 읽기 (잠금은 호출자가 보유)
+    
+    Args:
+        path: 파일 경로
+    
+    Returns:
+        dict: 레코드, 파일이 없거나 읽기 실패 시 None
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        log_error(f"JSON 파일 읽기 실패: {path} - {e}")
+        return None
+
+
+def write_json_file(path: str, record: Dict[str, Any]) -> bool:
+    """
+    JSON 레코드 파일 쓰기 (임시 파일 작성 후 원자적 교체, 잠금은 호출자가 보유)
+    
+    Args:
+        path: 파일 경로 (상위 디렉토리가 없으면 생성)
+        record: 저장할 레코드 (datetime 포함 가능)
+    
+    Returns:
+        bool: 저장 성공 여부
+    """
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, default=json_default)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        log_error(f"JSON 파일 저장 실패: {path} - {e}")
+        return False
@@ -0,0 +1,22 @@
+"""
+지표 계산 공통 함수
+작업 스케줄러 대기열 지표와 인증 지연 시간 통계에서 같이 사용
+"""
+
+
+def percentile(samples, percent: float) -> float:
+    """
+    샘플 목록의 백분위수 (가장 가까운 순위, 소수점 1자리)
+    
+    Args:
+        samples: 숫자 샘플 목록 (deque 등 반복 가능 객체)
+        percent: 백분위 (0~100)
+    
+    Returns:
+        float: 백분위수 (샘플이 없으면 0)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))
+    return round(ordered[index], 1)
@@ -0,0 +1,102 @@
+"""
+보고서 수집 스냅샷 저장소
+계정/리전별로 이전 보고서 수집의 섹션 값과 증분 수집 상태(지문, CloudTrail 확정 구간)를 로컬 디스크에 저장
+다음 보고서 수집에서 바뀌지 않은 섹션은 재사용하고 CloudTrail은 새 구간만 조회
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any
+from utils.logging_config import log_debug, log_error
+from utils.json_store import read_json_file, write_json_file
+
+# 스냅샷 저장 경로 (환경 변수로 변경 가능)
+SNAPSHOT_DIR = os.environ.get('REPORT_SNAPSHOT_DIR', '/tmp/snapshots')
+
+_store_lock = threading.Lock()
+
+
+def _snapshot_path(account_id: str, region: str) -> str:
+    """계정/리전에 해당하는 스냅샷 파일 경로 반환"""
+    return os.path.join(SNAPSHOT_DIR, f"snapshot_{account_id}_{region}.json")
+
+
+def _read_snapshot_file(account_id: str, region: str) -> Optional[Dict[str, Any]]:
+    """스냅샷 파일 읽기 (잠금은 호출자가 보유)"""
+    return read_json_file(_snapshot_path(account_id, region))
+
+
+def load_snapshot_sections(account_id: str, region: str) -> Dict[str, Any]:
+    """
+    이전 수집의 섹션 스냅샷 로드
+    
+    Args:
+        account_id: AWS 계정 ID
+        region: 보고서 리전
+    
+    Returns:
+        dict: 섹션 이름 → {state, collected_at, period_start, period_end, value(지문 섹션만)}, 없으면 빈 딕셔너리
+    """
+    with _store_lock:
+        record = _read_snapshot_file(account_id, region)
+    return (record or {}).get("sections", {})
+
+
+def save_snapshot_sections(account_id: str, region: str, sections: Dict[str, Any]) -> bool:
+    """
+    섹션 스냅샷 저장 (기존 스냅샷에 섹션 단위로 덮어쓰기, 임시 파일 작성 후 원자적 교체)
+    
+    Args:
+        account_id: AWS 계정 ID
+        region: 보고서 리전
+        sections: 섹션 이름 → 스냅샷 항목
+    
+    Returns:
+        bool: 저장 성공 여부
+    """
+    if not sections:
+        return True
+
+    with _store_lock:
+        record = _read_snapshot_file(account_id, region) or {"account_id": account_id, "region": region, "sections": {}}
+        record["sections"].update(sections)
+        record["updated_at"] = datetime.now().isoformat()
+        saved = write_json_file(_snapshot_path(account_id, region), record)
+
+    if saved:
+        log_debug(f"스냅샷 저장: {account_id}/{region} ({', '.join(sections)})")
+    else:
+        log_error(f"스냅샷 저장 실패: {account_id}/{region}")
+    return saved
+
+
+def cleanup_old_snapshots(max_age_days: int = 45) -> int:
+    """
+    오래된 스냅샷 삭제 (지난달 보고서 재요청까지 고려해 기본 45일 보관)
+    
+    Args:
+        max_age_days: 보관 기간 (일)
+    
+    Returns:
+        int: 삭제된 스냅샷 수
+    """
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return 0
+
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).timestamp()
+    removed = 0
+    with _store_lock:
+        for filename in os.listdir(SNAPSHOT_DIR):
+            if not (filename.startswith('snapshot_') and filename.endswith('.json')):
+                continue
+            path = os.path.join(SNAPSHOT_DIR, filename)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError as e:
+                log_error(f"스냅샷 삭제 실패: {filename} - {e}")
+
+    if removed:
+        log_debug(f"오래된 스냅샷 정리: {removed}개 삭제")
+    return removed
@@ -398,6 +398,9 @@
       ws.onopen = function() {
         console.log('[DEBUG] WebSocket 연결 성공');
         updateStatus('connected', '서버 연결됨');
+        
+        // 티켓의 계정 ID 자격증명 예열 (첫 질문 대기 시간 단축)
+        prewarmTicketAccounts();
       };
       
       ws.onmessage = function(event) {
@@ -426,6 +429,46 @@
     }
   }
   
+  // ===== 계정 예열 =====
+  // 티켓 제목, 본문, 사용자 정의 필드에서 12자리 계정 ID를 찾아 백엔드에 prewarm 메시지 전송
+  function extractAccountIds(texts) {
+    const ids = texts
+      .filter(text => text !== null && text !== undefined)
+      .flatMap(text => String(text).match(/(?<!\d)\d{12}(?!\d)/g) || []);
+    return [...new Set(ids)];
+  }
+  
+  async function prewarmTicketAccounts() {
+    if (typeof ZAFClient === 'undefined') {
+      console.log('[DEBUG] ZAF SDK 없음 - 계정 예열 생략');
+      return;
+    }
+    
+    try {
+      const client = ZAFClient.init();
+      const ticket = await client.get(['ticket.subject', 'ticket.description', 'ticketFields']);
+      const texts = [ticket['ticket.subject'], ticket['ticket.description']];
+      
+      // 사용자 정의 필드 값 조회
+      const customFieldPaths = (ticket.ticketFields || [])
+        .map(field => field.name)
+        .filter(name => name && name.startsWith('custom_field_'))
+        .map(name => `ticket.customField:${name}`);
+      if (customFieldPaths.length > 0) {
+        const fields = await client.get(customFieldPaths);
+        customFieldPaths.forEach(path => texts.push(fields[path]));
+      }
+      
+      const accountIds = extractAccountIds(texts);
+      if (accountIds.length > 0 && ws && ws.readyState === WebSocket.OPEN) {
+        console.log('[DEBUG] 계정 예열 요청:', accountIds);
+        ws.send(JSON.stringify({ type: 'prewarm', account_ids: accountIds }));
+      }
+    } catch (error) {
+      console.warn('[WARN] 계정 예열 실패 (무시):', error);
+    }
+  }
+  
   // ===== 초기화 =====
   console.log('[DEBUG] UI 렌더링 시작');
   renderUI();
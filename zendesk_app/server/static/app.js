@@ -29,6 +29,9 @@ class ZenBotDashboard {
       
       await initWebSocket(this.websocketUrl);
       console.log('[DEBUG] WebSocket 초기화 완료');
+      
+      // 티켓에 있는 계정 ID 자격증명 예열 (첫 질문 대기 시간 단축)
+      this.prewarmTicketAccounts();
       console.log('[DEBUG] ZenBot 초기화 완료');
     } catch (error) {
       console.error('[ERROR] 초기화 실패:', error);
@@ -128,6 +131,24 @@ class ZenBotDashboard {
     document.getElementById('queryCloudtrailBtn')?.addEventListener('click', () => this.queryCloudtrail());
   }
 
+  prewarmTicketAccounts() {
+    const ticket = this.ticketData;
+    if (!ticket) return;
+    
+    // 제목, 본문, 사용자 정의 필드 값에서 12자리 계정 ID 추출
+    const texts = [ticket.subject, ticket.description];
+    const customFields = ticket.custom_fields || ticket.customFields || [];
+    const fieldValues = Array.isArray(customFields)
+      ? customFields.map(field => (field && typeof field === 'object') ? field.value : field)
+      : Object.values(customFields);
+    texts.push(...fieldValues);
+    
+    const accountIds = texts
+      .filter(text => text !== null && text !== undefined)
+      .flatMap(text => String(text).match(/(?<!\d)\d{12}(?!\d)/g) || []);
+    sendPrewarm(accountIds);
+  }
+
   openChat() {
     this.isChatOpen = true;
     this.dashboardView.classList.remove('active');
@@ -172,6 +172,11 @@ function initWebSocket(url) {
     wsClient.onConnectionChange((connected) => {
       console.log(`[DEBUG] WebSocket 연결 상태: ${connected ? '연결됨' : '연결 끊김'}`);
       
+      // 재연결 시 진행 중이던 작업 다시 구독 (놓친 진행 메시지부터 재전송됨)
+      if (connected && activeJobId) {
+        wsClient.send({ type: 'subscribe', job_id: activeJobId, since: activeJobNextSeq });
+      }
+      
       // UI 업데이트
       const statusDot = document.querySelector('.status-dot');
       const statusText = document.querySelector('.status-text');
@@ -208,6 +213,31 @@ function initWebSocket(url) {
   });
 }
 
+/**
+ * 진행 중인 작업 추적 (재연결 시 구독용)
+ */
+let activeJobId = null;
+let activeJobNextSeq = 0;
+
+function trackJobMessage(data) {
+  if (!data.job_id) return;
+  
+  if (!activeJobId && data.type !== 'error') {
+    activeJobId = data.job_id;
+    activeJobNextSeq = 0;
+  }
+  if (data.job_id !== activeJobId) return;
+  
+  if (typeof data.seq === 'number') {
+    activeJobNextSeq = Math.max(activeJobNextSeq, data.seq + 1);
+  }
+  if (data.type === 'job_status' && !Array.isArray(data.progress) &&
+      ['done', 'failed', 'cancelled'].includes(data.state)) {
+    activeJobId = null;
+    activeJobNextSeq = 0;
+  }
+}
+
 /**
  * WebSocket 메시지 처리
  */
@@ -215,6 +245,7 @@ let lastProgressMessageId = null;
 
 function handleWebSocketMessage(data) {
   const type = data.type;
+  trackJobMessage(data);
   
   switch (type) {
     case 'connected':
@@ -232,6 +263,12 @@ function handleWebSocketMessage(data) {
       }
       break;
       
+    case 'progress_batch':
+      // 짧은 시간에 몰린 진행 메시지 묶음 (순서대로 처리)
+      console.log('[DEBUG] 진행 상황 묶음:', data.count);
+      (data.messages || []).forEach(event => handleWebSocketMessage(event));
+      break;
+      
     case 'streaming_start':
       console.log('[DEBUG] 스트리밍 시작');
       lastProgressMessageId = null; // 진행 메시지 종료
@@ -270,10 +307,29 @@ function handleWebSocketMessage(data) {
       showToast(data.message, 'error');
       break;
       
+    case 'job_status':
+      // 구독 시 재전송된 진행 이력 (연결이 끊긴 동안 놓친 메시지)
+      if (Array.isArray(data.progress)) {
+        data.progress.forEach(event => handleWebSocketMessage(event));
+        break;
+      }
+      console.log('[DEBUG] 작업 상태:', data.job_id, data.state);
+      if (data.state === 'failed' || data.state === 'cancelled') {
+        if (window.zenBotDashboard) {
+          window.zenBotDashboard.isProcessing = false;
+          window.zenBotDashboard.updateSendButtonState();
+        }
+      }
+      break;
+      
     case 'pong':
       console.log('[DEBUG] Pong 수신');
       break;
       
+    case 'prewarm_ack':
+      console.log('[DEBUG] 계정 예열 시작:', data.account_ids);
+      break;
+      
     default:
       console.log('[DEBUG] 알 수 없는 메시지 타입:', type);
   }
@@ -332,6 +388,22 @@ function sendQuestion(question) {
   return result;
 }
 
+/**
+ * 계정 예열 요청 (티켓에서 찾은 계정 ID의 자격증명을 질문 전에 미리 발급)
+ */
+function sendPrewarm(accountIds) {
+  const ids = [...new Set((accountIds || []).filter(id => /^\d{12}$/.test(id)))];
+  if (ids.length === 0) return false;
+  
+  if (!wsClient || !wsClient.isConnected()) {
+    console.log('[DEBUG] 계정 예열 보류 (연결 안 됨):', ids);
+    return false;
+  }
+  
+  console.log('[DEBUG] 계정 예열 요청:', ids);
+  return wsClient.send({ type: 'prewarm', account_ids: ids });
+}
+
 /**
  * 세션 ID 생성
  */